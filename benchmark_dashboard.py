@@ -0,0 +1,326 @@
+"""
+Benchmark suite for the dashboard
+Times every DataSimulator.generate_* function and HighchartsGenerator.create_*
+method across increasing data scales, plus headless dashboard runs through
+Streamlit's AppTest harness, and compares the results with a stored baseline.
+
+Usage: python benchmark_dashboard.py [--scales 1 10 100] [--save] [--baseline FILE]
+
+Exits with status 1 when a benchmark is slower than its baseline by more
+than the regression threshold, or when importing the dashboard exceeds
+the import-time budget or eagerly loads a library meant to be lazy, or
+when the graph metrics pass over a million nodes exceeds its budget.
+Baselines are machine specific: record one with --save on the machine
+(or CI runner) that checks against it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'social_media_privacy_dashboard_enhanced.py')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_THRESHOLD = 1.5
+# Differences below this many seconds are timer noise, never a regression
+DEFAULT_MIN_DELTA = 0.002
+SEED = 42
+# Cold import of the dashboard module in a fresh interpreter (Streamlit
+# itself takes most of it); heavy libraries must be imported lazily
+IMPORT_BUDGET = 0.75
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import social_media_privacy_dashboard_enhanced as app
+print(time.perf_counter() - start)
+print(','.join(name for name in app.LAZY_MODULES if name in sys.modules))
+'''
+# A cold metrics pass (fingerprint, CSR, components, PageRank) over the
+# largest network the dashboard handles must stay under a second
+METRICS_NODES = 1_000_000
+METRICS_BUDGET = 1.0
+
+
+def measure(func, repeat=5):
+    """Median seconds per call of ``func``, looping fast calls like timeit"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    runs = [elapsed] + timer.repeat(repeat=repeat - 1, number=number)
+    return statistics.median(run / number for run in runs)
+
+
+def simulator_benchmarks(app, scales):
+    """``(name, scale, func)`` for every DataSimulator.generate_* function and the section builders
+
+    Besides the generators: the flow records, population risk scoring,
+    building the location heatmap pyramid and serving a zoomed view of it,
+    and one live-mode tick.
+    """
+    sim = app.DataSimulator
+    start = int(datetime(2024, 12, 1, tzinfo=timezone.utc).timestamp())
+    cases = [
+        ('generate_sankey_data', 1, sim.generate_sankey_data),
+        ('generate_bubble_data', 1, sim.generate_bubble_data),
+        ('generate_timeline_data', 1, sim.generate_timeline_data)
+    ]
+    for scale in scales:
+        cases += [
+            ('generate_network_arrays', scale, lambda s=scale: sim.generate_network_arrays(SEED, s)),
+            ('generate_network_graph', scale, lambda s=scale: sim.generate_network_graph(SEED, s)),
+            ('generate_network_data', scale, lambda s=scale: sim.generate_network_data(SEED, s)),
+            ('generate_heatmap_arrays', scale, lambda s=scale: sim.generate_heatmap_arrays(SEED, s)),
+            ('generate_heatmap_data', scale, lambda s=scale: sim.generate_heatmap_data(SEED, s)),
+            ('generate_risk_events', scale, lambda s=scale: sim.generate_risk_events(start, 24, SEED, s)),
+            # Scale N: N days of per-minute history
+            ('generate_incident_history', scale, lambda s=scale: sim.generate_incident_history(SEED, s)),
+            ('generate_incident_minutes', scale, lambda s=scale: sim.generate_incident_minutes(start, 1440 * s, SEED)),
+            ('iter_flow_records', scale, lambda s=scale: sum(len(chunk[2]) for chunk in sim.iter_flow_records(SEED, s))),
+            ('build_population_risk', scale, lambda s=scale: app.build_population_risk(SEED, s)),
+            ('build_location_pyramid', scale, lambda s=scale: app.build_location_pyramid(SEED, s, start))
+        ]
+        pyramid = app.build_location_pyramid(SEED, scale, start)
+        region = ((start + 3600, start + 2 * 3600), (100, 164))
+        cases.append(('heatmap_pyramid_view', scale, lambda p=pyramid: p.view(*region)))
+        cases.append(('live_tick', scale, live_tick(app, scale, start)))
+    return cases
+
+
+def live_tick(app, scale, start):
+    """One live-mode tick, as a function: the next minute of the feed and the chart deltas it makes
+
+    Like the live Heatmap and Timeline sections: the batch is folded into
+    a week-long windowed heatmap backfilled with seven days of events, and
+    the changed cells and the new incident point are serialized. The feed
+    runs through the heatmap's 8:00-22:00 window of consecutive days, so
+    every tick lands in the grid.
+    """
+    sim = app.DataSimulator
+    days, hours = sim.heatmap_labels(scale)
+    aggregator = app.HeatmapAggregator(len(days), len(hours), window=7 * 86400)
+    for day in range(7):
+        aggregator.update(*sim.generate_risk_events(start - (7 - day) * 86400, 24, [SEED, day], scale))
+    window_minutes = aggregator.DAY_SPAN // 60
+    source, day = None, 0
+
+    def tick():
+        nonlocal source, day
+        if source is None or source.sequence == window_minutes:
+            source = app.LiveEventSource(SEED, scale, start=start + day * 86400 + aggregator.DAY_START)
+            day += 1
+        # Half a batch past the next one is due, so exactly one is generated
+        source.poll(source.started + (source.sequence + 1.5) * 60 / source.speed)
+        batch = source.batches[-1]
+        changed = aggregator.update(batch['timestamps'], batch['risks'])
+        cells = app.np.column_stack([changed, aggregator.values(changed)]).tolist()
+        return json.dumps({'cells': cells, 'points': [[batch['minute'] * 1000] + batch['incidents'].tolist()]})
+    return tick
+
+
+def chart_benchmarks(app, scales):
+    """``(name, scale, func)`` for every HighchartsGenerator.create_* method
+
+    Every call gets a fresh document cache, so the full serialization is
+    timed rather than a cache hit.
+    """
+    sim = app.DataSimulator
+
+    def uncached():
+        return app.HighchartsGenerator(cache=app.LRUCache(maxsize=1))
+
+    sankey = sim.generate_sankey_data()
+    bubbles = sim.generate_bubble_data()
+    timeline = sim.generate_timeline_data()
+    cases = [
+        ('create_sankey_diagram', 1, lambda: uncached().create_sankey_diagram(*sankey)),
+        ('create_bubble_chart', 1, lambda: uncached().create_bubble_chart(bubbles)),
+        ('create_timeline_chart', 1, lambda: uncached().create_timeline_chart(timeline)),
+        ('create_gauge_chart', 1, lambda: uncached().create_gauge_chart(57))
+    ]
+    for scale in scales:
+        nodes, links = sim.generate_network_data(SEED, scale)
+        days, hours, cells = sim.generate_heatmap_data(SEED, scale)
+        # Every entity kept, so the diagram grows with the third-party tail
+        flows = app.build_flow_engine(SEED, scale).sankey(None, unit=2 ** 30)
+        cases += [
+            ('create_network_graph', scale, lambda n=nodes, l=links: uncached().create_network_graph(n, l)),
+            ('create_heatmap_chart', scale, lambda d=days, h=hours, c=cells: uncached().create_heatmap_chart(d, h, c)),
+            ('create_sankey_diagram_flows', scale, lambda f=flows: uncached().create_sankey_diagram(*f))
+        ]
+    return cases
+
+
+def app_benchmarks(repeat):
+    """Headless first run and reruns of the whole dashboard with every chart"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_FILE, default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f'Dashboard raised: {at.exception[0].value}')
+    at.sidebar.multiselect[0].set_value(
+        ['Network Graph', 'Sankey Diagram', 'Heatmap', 'Bubble Chart', 'Timeline', 'Gauge']
+    )
+    at.run()
+
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        runs.append(time.perf_counter() - start)
+    return [('app_first_run', 1, first_run), ('app_rerun_all_charts', 1, statistics.median(runs))]
+
+
+def import_benchmark(repeat):
+    """Median cold import seconds of the dashboard and the lazy modules it loaded eagerly"""
+    env = dict(os.environ, STREAMLIT_LOGGER_LEVEL='error')
+    runs, eager = [], set()
+    # The first run also writes the bytecode cache; it is not counted
+    for _ in range(repeat + 1):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT], cwd=os.path.dirname(APP_FILE), env=env,
+            capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        runs.append(float(output[-2]))
+        eager.update(name for name in output[-1].split(',') if name)
+    return statistics.median(runs[1:]), sorted(eager)
+
+
+def metrics_benchmark(app, repeat):
+    """``(scale, seconds)`` of an uncached ``GraphMetricsEngine.compute`` on a ``METRICS_NODES`` graph"""
+    scale = -(-METRICS_NODES // app.DataSimulator.BASE_NODES)
+    graph = app.DataSimulator.generate_network_graph(SEED, scale)
+    return scale, measure(lambda: app.GraphMetricsEngine().compute(graph), repeat)
+
+
+def budget_failures(results, budget, metrics_budget=METRICS_BUDGET):
+    """Budget violations: import too slow or loading lazy modules, metrics pass too slow"""
+    failures = []
+    result = results.get('import_dashboard[1]')
+    if result is not None:
+        if result['seconds'] > budget:
+            failures.append(f'import took {1000 * result["seconds"]:.0f} ms, budget {1000 * budget:.0f} ms')
+        if result['eager_modules']:
+            failures.append(f'import loaded lazy modules: {", ".join(result["eager_modules"])}')
+    for result in results.values():
+        if result['name'] == 'graph_metrics' and result['seconds'] > metrics_budget:
+            failures.append(f'metrics pass over {result["nodes"]} nodes took {1000 * result["seconds"]:.0f} ms, '
+                            f'budget {1000 * metrics_budget:.0f} ms')
+    for failure in failures:
+        print(f'BUDGET {failure}')
+    return failures
+
+
+def run_benchmarks(scales, repeat, include_app=True):
+    """Results keyed ``name[scale]`` with their median seconds"""
+    # No disk cache, so every run measures the same work; the dashboard
+    # module sets up Streamlit at import, keep its warnings quiet
+    os.environ.setdefault('DASHBOARD_CACHE_DIR', '')
+    os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+    seconds, eager = import_benchmark(repeat)
+    results = {'import_dashboard[1]': {'name': 'import_dashboard', 'scale': 1, 'seconds': seconds,
+                                       'eager_modules': eager}}
+    print(f'import_dashboard[1]: {1000 * seconds:.1f} ms' + (f' (eager: {", ".join(eager)})' if eager else ''))
+    import social_media_privacy_dashboard_enhanced as app
+
+    for name, scale, func in simulator_benchmarks(app, scales) + chart_benchmarks(app, scales):
+        results[f'{name}[{scale}]'] = {'name': name, 'scale': scale, 'seconds': measure(func, repeat)}
+        print(f'{name}[{scale}]: {1000 * results[f"{name}[{scale}]"]["seconds"]:.3f} ms')
+    scale, seconds = metrics_benchmark(app, repeat)
+    results[f'graph_metrics[{scale}]'] = {'name': 'graph_metrics', 'scale': scale, 'seconds': seconds,
+                                          'nodes': app.DataSimulator.BASE_NODES * scale}
+    print(f'graph_metrics[{scale}]: {1000 * seconds:.1f} ms')
+    if include_app:
+        for name, scale, seconds in app_benchmarks(repeat):
+            results[f'{name}[{scale}]'] = {'name': name, 'scale': scale, 'seconds': seconds}
+            print(f'{name}[{scale}]: {1000 * seconds:.1f} ms')
+    return results
+
+
+def environment():
+    """Machine description stored with a baseline"""
+    import numpy
+    import pandas
+    import streamlit
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'streamlit': streamlit.__version__
+    }
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Names of benchmarks slower than ``threshold`` times their baseline"""
+    cpus = baseline.get('environment', {}).get('cpus')
+    if cpus is not None and cpus != os.cpu_count():
+        print(f'WARNING baseline recorded with {cpus} CPUs, this machine has {os.cpu_count()}; '
+              'timings may not be comparable, re-record it with --save')
+    regressions = []
+    for key, result in results.items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            continue
+        limit = baseline.get('thresholds', {}).get(result['name'], threshold)
+        ratio = result['seconds'] / reference['seconds'] if reference['seconds'] else float('inf')
+        if ratio > limit and result['seconds'] - reference['seconds'] > min_delta:
+            regressions.append(key)
+            print(f'REGRESSION {key}: {1000 * result["seconds"]:.3f} ms vs '
+                  f'{1000 * reference["seconds"]:.3f} ms baseline ({ratio:.2f}x > {limit}x)')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save', action='store_true', help='Record the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Slowdown factor counted as a regression (per-benchmark overrides '
+                             'live in the baseline "thresholds")')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA)
+    parser.add_argument('--output', help='Also write the results as JSON to this file')
+    parser.add_argument('--skip-app', action='store_true', help='Skip the headless dashboard runs')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help='Maximum cold import seconds of the dashboard module')
+    parser.add_argument('--metrics-budget', type=float, default=METRICS_BUDGET,
+                        help=f'Maximum seconds of an uncached metrics pass over {METRICS_NODES} nodes')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scales, args.repeat, include_app=not args.skip_app)
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+
+    failures = budget_failures(results, args.import_budget, args.metrics_budget)
+    if args.save:
+        thresholds = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fh:
+                thresholds = json.load(fh).get('thresholds', {})
+        with open(args.baseline, 'w') as fh:
+            json.dump({**report, 'thresholds': thresholds}, fh, indent=2, sort_keys=True)
+        print(f'Baseline written to {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        print(f'{len(regressions)} regression(s) against {args.baseline}')
+        failures += regressions
+    else:
+        print(f'No baseline at {args.baseline}; run with --save to record one')
+    sys.exit(1 if failures else 0)
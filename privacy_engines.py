@@ -0,0 +1,1935 @@
+"""
+Data engines of the Social Media Privacy & Security Analytics Dashboard
+
+Simulation, graph, flow, heatmap, risk and telemetry engines, kept apart
+from the Streamlit script. Streamlit re-executes the script on every
+rerun, redefining everything in it; classes defined here are imported
+once, so instances held in shared caches keep a stable class that
+pickles across reruns, sessions and worker processes.
+"""
+
+import hashlib
+import importlib
+import pickle
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+
+class LazyModule:
+    """Module imported on first attribute access
+
+    Keeps heavy libraries off the import path: a cold start (a new
+    Streamlit Cloud container, a batch report worker) only pays for the
+    libraries the code it runs actually touches.
+    """
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+
+class FingerprintPickler(pickle.Pickler):
+    """Pickler that feeds a hash and stands large inputs in by their digests
+
+    NumPy arrays are replaced by their dtype, shape and a hash of their raw
+    buffer, and a ``CompactGraph`` by its ``digest``, so large chart and
+    engine inputs are never pickled whole; plain containers and scalars
+    take the C pickler's fast path untouched.
+    """
+    
+    def __init__(self):
+        self.hasher = hashlib.blake2b(digest_size=16)
+        super().__init__(self, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def write(self, data):
+        self.hasher.update(data)
+    
+    def reducer_override(self, obj):
+        numpy = sys.modules.get('numpy')
+        if numpy is not None and isinstance(obj, numpy.ndarray) and not obj.dtype.hasobject:
+            return tuple, (('ndarray', obj.dtype.str, obj.shape, array_digest(obj)),)
+        if isinstance(obj, CompactGraph):
+            return tuple, (('CompactGraph', obj.digest()),)
+        return NotImplemented
+
+def array_digest(values):
+    """Hash of a NumPy array's raw buffer"""
+    buffer = np.ascontiguousarray(values).reshape(-1).view(np.uint8)
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+def fingerprint(*parts):
+    """Cheap content fingerprint used as a cache key (see ``FingerprintPickler``)"""
+    pickler = FingerprintPickler()
+    pickler.dump(parts)
+    return pickler.hasher.hexdigest()
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters
+
+    Safe to share between sessions: Streamlit runs each session in its own
+    thread, so lookups and updates hold a lock. An optional ``backing``
+    cache (e.g. a ``DiskCache``) is consulted on misses and written through
+    on every ``put``; a value found there counts as a hit (and as one of
+    the ``backing_hits``).
+    """
+    
+    def __init__(self, maxsize=32, backing=None):
+        self.maxsize = maxsize
+        self.backing = backing
+        self.hits = 0
+        self.misses = 0
+        self.backing_hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value (marking it recently used) or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        if self.backing is not None:
+            value = self.backing.get(key)
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.backing_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return value
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        self._remember(key, value)
+        if self.backing is not None:
+            self.backing.put(key, value)
+    
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def stats(self):
+        """Hit/miss counters for tuning the cache size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'backing_hits': self.backing_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
+
+class CompactGraph:
+    """Integer-indexed graph: an interned node id table plus int32 link arrays
+
+    ``ids`` is either a sequence of id strings or a template such as
+    ``'user_{}'`` that is formatted with the node index on demand, so large
+    simulated graphs never materialize their id strings. Per-node attributes
+    live in ``columns`` (one array each); a column listed in ``categories``
+    holds integer codes into that label list. Conversion to the Highcharts
+    ``nodes``/``data`` format only happens at render time.
+    """
+    
+    def __init__(self, num_nodes, source, target, weight=None, ids='node_{}',
+                 names=None, columns=None, categories=None):
+        self.num_nodes = int(num_nodes)
+        self.source = np.asarray(source, dtype=np.int32)
+        self.target = np.asarray(target, dtype=np.int32)
+        self.weight = None if weight is None else np.asarray(weight, dtype=np.float32)
+        self.ids = ids
+        self.names = names
+        self.columns = columns or {}
+        self.categories = categories or {}
+        self._digest = None
+    
+    @property
+    def num_links(self):
+        return len(self.source)
+    
+    @property
+    def nbytes(self):
+        """Approximate memory held by the link and column arrays"""
+        total = self.source.nbytes + self.target.nbytes
+        if self.weight is not None:
+            total += self.weight.nbytes
+        return total + sum(np.asarray(column).nbytes for column in self.columns.values())
+    
+    def digest(self):
+        """Content hash of the links, node columns and id/name tables
+
+        Stands in for the graph in ``fingerprint`` keys (chart documents,
+        metrics, layouts). Graphs are never modified in place, so the
+        arrays are hashed once per graph.
+        """
+        if self._digest is None:
+            self._digest = fingerprint('graph', self.num_nodes, self.source, self.target, self.weight,
+                                       self.ids, self.names, self.columns, self.categories)
+        return self._digest
+    
+    @staticmethod
+    def _lookup(table, index):
+        """Entries of an id/name table for the given node indices"""
+        if isinstance(table, str):
+            return [table.format(i) for i in index]
+        return [table[i] for i in index]
+    
+    def node_ids(self, index=None):
+        """Id strings for ``index`` (all nodes by default)"""
+        index = range(self.num_nodes) if index is None else np.asarray(index).tolist()
+        return self._lookup(self.ids, index)
+    
+    def index_of(self, node_ids):
+        """Node indices for the given id strings (unknown ids are skipped)"""
+        if isinstance(self.ids, str):
+            prefix, _, suffix = self.ids.partition('{}')
+            index = []
+            for node_id in node_ids:
+                number = node_id[len(prefix):len(node_id) - len(suffix)]
+                if node_id.startswith(prefix) and node_id.endswith(suffix) and number.isdigit():
+                    if int(number) < self.num_nodes:
+                        index.append(int(number))
+            return np.array(index, dtype=np.int64)
+        lookup = {node_id: i for i, node_id in enumerate(self.ids)}
+        return np.array([lookup[node_id] for node_id in node_ids if node_id in lookup], dtype=np.int64)
+    
+    def with_columns(self, columns, categories=None):
+        """Copy sharing the link arrays, with added or replaced node columns"""
+        merged_categories = {name: labels for name, labels in self.categories.items() if name not in columns}
+        merged_categories.update(categories or {})
+        return CompactGraph(self.num_nodes, self.source, self.target, self.weight, self.ids,
+                            self.names, {**self.columns, **columns}, merged_categories)
+    
+    @classmethod
+    def from_records(cls, nodes, links):
+        """Intern dict/list network data (as from ``generate_network_data``)"""
+        ids = [node['id'] for node in nodes]
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        source = np.fromiter((index[link[0]] for link in links), dtype=np.int32, count=len(links))
+        target = np.fromiter((index[link[1]] for link in links), dtype=np.int32, count=len(links))
+        
+        columns, categories = {}, {}
+        if nodes and 'value' in nodes[0]:
+            columns['value'] = np.array([node['value'] for node in nodes], dtype=np.float32)
+        for name in ('community', 'color'):
+            if nodes and name in nodes[0]:
+                labels, codes = np.unique([node[name] for node in nodes], return_inverse=True)
+                columns[name] = codes.astype(np.int32)
+                categories[name] = labels.tolist()
+        names = [node['name'] for node in nodes] if nodes and 'name' in nodes[0] else None
+        return cls(len(ids), source, target, ids=ids, names=names, columns=columns, categories=categories)
+    
+    def simplify(self, directed=False):
+        """Drop self-loops and merge multi-edges, summing their weights
+
+        Undirected graphs treat ``a -> b`` and ``b -> a`` as the same edge.
+        """
+        keep = self.source != self.target
+        source = self.source[keep].astype(np.int64)
+        target = self.target[keep].astype(np.int64)
+        if not directed:
+            source, target = np.minimum(source, target), np.maximum(source, target)
+        keys, inverse = np.unique(source * self.num_nodes + target, return_inverse=True)
+        weight = None if self.weight is None else self.weight[keep]
+        weight = np.bincount(inverse, weights=weight, minlength=len(keys))
+        source, target = np.divmod(keys, self.num_nodes)
+        return CompactGraph(self.num_nodes, source, target, weight, self.ids,
+                            self.names, self.columns, self.categories)
+    
+    def to_highcharts(self):
+        """Highcharts ``nodes`` and ``data`` lists for the networkgraph series"""
+        ids = self.node_ids()
+        names = None if self.names is None else self._lookup(self.names, range(self.num_nodes))
+        columns = {}
+        for name, column in self.columns.items():
+            column = np.asarray(column)
+            if column.dtype.kind == 'f':
+                column = np.round(column.astype(np.float64), 4)
+            values = column.tolist()
+            if name in self.categories:
+                labels = self.categories[name]
+                values = [labels[code] for code in values]
+            columns[name] = values
+        radius = columns.pop('radius', None)
+        
+        nodes = []
+        for i, node_id in enumerate(ids):
+            node = {'id': node_id}
+            if names is not None:
+                node['name'] = names[i]
+            for name, values in columns.items():
+                node[name] = values[i]
+            if radius is not None:
+                node['marker'] = {'radius': radius[i]}
+            nodes.append(node)
+        
+        sources = self.source.tolist()
+        targets = self.target.tolist()
+        if self.weight is None:
+            links = [[ids[a], ids[b]] for a, b in zip(sources, targets)]
+        else:
+            weights = [int(w) if w.is_integer() else w for w in self.weight.tolist()]
+            links = [[ids[a], ids[b], w] for a, b, w in zip(sources, targets, weights)]
+        return nodes, links
+
+class CSRAdjacency:
+    """Compressed sparse row adjacency of a ``CompactGraph``
+
+    Undirected graphs store both directions of every link. ``rows`` keeps the
+    expanded row index of every stored entry so sparse products reduce to a
+    single ``np.bincount``.
+    """
+    
+    def __init__(self, graph, directed=False):
+        source = graph.source.astype(np.int64)
+        target = graph.target.astype(np.int64)
+        weight = graph.weight
+        if not directed:
+            source, target = np.concatenate((source, target)), np.concatenate((target, source))
+            weight = None if weight is None else np.concatenate((weight, weight))
+        
+        # Sorting packed int64 keys by value is much cheaper than an argsort.
+        # Unit weights pack (row, column); otherwise (row, position), so the
+        # sort also yields the permutation that carries the weights and the
+        # columns of a row stay in link order.
+        if weight is None or np.all(weight == 1):
+            keys = np.sort((source << 32) | target)
+            self.data = np.ones(len(keys), dtype=np.float32)
+            self.indices = (keys & 0xFFFFFFFF).astype(np.int32)
+        else:
+            keys = np.sort((source << 32) | np.arange(len(source)))
+            order = keys & 0xFFFFFFFF
+            self.data = weight[order].astype(np.float32)
+            self.indices = target[order].astype(np.int32)
+        self.num_nodes = graph.num_nodes
+        self.rows = (keys >> 32).astype(np.int32)
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(self.rows, minlength=self.num_nodes))))
+        self.unit_weights = bool(np.all(self.data == 1))
+    
+    def degree(self):
+        """Number of stored neighbours per node"""
+        return np.diff(self.indptr)
+    
+    def strength(self):
+        """Sum of link weights per node"""
+        return np.bincount(self.rows, weights=self.data, minlength=self.num_nodes)
+    
+    def matvec(self, x):
+        """Sparse product ``A @ x``"""
+        values = x[self.indices]
+        if not self.unit_weights:
+            values *= self.data
+        return np.bincount(self.rows, weights=values, minlength=self.num_nodes)
+
+class GraphMetricsEngine:
+    """Degree, component, community density and PageRank metrics
+
+    Everything is batched array math over a ``CSRAdjacency``; results are
+    cached per graph fingerprint so reruns only pay for a lookup.
+    """
+    
+    def __init__(self, cache=None, damping=0.85, tolerance=5e-3, max_iterations=30):
+        self.cache = cache if cache is not None else LRUCache(maxsize=8)
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+    
+    @staticmethod
+    def connected_components(graph):
+        """Component label (smallest member index) for every node
+
+        Shiloach-Vishkin style: hook the larger of two linked roots onto the
+        smaller, then pointer-jump until every node points at its root.
+        Labels are int32 (like the CSR indices) to halve the gather traffic.
+        """
+        parent = np.arange(graph.num_nodes, dtype=np.int32)
+        source = graph.source.astype(np.int32)
+        target = graph.target.astype(np.int32)
+        while True:
+            a, b = parent[source], parent[target]
+            low, high = np.minimum(a, b), np.maximum(a, b)
+            linked = low != high
+            if not linked.any():
+                return parent
+            np.minimum.at(parent, high[linked], low[linked])
+            while True:
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+            # Only links whose endpoints are still in different trees matter
+            source, target = source[linked], target[linked]
+    
+    def pagerank(self, adjacency):
+        """Approximate PageRank by power iteration on the CSR adjacency
+
+        On an undirected graph the random walk's stationary distribution is
+        proportional to node strength, so iterating from there (instead of a
+        uniform vector) reaches ~1% L1 error in a handful of iterations.
+        """
+        n = adjacency.num_nodes
+        strength = adjacency.strength()
+        dangling = np.flatnonzero(strength == 0)
+        inv_strength = np.divide(1.0, strength, out=np.zeros(n), where=strength > 0)
+        total = strength.sum()
+        rank = (1 - self.damping) / n + self.damping * (strength / total if total else 1.0 / n)
+        rank /= rank.sum()
+        for _ in range(self.max_iterations):
+            # Single precision halves the memory traffic of the gather
+            updated = adjacency.matvec((rank * inv_strength).astype(np.float32))
+            updated *= self.damping
+            updated += (1 - self.damping) / n + self.damping * rank[dangling].sum() / n
+            delta = np.abs(updated - rank).sum()
+            rank = updated
+            if delta < self.tolerance:
+                break
+        return rank
+    
+    def adjacency_for(self, graph, graph_key=None):
+        """Cached ``CSRAdjacency`` of ``graph`` (``graph_key``: its ``graph_fingerprint``, if known)"""
+        key = fingerprint('csr', graph_key or self.graph_fingerprint(graph))
+        adjacency = self.cache.get(key)
+        if adjacency is None:
+            adjacency = CSRAdjacency(graph)
+            self.cache.put(key, adjacency)
+        return adjacency
+    
+    @staticmethod
+    def graph_fingerprint(graph):
+        """Fingerprint of the graph's links, hashed once per metrics pass"""
+        return fingerprint('graph', graph.num_nodes, graph.source, graph.target, graph.weight)
+    
+    def compute(self, graph):
+        """Metrics dict for ``graph`` (cached)"""
+        graph_key = self.graph_fingerprint(graph)
+        key = fingerprint('metrics', graph_key, graph.columns.get('community'))
+        metrics = self.cache.get(key)
+        if metrics is not None:
+            return metrics
+        
+        adjacency = self.adjacency_for(graph, graph_key)
+        degree = adjacency.degree()
+        
+        # Degree distribution in power-of-two buckets: 0, 1, 2-3, 4-7, ...
+        buckets = np.zeros(len(degree), dtype=np.int64)
+        positive = degree > 0
+        buckets[positive] = np.floor(np.log2(degree[positive])).astype(np.int64) + 1
+        bucket_counts = np.bincount(buckets)
+        bucket_labels = ['0'] + [
+            f'{2 ** (b - 1)}' if b == 1 else f'{2 ** (b - 1)}-{2 ** b - 1}'
+            for b in range(1, len(bucket_counts))
+        ]
+        
+        labels = self.connected_components(graph)
+        component_sizes = np.bincount(labels, minlength=graph.num_nodes)
+        component_sizes = component_sizes[component_sizes > 0]
+        
+        community_density = {}
+        if 'community' in graph.columns:
+            community = np.asarray(graph.columns['community'], dtype=np.int64)
+            names = graph.categories.get('community') or [str(c) for c in range(int(community.max()) + 1)]
+            size = np.bincount(community, minlength=len(names)).astype(np.float64)
+            src_community = community[graph.source]
+            intra = src_community == community[graph.target]
+            internal = np.bincount(src_community[intra], minlength=len(names))
+            density = np.divide(internal, size * (size - 1) / 2, out=np.zeros(len(names)), where=size > 1)
+            community_density = dict(zip(names, density.tolist()))
+        
+        rank = self.pagerank(adjacency)
+        top = np.argpartition(-rank, min(10, len(rank) - 1))[:10] if len(rank) > 10 else np.arange(len(rank))
+        top = top[np.argsort(-rank[top])]
+        
+        metrics = {
+            'nodes': graph.num_nodes,
+            'links': graph.num_links,
+            'mean_degree': float(degree.mean()) if len(degree) else 0.0,
+            'max_degree': int(degree.max()) if len(degree) else 0,
+            'isolated': int((degree == 0).sum()),
+            'degree_distribution': dict(zip(bucket_labels, bucket_counts.tolist())),
+            'components': int(len(component_sizes)),
+            'largest_component': int(component_sizes.max()) if len(component_sizes) else 0,
+            'community_density': community_density,
+            'pagerank': rank,
+            'top_nodes': list(zip(graph.node_ids(top), rank[top].tolist()))
+        }
+        self.cache.put(key, metrics)
+        return metrics
+
+class RiskPropagationEngine:
+    """Spread privacy risk from seed users over the social graph
+
+    Risk follows ``r = min(1, seeds + decay * D^-1 A r)``: every user takes on
+    a decayed share of their neighbours' average risk, and seed users stay at
+    full risk. Each iteration is one sparse matrix-vector product on a
+    ``CSRAdjacency``; iteration stops once the largest change is below
+    ``tolerance``.
+    """
+    
+    # Green -> yellow -> red, matching the gauge colour stops
+    RISK_STOPS = [(0.0, (0x55, 0xBF, 0x3B)), (0.5, (0xDD, 0xDF, 0x0D)), (1.0, (0xDF, 0x53, 0x53))]
+    
+    def __init__(self, cache=None, tolerance=1e-4, max_iterations=200, buckets=10):
+        self.cache = cache if cache is not None else LRUCache(maxsize=16)
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.buckets = buckets
+    
+    def propagate(self, adjacency, seeds, decay=0.5):
+        """Per-node risk in [0, 1] for the given seed node indices"""
+        seeds = np.unique(np.asarray(seeds, dtype=np.int64))
+        key = fingerprint('risk', adjacency.num_nodes, adjacency.rows, adjacency.indices,
+                          adjacency.data, seeds, decay)
+        risk = self.cache.get(key)
+        if risk is not None:
+            return risk
+        
+        strength = adjacency.strength()
+        inv_strength = np.where(strength > 0, 1.0 / np.maximum(strength, 1e-12), 0.0)
+        seed_vector = np.zeros(adjacency.num_nodes)
+        seed_vector[seeds] = 1.0
+        risk = seed_vector.copy()
+        for _ in range(self.max_iterations):
+            updated = np.minimum(1.0, seed_vector + decay * inv_strength * adjacency.matvec(risk))
+            change = np.abs(updated - risk).max() if len(risk) else 0.0
+            risk = updated
+            if change < self.tolerance:
+                break
+        
+        risk = risk.astype(np.float32)
+        self.cache.put(key, risk)
+        return risk
+    
+    def risk_colors(self):
+        """One hex colour per risk bucket"""
+        colors = []
+        for b in range(self.buckets):
+            level = b / max(self.buckets - 1, 1)
+            for (low, low_rgb), (high, high_rgb) in zip(self.RISK_STOPS, self.RISK_STOPS[1:]):
+                if level <= high:
+                    t = (level - low) / (high - low)
+                    rgb = [round(a + (c - a) * t) for a, c in zip(low_rgb, high_rgb)]
+                    colors.append('#{:02X}{:02X}{:02X}'.format(*rgb))
+                    break
+        return colors
+    
+    def color_by_risk(self, graph):
+        """Copy of ``graph`` whose node colours follow its ``risk`` column"""
+        risk = np.asarray(graph.columns['risk'], dtype=np.float64)
+        codes = np.minimum((risk * self.buckets).astype(np.int32), self.buckets - 1)
+        return graph.with_columns({'color': codes}, {'color': self.risk_colors()})
+
+class GraphLayoutEngine:
+    """Server-side force-directed graph layout in NumPy
+
+    Fruchterman-Reingold forces with a Barnes-Hut style approximation for
+    repulsion: nodes are binned into a ``grid_size`` x ``grid_size`` grid and
+    every other cell acts as a single mass at its centre of mass, so an
+    iteration costs O(nodes + links + cells^2) instead of O(nodes^2). Small
+    graphs use exact pairwise repulsion. Layouts are cached per graph.
+    Graphs over ``max_nodes`` are refused: nothing can read a drawing of
+    them, so callers coarsen first.
+    """
+    
+    def __init__(self, cache=None, iterations=50, grid_size=24, exact_threshold=500, seed=7, max_nodes=10_000):
+        self.cache = cache if cache is not None else LRUCache(maxsize=8)
+        self.iterations = iterations
+        self.grid_size = grid_size
+        self.exact_threshold = exact_threshold
+        self.seed = seed
+        self.max_nodes = max_nodes
+    
+    @staticmethod
+    def _pairwise(x, y, mass, k2):
+        """Repulsion on each point from all other (weighted) points"""
+        dx = x[:, None] - x[None, :]
+        dy = y[:, None] - y[None, :]
+        dist2 = np.maximum(dx * dx + dy * dy, 1e-9)
+        np.fill_diagonal(dist2, np.inf)
+        weight = k2 * mass[None, :] / dist2
+        return (dx * weight).sum(axis=1), (dy * weight).sum(axis=1)
+    
+    def _repulsion_exact(self, x, y, k2):
+        """Exact pairwise repulsion for small graphs"""
+        return self._pairwise(x, y, np.ones_like(x), k2)
+    
+    def _repulsion_grid(self, x, y, k2):
+        """Grid-approximated repulsion (cell centres of mass as far field)"""
+        g = self.grid_size
+        cell = np.minimum((x * g).astype(np.int32), g - 1) * g + np.minimum((y * g).astype(np.int32), g - 1)
+        mass = np.bincount(cell, minlength=g * g).astype(np.float32)
+        occupied = np.flatnonzero(mass)
+        com_x = np.zeros(g * g, dtype=np.float32)
+        com_y = np.zeros(g * g, dtype=np.float32)
+        com_x[occupied] = np.bincount(cell, weights=x, minlength=g * g)[occupied] / mass[occupied]
+        com_y[occupied] = np.bincount(cell, weights=y, minlength=g * g)[occupied] / mass[occupied]
+        
+        # Far field: cell-to-cell forces between centres of mass
+        far_x = np.zeros(g * g, dtype=np.float32)
+        far_y = np.zeros(g * g, dtype=np.float32)
+        far_x[occupied], far_y[occupied] = self._pairwise(com_x[occupied], com_y[occupied], mass[occupied], k2)
+        
+        # Near field: push each node away from its own cell's centre of mass,
+        # softened by the cell size so co-located nodes stay bounded
+        local_x = x - com_x[cell]
+        local_y = y - com_y[cell]
+        near = k2 * (mass[cell] - 1) / (local_x * local_x + local_y * local_y + (0.5 / g) ** 2)
+        return far_x[cell] + local_x * near, far_y[cell] + local_y * near
+    
+    def compute(self, num_nodes, source, target):
+        """Node positions in the unit square as a (num_nodes, 2) float32 array"""
+        if num_nodes > self.max_nodes:
+            raise ValueError(f'{num_nodes} nodes is over the layout limit of {self.max_nodes}; coarsen the graph first')
+        key = fingerprint('layout', num_nodes, source, target,
+                          self.iterations, self.grid_size, self.exact_threshold, self.seed)
+        positions = self.cache.get(key)
+        if positions is not None:
+            return positions
+        
+        rng = np.random.default_rng(self.seed)
+        x = rng.random(num_nodes, dtype=np.float32)
+        y = rng.random(num_nodes, dtype=np.float32)
+        
+        if num_nodes > 1:
+            source = np.asarray(source, dtype=np.int64)
+            target = np.asarray(target, dtype=np.int64)
+            ends = np.concatenate((source, target))
+            k = np.float32(1.0 / np.sqrt(num_nodes))
+            k2 = k * k
+            repulsion = self._repulsion_exact if num_nodes <= self.exact_threshold else self._repulsion_grid
+            
+            temperature = 0.1
+            cooling = temperature / (self.iterations + 1)
+            for _ in range(self.iterations):
+                force_x, force_y = repulsion(x, y, k2)
+                
+                # Attraction along links (d^2 / k), equal and opposite on both ends
+                dx = x[source] - x[target]
+                dy = y[source] - y[target]
+                pull = np.sqrt(dx * dx + dy * dy) / k
+                force_x = force_x + np.bincount(ends, weights=np.concatenate((-dx * pull, dx * pull)), minlength=num_nodes)
+                force_y = force_y + np.bincount(ends, weights=np.concatenate((-dy * pull, dy * pull)), minlength=num_nodes)
+                
+                # Displacement capped by the current temperature
+                length = np.sqrt(force_x * force_x + force_y * force_y) + 1e-9
+                step = np.minimum(length, temperature) / length
+                x = np.clip(x + force_x * step, 0.0, 1.0).astype(np.float32)
+                y = np.clip(y + force_y * step, 0.0, 1.0).astype(np.float32)
+                temperature -= cooling
+        
+        # Stretch to fill the unit square with a small margin
+        positions = np.column_stack((x, y))
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        positions = (0.02 + 0.96 * (positions - low) / np.maximum(high - low, 1e-9)).astype(np.float32)
+        self.cache.put(key, positions)
+        return positions
+    
+    def positions_for(self, graph):
+        """Layout for a ``CompactGraph``, aligned with its node index"""
+        return self.compute(graph.num_nodes, graph.source, graph.target)
+
+class CommunityCoarsener:
+    """Collapse each community into a weighted super-node
+
+    Links between communities are aggregated into one weighted edge per
+    community pair; one community at a time can be expanded back into its
+    member nodes. Only the ``max_links`` heaviest super-node links are kept,
+    so the payload stays small regardless of graph size.
+    """
+    
+    def __init__(self, palette=None, max_links=300):
+        self.palette = palette or DataSimulator.NETWORK_COLORS
+        self.max_links = max_links
+    
+    def coarsen(self, community, source, target, expand=None, num_communities=None):
+        """Vectorized coarsening of an integer-coded graph
+
+        Element ids below ``num_communities`` are super-nodes; ids from
+        ``num_communities`` on are the members of the ``expand`` community, in
+        the order given by ``members``. Returns a dict with ``sizes``,
+        ``members`` and the ``link_from``/``link_to``/``weight`` arrays.
+        """
+        community = np.asarray(community, dtype=np.int64)
+        if num_communities is None:
+            num_communities = int(community.max()) + 1 if len(community) else 0
+        sizes = np.bincount(community, minlength=num_communities)
+        
+        element = community
+        members = np.empty(0, dtype=np.int64)
+        if expand is not None:
+            members = np.flatnonzero(community == expand)
+            element = community.copy()
+            element[members] = num_communities + np.arange(len(members))
+        
+        # Undirected element pairs; links inside a super-node disappear
+        a = element[np.asarray(source, dtype=np.int64)]
+        b = element[np.asarray(target, dtype=np.int64)]
+        keep = a != b
+        a, b = np.minimum(a[keep], b[keep]), np.maximum(a[keep], b[keep])
+        num_elements = num_communities + len(members)
+        keys, weight = np.unique(a * num_elements + b, return_counts=True)
+        link_from, link_to = np.divmod(keys, num_elements)
+        
+        # Keep every member-member link, prune the rest to the heaviest
+        coarse = np.flatnonzero(link_from < num_communities)
+        if len(coarse) > self.max_links:
+            top = coarse[np.argpartition(-weight[coarse], self.max_links)[:self.max_links]]
+            kept = np.sort(np.concatenate((np.flatnonzero(link_from >= num_communities), top)))
+            link_from, link_to, weight = link_from[kept], link_to[kept], weight[kept]
+        
+        return {
+            'sizes': sizes,
+            'members': members,
+            'link_from': link_from,
+            'link_to': link_to,
+            'weight': weight
+        }
+    
+    def coarsen_graph(self, graph, expand=None):
+        """Coarsen a ``CompactGraph`` on its ``community`` column
+
+        ``expand`` is the community label to show at member level. Returns a
+        small ``CompactGraph`` of super-nodes, expanded members and weighted
+        links.
+        """
+        labels = graph.categories['community']
+        expand_code = labels.index(expand) if expand in labels else None
+        result = self.coarsen(graph.columns['community'], graph.source, graph.target,
+                              expand_code, len(labels))
+        sizes = result['sizes']
+        members = result['members']
+        
+        # Drop the expanded community's (now empty) super-node and any
+        # empty community, then renumber the remaining elements
+        present = np.concatenate((sizes > 0, np.ones(len(members), dtype=bool)))
+        if expand_code is not None:
+            present[expand_code] = False
+        renumber = np.cumsum(present) - 1
+        super_codes = np.flatnonzero(present[:len(labels)])
+        
+        largest = max(int(sizes.max()), 1) if len(sizes) else 1
+        ids = [f'community_{labels[c]}' for c in super_codes.tolist()] + graph.node_ids(members)
+        names = [f'Community {labels[c]} ({sizes[c]} users)' for c in super_codes.tolist()]
+        if graph.names is not None:
+            names += graph._lookup(graph.names, members.tolist())
+        else:
+            names += graph.node_ids(members)
+        
+        value = np.concatenate((sizes[super_codes], graph.columns.get('value', np.ones(graph.num_nodes))[members]))
+        color = [self.palette[c % len(self.palette)] for c in super_codes.tolist()]
+        if 'color' in graph.columns:
+            color_labels = graph.categories.get('color')
+            member_colors = graph.columns['color'][members].tolist()
+            color += [color_labels[c] for c in member_colors] if color_labels else member_colors
+        else:
+            color += [self.palette[expand_code % len(self.palette)]] * len(members)
+        radius = np.concatenate((
+            np.round(6 + 24 * np.sqrt(sizes[super_codes] / largest), 1),
+            np.full(len(members), 5.0)
+        ))
+        
+        columns = {
+            'value': value,
+            'community': np.concatenate((super_codes, np.full(len(members), expand_code or 0))).astype(np.int32),
+            'color': np.array(color, dtype=object),
+            'radius': radius
+        }
+        if 'risk' in graph.columns:
+            # Super-nodes carry the mean risk of their members
+            risk = np.asarray(graph.columns['risk'], dtype=np.float64)
+            community = np.asarray(graph.columns['community'], dtype=np.int64)
+            mean_risk = np.bincount(community, weights=risk, minlength=len(labels)) / np.maximum(sizes, 1)
+            columns['risk'] = np.concatenate((mean_risk[super_codes], risk[members]))
+        return CompactGraph(
+            len(ids), renumber[result['link_from']], renumber[result['link_to']], result['weight'],
+            ids=ids, names=names, columns=columns, categories={'community': labels}
+        )
+
+class SankeyFlowEngine:
+    """Aggregate raw (source, destination, bytes) flow records into Sankey links
+
+    Records arrive in chunks; each chunk's endpoint labels are factorized
+    and interned into one node table, and the chunk is reduced to distinct
+    ``(source, destination)`` edges before being merged into the running
+    totals, so memory is bounded by the number of distinct edges rather
+    than the number of records. ``sankey`` prunes the diagram to the
+    ``top_k`` busiest entities, split between senders and receivers; the
+    rest are folded into "Other" buckets, one on the sending and one on
+    the receiving side so no cycles appear.
+    """
+    
+    def __init__(self, other_label='Other'):
+        self.other_label = other_label
+        self.labels = []
+        self.label_index = {}
+        self.edge_keys = np.zeros(0, dtype=np.int64)
+        self.edge_volume = np.zeros(0)
+        self.records = 0
+    
+    def _intern(self, values):
+        """Global node codes for an array of labels"""
+        codes, uniques = pd.factorize(values)
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, label in enumerate(uniques):
+            index = self.label_index.get(label)
+            if index is None:
+                index = self.label_index[label] = len(self.labels)
+                self.labels.append(label)
+            mapping[i] = index
+        return mapping[codes]
+    
+    def add(self, source, destination, volume):
+        """Fold one chunk of flow records into the running edge totals"""
+        keys = (self._intern(source) << 32) | self._intern(destination)
+        self.records += len(keys)
+        keys = np.concatenate((self.edge_keys, keys))
+        volume = np.concatenate((self.edge_volume, np.asarray(volume, dtype=np.float64)))
+        inverse, self.edge_keys = pd.factorize(keys)
+        self.edge_volume = np.bincount(inverse, weights=volume, minlength=len(self.edge_keys))
+        return self
+    
+    @classmethod
+    def aggregate(cls, chunks, other_label='Other'):
+        """Engine fed with every ``(source, destination, volume)`` chunk"""
+        engine = cls(other_label)
+        for source, destination, volume in chunks:
+            engine.add(source, destination, volume)
+        return engine
+    
+    @property
+    def total_volume(self):
+        return float(self.edge_volume.sum())
+    
+    def sankey(self, top_k=None, unit=1.0):
+        """Highcharts ``(nodes, links)`` with at most ``top_k`` named entities
+
+        Each side gets its share: the ``ceil(top_k / 2)`` busiest senders
+        (by outbound volume) and the ``floor(top_k / 2)`` busiest receivers
+        (by inbound volume) are named, and slots left by entities on both
+        lists go to the next by throughput (the larger of the two). Link
+        weights are divided by ``unit`` and links are ordered by weight.
+        """
+        num_labels = len(self.labels)
+        source = self.edge_keys >> 32
+        target = self.edge_keys & 0xFFFFFFFF
+        volume = self.edge_volume
+        
+        if top_k is not None and top_k < num_labels:
+            outbound = np.bincount(source, weights=volume, minlength=num_labels)
+            inbound = np.bincount(target, weights=volume, minlength=num_labels)
+            keep = np.zeros(num_labels, dtype=bool)
+            keep[np.argsort(-outbound, kind='stable')[:(top_k + 1) // 2]] = True
+            keep[np.argsort(-inbound, kind='stable')[:top_k // 2]] = True
+            ranked = np.argsort(-np.maximum(outbound, inbound), kind='stable')
+            keep[ranked[~keep[ranked]][:top_k - int(keep.sum())]] = True
+            source = np.where(keep[source], source, num_labels)
+            target = np.where(keep[target], target, num_labels + 1)
+            keys, inverse = np.unique((source << 32) | target, return_inverse=True)
+            volume = np.bincount(inverse, weights=volume, minlength=len(keys))
+            source, target = keys >> 32, keys & 0xFFFFFFFF
+        
+        # Sankey diagrams cannot draw an entity sending to itself
+        loop = source == target
+        source, target, volume = source[~loop], target[~loop], volume[~loop]
+        
+        labels = self.labels + [f'{self.other_label} sources', f'{self.other_label} destinations']
+        order = np.argsort(-volume, kind='stable')
+        links = [
+            [labels[s], labels[t], round(v / unit, 2)]
+            for s, t, v in zip(source[order].tolist(), target[order].tolist(), volume[order].tolist())
+        ]
+        used = np.unique(np.concatenate((source, target))).tolist()
+        nodes = [{'id': labels[i], 'name': labels[i]} for i in used]
+        return nodes, links
+
+class TimeSeriesDownsampler:
+    """Reduce long incident series to a pixel-appropriate number of points
+
+    Uses Largest-Triangle-Three-Buckets: the interior points are split into
+    ``target - 2`` equal buckets and each bucket keeps the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    mean, which preserves peaks and the overall shape far better than
+    striding. First and last points are always kept.
+    """
+    
+    def __init__(self, cache=None, target_points=1200, boost_threshold=5000):
+        self.cache = cache if cache is not None else LRUCache(maxsize=16)
+        self.target_points = target_points
+        self.boost_threshold = boost_threshold
+    
+    @staticmethod
+    def lttb(x, y, target):
+        """Indices of the ``target`` points LTTB keeps from ``(x, y)``"""
+        n = len(x)
+        if target >= n or target < 3:
+            return np.arange(n)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        
+        # Bucket b covers [edges[b], edges[b + 1]); per-bucket means come from
+        # one reduceat pass, the last point doubling as the final "next mean"
+        edges = (np.arange(target - 1) * ((n - 2) / (target - 2))).astype(np.int64) + 1
+        edges[-1] = n - 1
+        counts = np.diff(edges)
+        mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+        mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+        
+        kept = np.empty(target, dtype=np.int64)
+        kept[0], kept[-1] = 0, n - 1
+        a = 0
+        for b in range(target - 2):
+            start, stop = edges[b], edges[b + 1]
+            area = np.abs(
+                (x[a] - mean_x[b + 1]) * (y[start:stop] - y[a])
+                - (x[a] - x[start:stop]) * (mean_y[b + 1] - y[a])
+            )
+            a = start + int(np.argmax(area))
+            kept[b + 1] = a
+        return kept
+    
+    def downsample(self, timestamps, series, target=None):
+        """Highcharts series with every ``counts`` array reduced to ``target`` points
+
+        ``series`` holds ``{'name', 'color', 'counts'}`` entries sharing the
+        ``timestamps`` (epoch milliseconds) axis. ``target=0`` keeps every
+        point. Returns ``(series_data, boost)``.
+        """
+        target = self.target_points if target is None else target
+        key = fingerprint('lttb', timestamps, [(s['name'], s['counts']) for s in series], target)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        
+        series_data = []
+        for s in series:
+            kept = self.lttb(timestamps, s['counts'], target) if target else np.arange(len(timestamps))
+            points = np.column_stack((timestamps[kept], s['counts'][kept])).astype(np.int64)
+            series_data.append({'name': s['name'], 'color': s['color'], 'data': points.tolist()})
+        boost = max((len(s['data']) for s in series_data), default=0) > self.boost_threshold
+        
+        result = (series_data, boost)
+        self.cache.put(key, result)
+        return result
+
+class HeatmapAggregator:
+    """Incrementally maintained day x time-slot risk grid
+
+    Timestamped risk events (epoch seconds, UTC) are folded into running
+    per-cell sums, counts and maxima with ``np.bincount`` /
+    ``np.maximum.at``, so each ``update`` costs O(batch). Day rows cycle
+    through ``num_days`` consecutive days starting on a Monday and the
+    8:00-22:00 window is split into ``num_slots`` slots, matching
+    ``DataSimulator.generate_heatmap_arrays``.
+
+    With a ``window`` (seconds) every batch is also kept as sparse per-pane
+    partial aggregates; expired panes are subtracted from the sums and
+    counts. Maxima cannot be un-merged, so they are rebuilt from the live
+    panes only when something actually expires.
+    """
+    
+    DAY_START = 8 * 3600
+    DAY_SPAN = 14 * 3600
+    
+    def __init__(self, num_days, num_slots, window=None, pane=3600):
+        self.shape = (num_days, num_slots)
+        self.window = window
+        self.pane = pane
+        cells = num_days * num_slots
+        self.sums = np.zeros(cells)
+        self.counts = np.zeros(cells, dtype=np.int64)
+        self.maxima = np.zeros(cells)
+        self.panes = deque()
+        self.latest = None
+        self.events = 0
+    
+    def cell_index(self, timestamps):
+        """Flat cell index per event and the mask of events inside the grid"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        day = (timestamps // 86400 + 3) % self.shape[0]
+        second = timestamps % 86400 - self.DAY_START
+        inside = (second >= 0) & (second < self.DAY_SPAN)
+        slot = np.clip(second * self.shape[1] // self.DAY_SPAN, 0, self.shape[1] - 1)
+        return day * self.shape[1] + slot, inside
+    
+    def update(self, timestamps, risks):
+        """Fold one batch of events into the grid, then expire old panes
+
+        Returns the flat indices of every cell whose mean changed (touched
+        by the batch or by an expired pane).
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        risks = np.asarray(risks, dtype=np.float64)
+        if len(timestamps) == 0:
+            return np.zeros(0, dtype=np.int64)
+        cells, inside = self.cell_index(timestamps)
+        timestamps, risks, cells = timestamps[inside], risks[inside], cells[inside]
+        size = len(self.sums)
+        
+        self.sums += np.bincount(cells, weights=risks, minlength=size)
+        self.counts += np.bincount(cells, minlength=size)
+        np.maximum.at(self.maxima, cells, risks)
+        self.events += len(cells)
+        
+        if self.window is not None and len(cells):
+            # One sparse (cells, sums, counts, maxima) record per pane touched
+            keys, inverse = np.unique((timestamps // self.pane) * size + cells, return_inverse=True)
+            sums = np.bincount(inverse, weights=risks)
+            counts = np.bincount(inverse)
+            maxima = np.zeros(len(keys))
+            np.maximum.at(maxima, inverse, risks)
+            pane_ids = keys // size
+            bounds = np.flatnonzero(np.diff(pane_ids)) + 1
+            for part in np.split(np.arange(len(keys)), bounds):
+                self.panes.append((int(pane_ids[part[0]]), keys[part] % size, sums[part], counts[part], maxima[part]))
+        
+        batch_latest = int(timestamps.max()) if len(timestamps) else None
+        if batch_latest is not None and (self.latest is None or batch_latest > self.latest):
+            self.latest = batch_latest
+        return np.unique(np.concatenate([cells, self.expire()]))
+    
+    def expire(self, now=None):
+        """Drop panes that ended more than ``window`` seconds before ``now``
+
+        Returns the flat indices of the cells the expired panes covered.
+        """
+        now = self.latest if now is None else now
+        if self.window is None or now is None:
+            return np.zeros(0, dtype=np.int64)
+        horizon = (now - self.window) // self.pane
+        live = deque()
+        expired = []
+        for record in self.panes:
+            if record[0] < horizon:
+                pane_id, cells, sums, counts, maxima = record
+                self.sums -= np.bincount(cells, weights=sums, minlength=len(self.sums))
+                self.counts -= np.bincount(cells, weights=counts, minlength=len(self.counts)).astype(np.int64)
+                self.events -= int(counts.sum())
+                expired.append(cells)
+            else:
+                live.append(record)
+        if expired:
+            self.panes = live
+            self.maxima[:] = 0
+            for _, cells, _, _, maxima in self.panes:
+                np.maximum.at(self.maxima, cells, maxima)
+        return np.concatenate(expired) if expired else np.zeros(0, dtype=np.int64)
+    
+    def grid(self):
+        """Mean risk per cell as a (num_days, num_slots) int grid (0 where empty)"""
+        return self.values().reshape(self.shape)
+    
+    def values(self, cells=None):
+        """Rounded mean risk of the flat ``cells`` (default: all), 0 where empty"""
+        sums = self.sums if cells is None else self.sums[cells]
+        counts = self.counts if cells is None else self.counts[cells]
+        means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        return np.rint(means).astype(np.int64)
+    
+    def summary(self, threshold=70):
+        """Average and peak event risk, plus the number of high-risk cells"""
+        total = int(self.counts.sum())
+        average = float(self.sums.sum() / total) if total else 0.0
+        occupied = self.counts > 0
+        means = self.sums[occupied] / self.counts[occupied]
+        return {
+            'average': average,
+            'peak': float(self.maxima.max()) if total else 0.0,
+            'high_risk': int(np.count_nonzero(means > threshold)),
+            'events': total
+        }
+
+class HeatmapPyramid:
+    """Multi-resolution time x location risk grid for zoomable heatmaps
+
+    Events are binned into a fine ``time_bins`` x ``location_bins`` grid of
+    per-cell risk sums and counts (uniform histogram bins computed
+    arithmetically and folded with a flat ``np.bincount``). ``build`` then
+    sum-pools pairs of bins along each axis separately: level ``(t, l)``
+    has the time axis halved ``t`` times and the location axis ``l`` times
+    (odd axes are zero-padded). A region that is long but narrow is so
+    only coarsened along its long axis. Keeping every combination costs
+    about four times the finest grid.
+
+    ``view`` serves a region from the finest level whose slice fits the
+    requested number of bins on each axis, so every zoom costs a slice of
+    precomputed arrays instead of re-binning the events.
+    """
+    
+    def __init__(self, time_range, location_range, time_bins, location_bins):
+        self.time_range = time_range
+        self.location_range = location_range
+        self.sums = {(0, 0): np.zeros((time_bins, location_bins), dtype=np.float32)}
+        self.counts = {(0, 0): np.zeros((time_bins, location_bins), dtype=np.int32)}
+        self.levels = (1, 1)
+        self.events = 0
+    
+    def bin_size(self, level=(0, 0)):
+        """``(seconds, locations)`` covered by one bin of ``level``"""
+        (t0, t1), (l0, l1) = self.time_range, self.location_range
+        rows, columns = self.sums[0, 0].shape
+        return (t1 - t0) / rows * 2 ** level[0], (l1 - l0) / columns * 2 ** level[1]
+    
+    def add(self, timestamps, locations, risks):
+        """Bin a batch of events into the finest level; events outside the ranges are dropped
+
+        Coarser levels are discarded and must be rebuilt with ``build``.
+        """
+        rows, columns = self.sums[0, 0].shape
+        (t0, t1), (l0, l1) = self.time_range, self.location_range
+        row = (np.asarray(timestamps, dtype=np.float64) - t0) * (rows / (t1 - t0))
+        column = (np.asarray(locations, dtype=np.float64) - l0) * (columns / (l1 - l0))
+        np.floor(row, out=row)
+        np.floor(column, out=column)
+        inside = (row >= 0) & (row < rows) & (column >= 0) & (column < columns)
+        risks = np.asarray(risks, dtype=np.float64)
+        if not inside.all():
+            row, column, risks = row[inside], column[inside], risks[inside]
+        row *= columns
+        row += column
+        cells = row.astype(np.int64)
+        
+        self.sums = {(0, 0): self.sums[0, 0]}
+        self.counts = {(0, 0): self.counts[0, 0]}
+        self.levels = (1, 1)
+        self.sums[0, 0] += np.bincount(cells, weights=risks, minlength=rows * columns).reshape(rows, columns)
+        self.counts[0, 0] += np.bincount(cells, minlength=rows * columns).reshape(rows, columns).astype(np.int32)
+        self.events += len(cells)
+    
+    @staticmethod
+    def _pool(grid, axis):
+        """Sum pairs of bins of ``grid`` along ``axis``"""
+        if grid.shape[axis] % 2:
+            padding = [(0, 0), (0, 0)]
+            padding[axis] = (0, 1)
+            grid = np.pad(grid, padding)
+        shape = list(grid.shape)
+        shape[axis:axis + 1] = [shape[axis] // 2, 2]
+        return grid.reshape(shape).sum(axis=axis + 1, dtype=grid.dtype)
+    
+    def build(self):
+        """Compute every coarser level from the finest one; returns self"""
+        rows, columns = self.sums[0, 0].shape
+        self.levels = tuple(int(np.ceil(np.log2(n))) + 1 if n > 1 else 1 for n in (rows, columns))
+        for t in range(self.levels[0]):
+            for l in range(self.levels[1]):
+                if (t, l) != (0, 0):
+                    source, axis = ((t, l - 1), 1) if l else ((t - 1, l), 0)
+                    self.sums[t, l] = self._pool(self.sums[source], axis)
+                    self.counts[t, l] = self._pool(self.counts[source], axis)
+        return self
+    
+    def _span(self, axis, level, bounds):
+        """Bin slice of ``axis`` at its ``level`` covering ``bounds`` (default: the whole range)"""
+        start = (self.time_range, self.location_range)[axis][0]
+        key = (level, 0) if axis == 0 else (0, level)
+        size = self.bin_size(key)[axis]
+        count = self.sums[key].shape[axis]
+        if bounds is None:
+            return 0, count
+        first = int(np.clip(np.floor((bounds[0] - start) / size), 0, count - 1))
+        last = int(np.clip(np.ceil((bounds[1] - start) / size), first + 1, count))
+        return first, last
+    
+    def level_for(self, time_range=None, location_range=None, max_bins=(96, 64)):
+        """Finest ``(time, location)`` level at which the region spans at most ``max_bins`` bins per axis"""
+        level = []
+        for axis, bounds, limit in zip((0, 1), (time_range, location_range), max_bins):
+            for axis_level in range(self.levels[axis]):
+                first, last = self._span(axis, axis_level, bounds)
+                if last - first <= limit:
+                    break
+            level.append(axis_level)
+        return tuple(level)
+    
+    def view(self, time_range=None, location_range=None, max_bins=(96, 64)):
+        """Mean risk tile of a region at the finest level that fits ``max_bins``
+
+        Returns ``{'level', 'time_start', 'location_start', 'bin_size',
+        'means', 'counts'}`` where ``level`` is the ``(time, location)``
+        level, ``means`` is a (time, location) array (NaN where empty) and
+        the starts are those of its first bin.
+        """
+        level = self.level_for(time_range, location_range, max_bins)
+        (r0, r1), (c0, c1) = self._span(0, level[0], time_range), self._span(1, level[1], location_range)
+        sums = self.sums[level][r0:r1, c0:c1]
+        counts = self.counts[level][r0:r1, c0:c1]
+        means = np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+        size = self.bin_size(level)
+        return {
+            'level': level,
+            'time_start': self.time_range[0] + r0 * size[0],
+            'location_start': self.location_range[0] + c0 * size[1],
+            'bin_size': size,
+            'means': means,
+            'counts': counts
+        }
+
+class PrivacyRiskScorer:
+    """Weighted per-user privacy risk over feature columns
+
+    Every feature is min-max normalised against ``FEATURE_RANGES`` and
+    clipped to [0, 1]; a factor is the weighted mean of its features and a
+    user's score (0-100) is the weighted sum of their factors, so the
+    factor contributions add up to the score. Scoring is a handful of
+    in-place float32 array operations per feature. ``update`` folds a chunk
+    of users into running population aggregates (sums and a 0.1-point
+    score histogram), so populations of any size are scored in bounded
+    memory and ``summary`` reports means and percentiles.
+    """
+    
+    FACTORS = {
+        'Location': {'geotag_rate': 0.6, 'location_history_days': 0.4},
+        'Data Sharing': {'third_party_apps': 0.5, 'public_fields': 0.3, 'ad_tracking': 0.2},
+        'Network': {'contact_risk': 1.0}
+    }
+    FACTOR_WEIGHTS = {'Location': 0.35, 'Data Sharing': 0.4, 'Network': 0.25}
+    FEATURE_RANGES = {
+        'geotag_rate': (0.0, 1.0), 'location_history_days': (0.0, 365.0),
+        'third_party_apps': (0.0, 30.0), 'public_fields': (0.0, 12.0),
+        'ad_tracking': (0.0, 1.0), 'contact_risk': (0.0, 1.0)
+    }
+    BINS = 1000
+    
+    def __init__(self, factors=None, factor_weights=None, high_risk=70):
+        self.factors = factors or self.FACTORS
+        self.factor_weights = factor_weights or self.FACTOR_WEIGHTS
+        self.high_risk = high_risk
+        total = sum(self.factor_weights.values())
+        # Per factor: (feature, offset, scale) with the factor's share of
+        # the 0-100 score folded into the scale
+        self._terms = {}
+        for factor, features in self.factors.items():
+            share = 100.0 * self.factor_weights[factor] / total / sum(features.values())
+            self._terms[factor] = []
+            for feature, weight in features.items():
+                low, high = self.FEATURE_RANGES[feature]
+                self._terms[factor].append((feature, low, high - low, np.float32(share * weight / (high - low))))
+        self.users = 0
+        self.score_sum = 0.0
+        self.contribution_sums = dict.fromkeys(self.factors, 0.0)
+        self.histogram = np.zeros(self.BINS + 1, dtype=np.int64)
+    
+    def score(self, columns):
+        """Per-user ``(score, {factor: contribution})`` float32 arrays for a chunk"""
+        contributions = {}
+        score = None
+        for factor, terms in self._terms.items():
+            total = None
+            for feature, low, span, scale in terms:
+                value = np.subtract(columns[feature], low, dtype=np.float32)
+                np.clip(value, 0.0, span, out=value)
+                value *= scale
+                if total is None:
+                    total = value
+                else:
+                    total += value
+            contributions[factor] = total
+            score = total.copy() if score is None else score + total
+        return score, contributions
+    
+    def update(self, columns):
+        """Fold one chunk of users into the population aggregates"""
+        score, contributions = self.score(columns)
+        self.users += len(score)
+        self.score_sum += float(score.sum(dtype=np.float64))
+        for factor, contribution in contributions.items():
+            self.contribution_sums[factor] += float(contribution.sum(dtype=np.float64))
+        bins = np.multiply(score, self.BINS / 100.0, dtype=np.float32).astype(np.int32)
+        self.histogram += np.bincount(np.minimum(bins, self.BINS), minlength=self.BINS + 1)
+        return score
+    
+    def percentile(self, q):
+        """Score below which ``q`` percent of the users fall (0.1-point resolution)"""
+        if not self.users:
+            return 0.0
+        rank = np.searchsorted(np.cumsum(self.histogram), q / 100.0 * self.users)
+        return min((float(rank) + 0.5) * 100.0 / self.BINS, 100.0)
+    
+    def summary(self):
+        """Population mean, percentiles, high-risk share and factor contributions"""
+        users = max(self.users, 1)
+        high_bin = int(self.high_risk * self.BINS / 100)
+        total = sum(self.factor_weights.values())
+        return {
+            'users': self.users,
+            'mean': self.score_sum / users,
+            'percentiles': {q: self.percentile(q) for q in (50, 90, 99)},
+            'high_risk_share': float(self.histogram[high_bin:].sum()) / users,
+            'factors': {
+                factor: {
+                    'weight': self.factor_weights[factor] / total,
+                    'contribution': self.contribution_sums[factor] / users,
+                    'score': self.contribution_sums[factor] / users / (self.factor_weights[factor] / total)
+                }
+                for factor in self.factors
+            }
+        }
+
+class LiveEventSource:
+    """Simulated event feed for live mode
+
+    Simulated time runs ``speed`` times faster than the wall clock and is
+    cut into one-minute batches of incident counts and location-risk
+    events. Batches are generated when ``poll`` finds them due, so each
+    poll costs time proportional to the new data. The last ``retention``
+    batches are kept; consumers read everything after their cursor with
+    ``since`` and get None once they fell further behind than that. An
+    idle feed jumps ahead instead of catching up.
+    """
+    
+    def __init__(self, seed=None, scale=1, speed=60, retention=120, start=None):
+        self.seed = seed
+        self.scale = scale
+        self.speed = speed
+        self.start = (int(time.time()) if start is None else int(start)) // 60 * 60
+        self.started = time.time()
+        self.batches = deque(maxlen=retention)
+        self.sequence = 0
+    
+    def poll(self, now=None):
+        """Generate the batches due at wall-clock ``now``; returns how many"""
+        now = time.time() if now is None else now
+        due = int((now - self.started) * self.speed / 60)
+        if due - self.sequence > self.batches.maxlen:
+            self.sequence = due - self.batches.maxlen
+        generated = 0
+        while self.sequence < due:
+            self.batches.append(self._batch(self.sequence))
+            self.sequence += 1
+            generated += 1
+        return generated
+    
+    def _batch(self, sequence):
+        minute = self.start + 60 * sequence
+        seed = None if self.seed is None else [self.seed, sequence]
+        timestamps, risks = DataSimulator.generate_risk_events(minute, 1 / 60, seed, self.scale)
+        return {
+            'sequence': sequence,
+            'minute': minute,
+            'incidents': DataSimulator.generate_incident_minutes(minute, 1, seed)[0],
+            'timestamps': timestamps,
+            'risks': risks
+        }
+    
+    @property
+    def clock(self):
+        """Simulated time (epoch seconds) of the end of the last batch"""
+        return self.start + 60 * self.sequence
+    
+    def since(self, cursor):
+        """Batches after sequence number ``cursor``, or None if some were already dropped"""
+        if not self.batches:
+            return [] if cursor >= self.sequence - 1 else None
+        first = self.batches[0]['sequence']
+        if cursor + 1 < first:
+            return None
+        return list(self.batches)[cursor + 1 - first:]
+
+class TelemetryIngestor:
+    """Stream CSV / JSONL telemetry into the aggregates behind every section
+
+    The file is read in ``chunk_rows`` row chunks (pandas ``chunksize``) and
+    each chunk is routed by its ``type`` column:
+
+    - ``connection``: ``user``, ``contact`` (optional ``community``) -> network
+    - ``flow``: ``source``, ``destination``, ``bytes`` -> Sankey
+    - ``location``: ``timestamp``, ``risk`` -> heatmap
+    - ``incident``: ``timestamp``, ``incident`` (optional ``count``) -> timeline
+    - ``platform``: ``platform``, ``users``, ``privacy``, ``data`` -> bubble chart
+
+    Timestamps are epoch seconds or ISO-8601 strings. Only the aggregates
+    are kept, so memory depends on the number of distinct users, flows and
+    platforms rather than on the file size.
+    """
+    
+    INCIDENT_COLORS = ['#FF4560', '#8B5CF6', '#FF9800', '#00E396', '#2E93fA']
+    
+    def __init__(self, chunk_rows=100_000):
+        self.chunk_rows = chunk_rows
+        self.connections = SankeyFlowEngine()
+        self.communities = {}
+        self.flows = SankeyFlowEngine()
+        self.heatmap = HeatmapAggregator(len(DataSimulator.DAYS), DataSimulator.BASE_GRID)
+        self.incidents = {}
+        self.platforms = {}
+        self.rows = 0
+        self.row_types = {}
+    
+    @staticmethod
+    def read_chunks(handle, fmt, chunk_rows):
+        """DataFrame chunks of a binary file handle in ``'csv'`` or ``'jsonl'`` format"""
+        if fmt == 'jsonl':
+            reader = pd.read_json(handle, lines=True, chunksize=chunk_rows, dtype=False)
+        else:
+            reader = pd.read_csv(handle, chunksize=chunk_rows)
+        with reader:
+            yield from reader
+    
+    @staticmethod
+    def epoch_seconds(values):
+        """Epoch seconds from numeric, ISO-8601 or mixed timestamps
+
+        Numbers (and numeric strings) are read as epoch seconds; everything
+        else is parsed as ISO-8601. Datetimes are converted by subtracting
+        the epoch, so the result does not depend on the unit pandas stores
+        them in (``ns`` in pandas 2, ``us`` for parsed strings in pandas 3).
+        """
+        epoch = pd.Timestamp(0, tz='UTC')
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = pd.to_datetime(values, utc=True)
+            return ((values - epoch) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+        seconds = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        text = np.isnan(seconds)
+        if text.any():
+            parsed = pd.to_datetime(values[text], utc=True, format='ISO8601')
+            seconds[text] = ((parsed - epoch) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.float64)
+        return seconds.astype(np.int64)
+    
+    def ingest(self, handle, fmt, total_bytes=None, progress=None):
+        """Read every chunk of ``handle``; ``progress(rows, fraction)`` is called per chunk"""
+        for chunk in self.read_chunks(handle, fmt, self.chunk_rows):
+            self.add_chunk(chunk)
+            if progress is not None:
+                fraction = min(handle.tell() / total_bytes, 1.0) if total_bytes else None
+                progress(self.rows, fraction)
+        return self
+    
+    def add_chunk(self, chunk):
+        """Route one DataFrame chunk into the section aggregates"""
+        self.rows += len(chunk)
+        for row_type, rows in chunk.groupby('type', sort=False):
+            self.row_types[row_type] = self.row_types.get(row_type, 0) + len(rows)
+            if row_type == 'connection':
+                users = rows['user'].astype(str)
+                self.connections.add(users, rows['contact'].astype(str), np.ones(len(rows)))
+                if 'community' in rows:
+                    labelled = rows['community'].notna()
+                    self.communities.update(zip(users[labelled], rows['community'][labelled].astype(str)))
+            elif row_type == 'flow':
+                self.flows.add(rows['source'].astype(str), rows['destination'].astype(str),
+                               rows['bytes'].to_numpy(dtype=np.float64))
+            elif row_type == 'location':
+                self.heatmap.update(self.epoch_seconds(rows['timestamp']), rows['risk'].to_numpy(dtype=np.float64))
+            elif row_type == 'incident':
+                monthly = pd.DataFrame({
+                    'incident': rows['incident'].astype(str).to_numpy(),
+                    'month': pd.to_datetime(self.epoch_seconds(rows['timestamp']), unit='s').month - 1,
+                    'count': rows['count'].fillna(1).to_numpy(dtype=np.float64) if 'count' in rows else 1.0
+                }).groupby(['incident', 'month'])['count'].sum()
+                for (name, month), count in monthly.items():
+                    self.incidents.setdefault(name, np.zeros(12))[month] += count
+            elif row_type == 'platform':
+                sums = rows.groupby('platform')[['users', 'privacy', 'data']].agg(['sum', 'count'])
+                for platform, values in sums.iterrows():
+                    total = self.platforms.setdefault(platform, np.zeros(6))
+                    total += values.to_numpy(dtype=np.float64)
+    
+    def network_graph(self):
+        """Undirected ``CompactGraph`` of the connection records, or None"""
+        if not self.connections.labels:
+            return None
+        keys = self.connections.edge_keys
+        source, target = keys >> 32, keys & 0xFFFFFFFF
+        low, high = np.minimum(source, target), np.maximum(source, target)
+        loop = low == high
+        edges, inverse = np.unique((low[~loop] << 32) | high[~loop], return_inverse=True)
+        weight = np.bincount(inverse, weights=self.connections.edge_volume[~loop], minlength=len(edges))
+        
+        num_nodes = len(self.connections.labels)
+        graph = CompactGraph(num_nodes, edges >> 32, edges & 0xFFFFFFFF, weight, ids=self.connections.labels)
+        degree = np.bincount(graph.source, minlength=num_nodes) + np.bincount(graph.target, minlength=num_nodes)
+        if self.communities:
+            named = [self.communities.get(user, 'Unassigned') for user in self.connections.labels]
+            labels, community = np.unique(named, return_inverse=True)
+            labels = labels.tolist()
+        else:
+            # Without community labels, each connected component is a community
+            _, community = np.unique(GraphMetricsEngine.connected_components(graph), return_inverse=True)
+            labels = DataSimulator.community_labels(int(community.max()) + 1)
+        community = community.astype(np.int32)
+        return graph.with_columns(
+            {
+                'value': np.maximum(degree, 1).astype(np.float32),
+                'community': community,
+                'color': (community % len(DataSimulator.NETWORK_COLORS)).astype(np.int32)
+            },
+            {'community': labels, 'color': list(DataSimulator.NETWORK_COLORS)}
+        )
+    
+    def heatmap_data(self):
+        """``(days, hours, grid)`` of mean location risk"""
+        days, hours = DataSimulator.heatmap_labels()
+        return days, hours, self.heatmap.grid()
+    
+    def bubble_data(self):
+        """Bubble chart points with the mean users / privacy / data per platform"""
+        data = []
+        for platform, total in self.platforms.items():
+            users, privacy, volume = (total[0::2] / np.maximum(total[1::2], 1)).tolist()
+            data.append({'x': round(users), 'y': round(privacy), 'z': round(volume), 'name': platform})
+        return data
+    
+    def timeline_data(self):
+        """Monthly incident totals as timeline series"""
+        return [
+            {
+                'name': name,
+                'data': totals.astype(np.int64).tolist(),
+                'color': self.INCIDENT_COLORS[i % len(self.INCIDENT_COLORS)]
+            }
+            for i, (name, totals) in enumerate(self.incidents.items())
+        ]
+
+class DataSimulator:
+    """Simulate data for ethical visualization
+
+    Passing an explicit ``seed`` (or a ``scale`` above 1) switches the network
+    and heatmap generators to a NumPy ``Generator``-backed mode that builds
+    the data in batch array operations, so load tests are repeatable and can
+    reach millions of nodes or links.
+    """
+    
+    DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    NETWORK_COLORS = ['#2E93fA', '#66DA26', '#E91E63']
+    BASE_NODES = 15
+    BASE_LINKS = 25
+    BASE_GRID = 7
+    RISK_EVENTS_PER_HOUR = 600
+    LOCATION_CELLS = 1024
+    LOCATION_EVENTS_PER_HOUR = 100_000
+    BASE_FLOW_RECORDS = 1000
+    BASE_USERS = 1000
+    INCIDENT_TYPES = [('Phishing Attacks', '#FF4560', 2.0), ('Data Breaches', '#8B5CF6', 0.5)]
+    FLOW_SOURCES = ['User Profile', 'User Posts', 'Location Data', 'Contacts', 'Photos', 'Browsing History']
+    FLOW_PLATFORMS = ['Facebook', 'Instagram', 'Twitter/X', 'TikTok', 'LinkedIn', 'Snapchat']
+    
+    @staticmethod
+    def community_labels(count):
+        """Spreadsheet-style community labels: A..Z, AA, AB, ..."""
+        labels = []
+        for i in range(count):
+            label = ''
+            i += 1
+            while i:
+                i, rem = divmod(i - 1, 26)
+                label = chr(65 + rem) + label
+            labels.append(label)
+        return labels
+    
+    @staticmethod
+    def generate_network_arrays(seed=None, scale=1, intra_community=0.8):
+        """Generate social network data as NumPy arrays
+
+        Returns a dict of per-node arrays (``value``, ``community``, ``color``
+        codes) and per-link ``source``/``target`` index arrays with self-loops
+        removed. A fraction ``intra_community`` of links stays inside the
+        source node's community.
+        """
+        rng = np.random.default_rng(seed)
+        num_nodes = DataSimulator.BASE_NODES * scale
+        num_links = DataSimulator.BASE_LINKS * scale
+        num_communities = 3 * int(np.ceil(scale ** (1 / 3) - 1e-9))
+        
+        value = rng.uniform(0.5, 5.0, num_nodes)
+        community = rng.integers(0, num_communities, num_nodes, dtype=np.int32)
+        color = rng.integers(0, len(DataSimulator.NETWORK_COLORS), num_nodes, dtype=np.int8)
+        
+        # Members of each community laid out contiguously, so an
+        # intra-community target is an offset into that community's slice
+        members = np.argsort(community, kind='stable').astype(np.int32)
+        sizes = np.bincount(community, minlength=num_communities)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        
+        source = rng.integers(0, num_nodes, num_links, dtype=np.int32)
+        target = rng.integers(0, num_nodes, num_links, dtype=np.int32)
+        intra = rng.random(num_links) < intra_community
+        src_community = community[source[intra]]
+        pick = (rng.random(intra.sum()) * sizes[src_community]).astype(np.int64)
+        target[intra] = members[offsets[src_community] + pick]
+        
+        keep = source != target
+        return {
+            'value': value,
+            'community': community,
+            'community_labels': DataSimulator.community_labels(num_communities),
+            'color': color,
+            'source': source[keep],
+            'target': target[keep]
+        }
+    
+    @staticmethod
+    def generate_network_graph(seed=None, scale=1):
+        """Generate social network data as a deduplicated ``CompactGraph``"""
+        if seed is None and scale == 1:
+            return CompactGraph.from_records(*DataSimulator.generate_network_data()).simplify()
+        arrays = DataSimulator.generate_network_arrays(seed, scale)
+        return CompactGraph(
+            len(arrays['value']), arrays['source'], arrays['target'],
+            ids='user_{}',
+            columns={
+                'value': arrays['value'].astype(np.float32),
+                'community': arrays['community'],
+                'color': arrays['color']
+            },
+            categories={
+                'community': arrays['community_labels'],
+                'color': list(DataSimulator.NETWORK_COLORS)
+            }
+        ).simplify()
+    
+    @staticmethod
+    def generate_network_data(seed=None, scale=1):
+        """Generate social network data"""
+        if seed is not None or scale != 1:
+            arrays = DataSimulator.generate_network_arrays(seed, scale)
+            labels = arrays['community_labels']
+            colors = DataSimulator.NETWORK_COLORS
+            nodes = [
+                {
+                    'id': f'user_{i}',
+                    'name': f'User_{1000 + i}',
+                    'value': value,
+                    'community': labels[community],
+                    'color': colors[color]
+                }
+                for i, (value, community, color) in enumerate(zip(
+                    arrays['value'].tolist(),
+                    arrays['community'].tolist(),
+                    arrays['color'].tolist()
+                ))
+            ]
+            links = [
+                [f'user_{source}', f'user_{target}']
+                for source, target in zip(arrays['source'].tolist(), arrays['target'].tolist())
+            ]
+            return nodes, links
+        
+        nodes = []
+        for i in range(15):
+            nodes.append({
+                'id': f'user_{i}',
+                'name': f'User_{1000 + i}',
+                'value': random.uniform(0.5, 5.0),
+                'community': random.choice(['A', 'B', 'C']),
+                'color': random.choice(['#2E93fA', '#66DA26', '#E91E63'])
+            })
+        
+        links = []
+        for i in range(25):
+            source = f'user_{random.randint(0, 14)}'
+            target = f'user_{random.randint(0, 14)}'
+            if source != target:
+                links.append([source, target])
+        
+        return nodes, links
+    
+    @staticmethod
+    def generate_sankey_data():
+        """Generate data for Sankey diagram"""
+        nodes = [
+            {'id': 'User', 'name': 'User Profile'},
+            {'id': 'Posts', 'name': 'User Posts'},
+            {'id': 'Location', 'name': 'Location Data'},
+            {'id': 'Platform', 'name': 'Social Platform'},
+            {'id': 'Advertisers', 'name': 'Advertisers'},
+            {'id': 'Analytics', 'name': 'Analytics Firms'}
+        ]
+        
+        links = [
+            ['User', 'Platform', 25],
+            ['Posts', 'Platform', 40],
+            ['Location', 'Platform', 15],
+            ['Platform', 'Advertisers', 50],
+            ['Platform', 'Analytics', 30]
+        ]
+        
+        return nodes, links
+    
+    @staticmethod
+    def iter_flow_records(seed=None, scale=1, chunk_size=1_000_000):
+        """Yield ``(source, destination, bytes)`` chunks of raw data-flow records
+
+        ``BASE_FLOW_RECORDS * scale`` records in total. Personal data flows
+        into platforms, and platforms pass it on to a long tail of third
+        parties (``10 * ceil(cbrt(scale))`` of each kind) with Zipf-like
+        popularity. Endpoints are categorical arrays.
+        """
+        rng = np.random.default_rng(seed)
+        tail = 10 * int(np.ceil(scale ** (1 / 3) - 1e-9))
+        third_parties = [
+            f'{kind} {i + 1}' for kind in ('Ad Network', 'Analytics Firm', 'Data Broker') for i in range(tail)
+        ]
+        categories = DataSimulator.FLOW_SOURCES + DataSimulator.FLOW_PLATFORMS + third_parties
+        num_sources = len(DataSimulator.FLOW_SOURCES)
+        num_platforms = len(DataSimulator.FLOW_PLATFORMS)
+        popularity = 1.0 / np.arange(1, len(third_parties) + 1)
+        popularity /= popularity.sum()
+        
+        remaining = DataSimulator.BASE_FLOW_RECORDS * scale
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            remaining -= count
+            platform = num_sources + rng.integers(0, num_platforms, count)
+            outbound = rng.random(count) < 0.6
+            source = np.where(outbound, platform, rng.integers(0, num_sources, count))
+            destination = np.where(
+                outbound, num_sources + num_platforms + rng.choice(len(third_parties), count, p=popularity), platform
+            )
+            volume = rng.lognormal(17, 1.2, count).astype(np.float32)
+            yield (pd.Categorical.from_codes(source, categories),
+                   pd.Categorical.from_codes(destination, categories),
+                   volume)
+    
+    @staticmethod
+    def heatmap_labels(scale=1):
+        """Day and time-slot labels of the heatmap grid for ``scale``"""
+        factor = int(np.ceil(np.sqrt(scale)))
+        num_days = DataSimulator.BASE_GRID * factor
+        num_slots = DataSimulator.BASE_GRID * factor
+        
+        if factor == 1:
+            days = list(DataSimulator.DAYS)
+        else:
+            days = [f'W{d // 7 + 1} {DataSimulator.DAYS[d % 7]}' for d in range(num_days)]
+        seconds = 8 * 3600 + (np.arange(num_slots) * (50400 / num_slots)).astype(np.int64)
+        if 50400 % (num_slots * 60) == 0:
+            hours = [f'{t // 3600}:{t // 60 % 60:02d}' for t in seconds.tolist()]
+        else:
+            hours = [f'{t // 3600}:{t // 60 % 60:02d}:{t % 60:02d}' for t in seconds.tolist()]
+        return days, hours
+    
+    @staticmethod
+    def generate_heatmap_arrays(seed=None, scale=1):
+        """Generate a day x time-slot risk grid as a NumPy array
+
+        ``scale`` multiplies the number of cells: with ``k = ceil(sqrt(scale))``
+        the days span ``k`` weeks and the 8:00-22:00 window is split into
+        ``7 * k`` slots.
+        """
+        rng = np.random.default_rng(seed)
+        days, hours = DataSimulator.heatmap_labels(scale)
+        num_days, num_slots = len(days), len(hours)
+        seconds = 8 * 3600 + (np.arange(num_slots) * (50400 / num_slots)).astype(np.int64)
+        
+        weekend = (np.arange(num_days) % 7) >= 5
+        evening = (seconds // 3600 >= 18) & (seconds // 3600 <= 22)
+        base_risk = 30 + 20 * weekend[:, None] + 25 * evening[None, :]
+        noise = rng.integers(-10, 11, (num_days, num_slots))
+        grid = np.clip(base_risk + noise, 0, 100)
+        
+        return days, hours, grid
+    
+    @staticmethod
+    def generate_heatmap_data(seed=None, scale=1):
+        """Generate heatmap data"""
+        if seed is not None or scale != 1:
+            days, hours, grid = DataSimulator.generate_heatmap_arrays(seed, scale)
+            ii, jj = np.indices(grid.shape)
+            data = np.column_stack((ii.ravel(), jj.ravel(), grid.ravel())).tolist()
+            return days, hours, data
+        
+        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        hours = [f'{h}:00' for h in range(8, 22, 2)]
+        
+        data = []
+        for i, day in enumerate(days):
+            for j, hour in enumerate(hours):
+                base_risk = 30
+                if day in ['Sat', 'Sun']:
+                    base_risk += 20
+                if 18 <= int(hour.split(':')[0]) <= 22:
+                    base_risk += 25
+                
+                risk = base_risk + random.randint(-10, 10)
+                risk = max(0, min(100, risk))
+                
+                data.append([i, j, risk])
+        
+        return days, hours, data
+    
+    @staticmethod
+    def generate_bubble_data():
+        """Generate bubble chart data"""
+        platforms = [
+            {'name': 'Facebook', 'users': 2910, 'privacy': 45, 'data': 85},
+            {'name': 'Instagram', 'users': 2000, 'privacy': 50, 'data': 75},
+            {'name': 'Twitter', 'users': 450, 'privacy': 60, 'data': 50},
+            {'name': 'LinkedIn', 'users': 930, 'privacy': 70, 'data': 40},
+            {'name': 'TikTok', 'users': 1500, 'privacy': 40, 'data': 90}
+        ]
+        
+        data = []
+        for platform in platforms:
+            data.append({
+                'x': platform['users'],
+                'y': platform['privacy'],
+                'z': platform['data'],
+                'name': platform['name']
+            })
+        
+        return data
+    
+    @staticmethod
+    def generate_timeline_data():
+        """Generate timeline data"""
+        series_data = [
+            {
+                'name': 'Phishing Attacks',
+                'data': [45, 52, 38, 60, 55, 48, 65, 70, 58, 62, 75, 80],
+                'color': '#FF4560'
+            },
+            {
+                'name': 'Data Breaches',
+                'data': [12, 15, 10, 18, 20, 15, 22, 25, 18, 20, 28, 30],
+                'color': '#8B5CF6'
+            }
+        ]
+        
+        return series_data
+
+    @staticmethod
+    def iter_user_features(seed=None, scale=1, chunk_size=1_000_000):
+        """Yield chunks of per-user privacy feature columns for ``PrivacyRiskScorer``
+
+        ``BASE_USERS * scale`` users: geotagged share of posts, days of
+        location history, connected third-party apps, public profile
+        fields, ad tracking opt-in and the share of risky contacts. A
+        per-user oversharing propensity drives the first five, so habits
+        are correlated as in real populations.
+        """
+        rng = np.random.default_rng(seed)
+        remaining = DataSimulator.BASE_USERS * scale
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            remaining -= count
+            propensity = rng.beta(2, 3, count).astype(np.float32)
+            yield {
+                'geotag_rate': 0.7 * propensity + 0.3 * rng.random(count, dtype=np.float32),
+                'location_history_days': rng.exponential(30 + 300 * propensity).astype(np.float32),
+                'third_party_apps': rng.poisson(2 + 25 * propensity).astype(np.int16),
+                'public_fields': rng.binomial(12, 0.1 + 0.8 * propensity).astype(np.int8),
+                'ad_tracking': (rng.random(count, dtype=np.float32) < 0.3 + 0.6 * propensity).astype(np.int8),
+                'contact_risk': rng.beta(1.5, 6, count).astype(np.float32)
+            }
+    
+    @staticmethod
+    def generate_risk_events(start, hours, seed=None, scale=1):
+        """Timestamped location-risk events for ``hours`` (may be fractional) hours after ``start``
+
+        Returns ``(timestamps, risks)``: epoch seconds (sorted) and risk
+        scores following the weekend / evening pattern of the heatmap. The
+        event rate grows with ``ceil(sqrt(scale))`` like the heatmap grid.
+        """
+        rng = np.random.default_rng(seed)
+        factor = int(np.ceil(np.sqrt(scale)))
+        count = rng.poisson(DataSimulator.RISK_EVENTS_PER_HOUR * factor * hours)
+        timestamps = np.sort(start + rng.integers(0, max(int(round(hours * 3600)), 1), count))
+        
+        weekend = (timestamps // 86400 + 3) % 7 >= 5
+        hour = timestamps % 86400 // 3600
+        base_risk = 30 + 20 * weekend + 25 * ((hour >= 18) & (hour <= 22))
+        risks = np.clip(base_risk + rng.integers(-10, 11, count), 0, 100)
+        
+        return timestamps, risks
+    
+    @staticmethod
+    def location_cells(scale=1):
+        """Number of simulated geo cells for ``scale``"""
+        return DataSimulator.LOCATION_CELLS * int(np.ceil(np.sqrt(scale)))
+    
+    @staticmethod
+    def iter_location_events(start, hours, seed=None, scale=1):
+        """Yield hourly ``(timestamps, locations, risks)`` chunks of geo-tagged risk events
+
+        Locations are geo cell ids in ``[0, location_cells(scale))`` ordered
+        along a space-filling curve, so neighbouring ids are neighbouring
+        areas. A few hotspot areas draw more and riskier events on top of
+        the weekend / evening pattern of ``generate_risk_events``.
+        """
+        rng = np.random.default_rng(seed)
+        factor = int(np.ceil(np.sqrt(scale)))
+        cells = np.arange(DataSimulator.location_cells(scale))
+        centers = rng.integers(0, len(cells), 8)
+        widths = len(cells) * rng.uniform(0.002, 0.02, 8)
+        hotspots = np.exp(-0.5 * ((cells[:, None] - centers) / widths) ** 2).max(axis=1)
+        popularity = (0.3 + hotspots) / (0.3 + hotspots).sum()
+        
+        for hour in range(hours):
+            count = rng.poisson(DataSimulator.LOCATION_EVENTS_PER_HOUR * factor)
+            chunk = start + 3600 * hour
+            offsets = rng.integers(0, 3600, count)
+            # Times are drawn independently of places, so one multinomial
+            # draw of per-cell counts replaces a per-event lookup in the
+            # popularity CDF; events come grouped by cell, in random time order
+            per_cell = rng.multinomial(count, popularity)
+            locations = np.repeat(cells, per_cell)
+            # A chunk spans at most two clock hours, each with one base risk
+            clock_hours = np.array([chunk, chunk + 3600]) // 3600 * 3600
+            weekend = (clock_hours // 86400 + 3) % 7 >= 5
+            hour_of_day = clock_hours % 86400 // 3600
+            base_risk = 30 + 20 * weekend + 25 * ((hour_of_day >= 18) & (hour_of_day <= 22))
+            risks = np.repeat(30 * hotspots, per_cell)
+            risks += np.where(offsets < 3600 - chunk % 3600, base_risk[0], base_risk[1])
+            risks += rng.integers(-10, 11, count)
+            yield chunk + offsets, locations, np.clip(risks, 0, 100, out=risks)
+    
+    @staticmethod
+    def daily_incident_cycle(minute_of_day):
+        """Relative incident rate over the day, peaking in the afternoon"""
+        return 1 + 0.6 * np.sin(2 * np.pi * (minute_of_day - 540) / 1440)
+    
+    @staticmethod
+    def generate_incident_minutes(start, minutes, seed=None):
+        """Per-minute counts of each ``INCIDENT_TYPES`` type after ``start`` (epoch seconds)
+
+        Returns a ``(minutes, types)`` int array following the daily cycle
+        of ``generate_incident_history``.
+        """
+        rng = np.random.default_rng(seed)
+        daily = DataSimulator.daily_incident_cycle((start // 60 + np.arange(minutes)) % 1440)
+        return np.column_stack([rng.poisson(rate * daily) for _, _, rate in DataSimulator.INCIDENT_TYPES]).astype(np.int32)
+    
+    @staticmethod
+    def generate_incident_history(seed=None, days=30):
+        """Per-minute incident counts over the last ``days`` days
+
+        Returns ``(timestamps, series)`` with epoch-millisecond timestamps and
+        one ``{'name', 'color', 'counts'}`` entry per incident type; counts
+        follow a daily cycle, a slow upward trend and occasional bursts.
+        """
+        rng = np.random.default_rng(seed)
+        minutes = days * 24 * 60
+        if seed is None:
+            end = int(datetime.now().replace(second=0, microsecond=0).timestamp()) * 1000
+        else:
+            end = int(datetime(2024, 12, 31, tzinfo=timezone.utc).timestamp()) * 1000
+        timestamps = end - 60000 * np.arange(minutes, 0, -1, dtype=np.int64)
+        
+        daily = DataSimulator.daily_incident_cycle(np.arange(minutes) % 1440)
+        trend = np.linspace(0.8, 1.2, minutes)
+        
+        series = []
+        for name, color, rate in DataSimulator.INCIDENT_TYPES:
+            intensity = rate * daily * trend
+            bursts = rng.random(minutes) < 0.0005
+            intensity[bursts] *= rng.uniform(5, 20, int(bursts.sum()))
+            series.append({'name': name, 'color': color, 'counts': rng.poisson(intensity).astype(np.int32)})
+        
+        return timestamps, series
+
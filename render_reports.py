@@ -0,0 +1,104 @@
+"""
+Render static dashboard reports in batch, without a Streamlit session
+Writes one self-contained HTML report per tenant, in parallel across CPU
+cores. A tenant is either a seeded simulation or a telemetry file (CSV or
+JSONL, see README).
+
+Usage: python render_reports.py --tenants 200 [--scale 10] [--out reports]
+       python render_reports.py --telemetry acme.csv globex.jsonl [--workers 8]
+"""
+
+import argparse
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Imported without a Streamlit runtime; keep its bare-mode warnings quiet
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+import social_media_privacy_dashboard_enhanced as dashboard  # noqa: E402
+
+# One builder per worker process, reused for every tenant that worker renders
+_builder = None
+
+
+def _init_worker(inline_assets):
+    global _builder
+    generator = dashboard.HighchartsGenerator(cache=dashboard.LRUCache(maxsize=1), inline_assets=inline_assets)
+    _builder = dashboard.ReportBuilder(generator)
+
+
+def report_filename(name):
+    """File name of a tenant's report"""
+    return re.sub(r'[^\w.-]+', '_', name) + '.html'
+
+
+def telemetry_names(paths):
+    """Tenant names of telemetry files: the file name, or where file names
+    clash, the path below the files' common directory"""
+    names = [os.path.basename(path) for path in paths]
+    if len(set(names)) < len(names):
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+        names = [os.path.relpath(os.path.abspath(path), root) for path in paths]
+    return names
+
+
+def render_tenant(job):
+    """Render and write one tenant's report; returns ``(name, path, bytes, seconds)``"""
+    name, seed, scale, telemetry_path, out_dir = job
+    start = time.perf_counter()
+    telemetry = None
+    if telemetry_path:
+        fmt = 'jsonl' if telemetry_path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+        with open(telemetry_path, 'rb') as handle:
+            telemetry = dashboard.TelemetryIngestor().ingest(handle, fmt, os.path.getsize(telemetry_path))
+    report = _builder.render(f"Privacy & Security Report: {name}", seed, scale, telemetry)
+    path = os.path.join(out_dir, report_filename(name))
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(report)
+    return name, path, len(report.encode('utf-8')), time.perf_counter() - start
+
+
+def render_reports(jobs, workers=None, inline_assets=False):
+    """Render every job on a pool of ``workers`` processes (default: all cores)"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(inline_assets)
+        yield from map(render_tenant, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(inline_assets,)) as pool:
+        yield from pool.map(render_tenant, jobs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--tenants', type=int, help='Number of simulated tenants (seeded 0..N-1)')
+    source.add_argument('--telemetry', nargs='+', help='One telemetry file per tenant')
+    parser.add_argument('--scale', type=int, default=1, help='Simulation scale of each simulated tenant')
+    parser.add_argument('--out', default='reports')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--cdn', action='store_true',
+                        help='Load Highcharts from the CDN instead of inlining the vendored bundle')
+    args = parser.parse_args()
+
+    inline_assets = not args.cdn
+    if inline_assets and not os.path.exists(os.path.join(dashboard.HighchartsGenerator.LOCAL_DIR, 'highcharts.js')):
+        parser.error('the Highcharts bundle is not vendored; run vendor_highcharts.py or pass --cdn')
+
+    if args.telemetry:
+        jobs = [(name, None, 1, path, args.out) for name, path in zip(telemetry_names(args.telemetry), args.telemetry)]
+    else:
+        jobs = [(f'tenant-{seed:04d}', seed, args.scale, None, args.out) for seed in range(args.tenants)]
+    clashes = sorted(name for name, count in Counter(report_filename(job[0]) for job in jobs).items() if count > 1)
+    if clashes:
+        parser.error('several tenants would write the same report: ' + ', '.join(clashes))
+    os.makedirs(args.out, exist_ok=True)
+
+    start = time.perf_counter()
+    total = 0
+    for name, path, size, seconds in render_reports(jobs, args.workers, inline_assets):
+        total += size
+        print(f'{name}: {path} ({size / 1024:.0f} KB, {seconds:.2f} s)')
+    print(f'{len(jobs)} reports, {total / 2 ** 20:.1f} MB in {time.perf_counter() - start:.1f} s')
@@ -4,62 +4,188 @@ Fixed for Streamlit Cloud Deployment
 M.Tech Mini Project - Module 5: Visualization - Highcharts
 """
 
-import pandas as pd
-import numpy as np
+import os
 import json
+import base64
+import html
+import logging
+import pickle
+import string
+import sys
+import tempfile
+import threading
+import time
+import types
 import streamlit as st
-from datetime import datetime, timedelta
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from datetime import datetime, timedelta, timezone
 import streamlit.components.v1 as components
 import random
 import warnings
 warnings.filterwarnings('ignore')
-
-# Try to import plotly with graceful fallback
-try:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-    st.warning("Plotly not installed. Some visualizations will use alternative methods.")
-
-# Page configuration
-st.set_page_config(
-    page_title="Advanced Highcharts Visualization Dashboard",
-    page_icon="📊",
-    layout="wide",
-    initial_sidebar_state="expanded"
+from privacy_engines import (
+    LazyModule, pd, np, fingerprint, LRUCache, GraphMetricsEngine,
+    RiskPropagationEngine, GraphLayoutEngine, CommunityCoarsener, SankeyFlowEngine,
+    TimeSeriesDownsampler, HeatmapAggregator, HeatmapPyramid, PrivacyRiskScorer,
+    LiveEventSource, TelemetryIngestor, DataSimulator
 )
 
+logger = logging.getLogger(__name__)
+
+futures = LazyModule('concurrent.futures')
+
+# Modules that importing the dashboard must not load (see benchmark_dashboard.py)
+LAZY_MODULES = ('pandas', 'numpy')
+
+class DiskCache:
+    """Pickled values on disk, keyed by ``fingerprint`` hex digests
+
+    Survives restarts and is shared by every worker process pointed at the
+    same ``directory``. Writes go to a temporary file that is renamed into
+    place, so readers never see a partial entry. A read refreshes the
+    entry's mtime; once the directory grows past ``max_bytes`` the least
+    recently used entries are deleted down to ``low_water`` of the limit.
+    Unreadable entries (evicted or corrupt) count as misses; failed writes,
+    including values that do not pickle, are skipped, and the first one is
+    logged. Values too large to fit below the low-water mark are not
+    written at all. Cached classes live in ``privacy_engines``, so their
+    instances load in any run or worker process.
+    """
+    
+    def __init__(self, directory, max_bytes=512 * 2 ** 20, low_water=0.8):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._write_failed = False
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(entry[2] for entry in self._scan())
+    
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.pkl')
+    
+    def _scan(self):
+        """``(mtime, path, bytes)`` for every entry currently on disk"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.pkl'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+    
+    def get(self, key):
+        """Unpickled value for ``key`` or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                value = pickle.load(handle)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            self.misses += 1
+            self._remove(path)
+            return None
+        self.hits += 1
+        return value
+    
+    def put(self, key, value):
+        """Atomically write ``value`` under ``key`` and evict if over budget"""
+        path = self._path(key)
+        temp_path = None
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(payload) > self.max_bytes * self.low_water:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(handle, 'wb') as temp:
+                temp.write(payload)
+            os.replace(temp_path, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as error:
+            if temp_path is not None:
+                self._remove(temp_path)
+            if not self._write_failed:
+                self._write_failed = True
+                logger.warning("Disk cache write to %s failed, skipping it: %s", self.directory, error)
+            return
+        with self._lock:
+            self.size += len(payload)
+            if self.size > self.max_bytes:
+                self.evict()
+    
+    def evict(self):
+        """Delete least recently used entries until below the low-water mark"""
+        # Other workers write to the same directory, so re-measure first
+        entries = sorted(self._scan())
+        self.size = sum(entry[2] for entry in entries)
+        for _, path, size in entries:
+            if self.size <= self.max_bytes * self.low_water:
+                break
+            if self._remove(path):
+                self.size -= size
+    
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+    
+    def stats(self):
+        """Hit/miss counters and bytes on disk"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes': self.size,
+            'max_bytes': self.max_bytes
+        }
+
+class JSExpression(str):
+    """Slot value that is inserted into a chart template verbatim (not JSON-encoded)"""
+
+class ChartTemplate:
+    """HTML template parsed once into literal chunks and named slots
+
+    Uses ``str.format`` syntax (``{slot}`` placeholders, ``{{``/``}}`` for
+    literal braces) but only splits the source once, so rendering is a
+    single join instead of a full format pass.
+    """
+    
+    def __init__(self, source):
+        self.chunks = []
+        self.slots = []
+        for literal, field, _, _ in string.Formatter().parse(source):
+            self.chunks.append(literal)
+            self.slots.append(field)
+    
+    def render(self, **values):
+        """Fill the slots with pre-serialized strings"""
+        parts = []
+        for literal, field in zip(self.chunks, self.slots):
+            parts.append(literal)
+            if field is not None:
+                parts.append(values[field])
+        return ''.join(parts)
+
 class HighchartsGenerator:
     """Class to generate various Highcharts visualizations"""
     
-    def __init__(self):
-        self.color_palette = [
-            '#2E93fA', '#66DA26', '#546E7A', '#E91E63', '#FF9800',
-            '#8B5CF6', '#00E396', '#FF4560', '#775DD0', '#3F51B5'
-        ]
-    
-    def create_network_graph(self, nodes_data, links_data):
-        """Create social network graph"""
-        html = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="https://code.highcharts.com/highcharts.js"></script>
-            <script src="https://code.highcharts.com/modules/networkgraph.js"></script>
-            <style>
-                #container {{
-                    min-width: 320px;
-                    max-width: 1200px;
-                    height: 600px;
-                    margin: 0 auto;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="container"></div>
-            <script type="text/javascript">
+    NETWORK_TEMPLATE = ChartTemplate('''{payload}
+                var networkPositions = {positions};
                 Highcharts.chart('container', {{
                     chart: {{
                         type: 'networkgraph',
@@ -76,8 +202,19 @@ class HighchartsGenerator:
                     }},
                     plotOptions: {{
                         networkgraph: {{
-                            keys: ['from', 'to'],
-                            layoutAlgorithm: {{
+                            keys: ['from', 'to', 'weight'],
+                            layoutAlgorithm: networkPositions ? {{
+                                enableSimulation: false,
+                                maxIterations: 0,
+                                initialPositions: function () {{
+                                    var box = this.box;
+                                    this.nodes.forEach(function (node) {{
+                                        var p = networkPositions[node.id] || [0.5, 0.5];
+                                        node.plotX = box.left + p[0] * box.width;
+                                        node.plotY = box.top + p[1] * box.height;
+                                    }});
+                                }}
+                            }} : {{
                                 enableSimulation: true,
                                 friction: -0.9
                             }}
@@ -85,8 +222,8 @@ class HighchartsGenerator:
                     }},
                     series: [{{
                         name: 'Social Network',
-                        data: {json.dumps(links_data)},
-                        nodes: {json.dumps(nodes_data)},
+                        data: {links_data},
+                        nodes: {nodes_data},
                         color: '#2E93fA',
                         dataLabels: {{
                             enabled: true,
@@ -95,37 +232,15 @@ class HighchartsGenerator:
                     }}],
                     tooltip: {{
                         formatter: function() {{
+                            var risk = this.point.options.risk;
                             return '<b>Node:</b> ' + this.point.name + '<br>' +
-                                   '<b>Connections:</b> ' + this.point.links.length;
+                                   '<b>Connections:</b> ' + this.point.links.length +
+                                   (risk !== undefined ? '<br><b>Privacy Risk:</b> ' + Math.round(risk * 100) + '%' : '');
                         }}
                     }}
-                }});
-            </script>
-        </body>
-        </html>
-        '''
-        return html
-    
-    def create_sankey_diagram(self, nodes, links):
-        """Create Sankey diagram for data flow analysis"""
-        html = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="https://code.highcharts.com/highcharts.js"></script>
-            <script src="https://code.highcharts.com/modules/sankey.js"></script>
-            <style>
-                #sankey-container {{
-                    min-width: 310px;
-                    max-width: 1200px;
-                    height: 600px;
-                    margin: 0 auto;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="sankey-container"></div>
-            <script type="text/javascript">
+                }});''')
+
+    SANKEY_TEMPLATE = ChartTemplate('''
                 Highcharts.chart('sankey-container', {{
                     chart: {{
                         type: 'sankey',
@@ -143,8 +258,8 @@ class HighchartsGenerator:
                     series: [{{
                         name: 'Data Flow',
                         keys: ['from', 'to', 'weight'],
-                        data: {json.dumps(links)},
-                        nodes: {json.dumps(nodes)},
+                        data: {links},
+                        nodes: {nodes},
                         nodeWidth: 20,
                         nodePadding: 10
                     }}],
@@ -152,33 +267,9 @@ class HighchartsGenerator:
                         headerFormat: null,
                         pointFormat: '<b>{{point.fromNode.name}}</b> → <b>{{point.toNode.name}}</b><br/>'
                     }}
-                }});
-            </script>
-        </body>
-        </html>
-        '''
-        return html
-    
-    def create_heatmap_chart(self, categories_x, categories_y, data):
-        """Create heatmap for location privacy analysis"""
-        html = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="https://code.highcharts.com/highcharts.js"></script>
-            <script src="https://code.highcharts.com/modules/heatmap.js"></script>
-            <style>
-                #heatmap-container {{
-                    min-width: 310px;
-                    max-width: 1200px;
-                    height: 500px;
-                    margin: 0 auto;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="heatmap-container"></div>
-            <script type="text/javascript">
+                }});''')
+
+    HEATMAP_TEMPLATE = ChartTemplate('''{payload}
                 Highcharts.chart('heatmap-container', {{
                     chart: {{
                         type: 'heatmap',
@@ -194,11 +285,11 @@ class HighchartsGenerator:
                         align: 'left'
                     }},
                     xAxis: {{
-                        categories: {json.dumps(categories_x)},
+                        categories: {categories_x},
                         title: {{ text: 'Day of Week' }}
                     }},
                     yAxis: {{
-                        categories: {json.dumps(categories_y)},
+                        categories: {categories_y},
                         title: {{ text: 'Hour of Day' }},
                         reversed: true
                     }},
@@ -210,7 +301,7 @@ class HighchartsGenerator:
                     series: [{{
                         name: 'Privacy Risk',
                         borderWidth: 1,
-                        data: {json.dumps(data)},
+                        data: {data},
                         dataLabels: {{
                             enabled: false
                         }}
@@ -222,32 +313,9 @@ class HighchartsGenerator:
                                    '<b>Privacy Risk:</b> ' + this.point.value;
                         }}
                     }}
-                }});
-            </script>
-        </body>
-        </html>
-        '''
-        return html
-    
-    def create_bubble_chart(self, data):
-        """Create bubble chart for social media metrics"""
-        html = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="https://code.highcharts.com/highcharts.js"></script>
-            <style>
-                #bubble-container {{
-                    min-width: 310px;
-                    max-width: 1200px;
-                    height: 500px;
-                    margin: 0 auto;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="bubble-container"></div>
-            <script type="text/javascript">
+                }});''')
+
+    BUBBLE_TEMPLATE = ChartTemplate('''
                 Highcharts.chart('bubble-container', {{
                     chart: {{
                         type: 'bubble',
@@ -275,38 +343,15 @@ class HighchartsGenerator:
                     }},
                     series: [{{
                         name: 'Platforms',
-                        data: {json.dumps(data)}
+                        data: {data}
                     }}],
                     tooltip: {{
                         headerFormat: '<b>{{point.name}}</b><br>',
                         pointFormat: 'Users: {{point.x}}M<br>Privacy Score: {{point.y}}<br>Data: {{point.z}}TB/month'
                     }}
-                }});
-            </script>
-        </body>
-        </html>
-        '''
-        return html
-    
-    def create_timeline_chart(self, series_data):
-        """Create timeline chart for security incidents"""
-        html = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="https://code.highcharts.com/highcharts.js"></script>
-            <style>
-                #timeline-container {{
-                    min-width: 310px;
-                    max-width: 1200px;
-                    height: 500px;
-                    margin: 0 auto;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="timeline-container"></div>
-            <script type="text/javascript">
+                }});''')
+
+    TIMELINE_TEMPLATE = ChartTemplate('''
                 Highcharts.chart('timeline-container', {{
                     chart: {{
                         type: 'line',
@@ -330,38 +375,58 @@ class HighchartsGenerator:
                             text: 'Number of Incidents'
                         }}
                     }},
-                    series: {json.dumps(series_data)},
+                    series: {series_data},
                     tooltip: {{
                         shared: true
                     }}
-                }});
-            </script>
-        </body>
-        </html>
-        '''
-        return html
-    
-    def create_gauge_chart(self, value, max_value=100):
-        """Create gauge chart for privacy risk score"""
-        html = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="https://code.highcharts.com/highcharts.js"></script>
-            <script src="https://code.highcharts.com/highcharts-more.js"></script>
-            <script src="https://code.highcharts.com/modules/solid-gauge.js"></script>
-            <style>
-                #gauge-container {{
-                    min-width: 310px;
-                    max-width: 600px;
-                    height: 400px;
-                    margin: 0 auto;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="gauge-container"></div>
-            <script type="text/javascript">
+                }});''')
+
+    INCIDENT_HISTORY_TEMPLATE = ChartTemplate('''
+                Highcharts.chart('incident-history-container', {{
+                    chart: {{
+                        type: 'line',
+                        height: 450,
+                        zoomType: 'x',
+                        backgroundColor: '#FFFFFF'
+                    }},
+                    boost: {{
+                        enabled: {boost},
+                        useGPUTranslations: true,
+                        seriesThreshold: 1
+                    }},
+                    title: {{
+                        text: 'Security Incidents History',
+                        align: 'left'
+                    }},
+                    subtitle: {{
+                        text: {subtitle},
+                        align: 'left'
+                    }},
+                    xAxis: {{
+                        type: 'datetime'
+                    }},
+                    yAxis: {{
+                        title: {{
+                            text: 'Incidents per Minute'
+                        }}
+                    }},
+                    plotOptions: {{
+                        series: {{
+                            lineWidth: 1,
+                            marker: {{
+                                enabled: false
+                            }},
+                            boostThreshold: {boost_threshold}
+                        }}
+                    }},
+                    series: {series_data},
+                    tooltip: {{
+                        shared: true,
+                        xDateFormat: '%Y-%m-%d %H:%M'
+                    }}
+                }});''')
+
+    GAUGE_TEMPLATE = ChartTemplate('''
                 Highcharts.chart('gauge-container', {{
                     chart: {{
                         type: 'solidgauge',
@@ -401,128 +466,968 @@ class HighchartsGenerator:
                                    '<span style="font-size:12px">OUT OF {max_value}</span></div>'
                         }}
                     }}]
-                }});
+                }});''')
+
+    DOCUMENT_TEMPLATE = ChartTemplate('''
+        <!DOCTYPE html>
+        <html>
+        <head>
+            {scripts}
+            <style>{styles}
+            </style>
+        </head>
+        <body>{header}{containers}
+            <script type="text/javascript">{helpers}{inits}
             </script>
         </body>
         </html>
-        '''
-        return html
-
-class DataSimulator:
-    """Simulate data for ethical visualization"""
+        ''')
+    
+    # Client-side decoders for binary payloads: base64 -> typed array ->
+    # the array/point formats Highcharts expects
+    BINARY_HELPERS = '''
+                function decodeTyped(packed) {
+                    var bin = atob(packed.data), bytes = new Uint8Array(bin.length);
+                    for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+                    return new window[packed.type](bytes.buffer);
+                }
+                function graphIds(table, count) {
+                    if (typeof table !== 'string') return table;
+                    var ids = new Array(count);
+                    for (var i = 0; i < count; i++) ids[i] = table.replace('{}', i);
+                    return ids;
+                }
+                function graphNodes(g) {
+                    var ids = g.idList = g.idList || graphIds(g.ids, g.count);
+                    var names = g.names === null ? null : graphIds(g.names, g.count);
+                    var columns = Object.keys(g.columns).map(function (name) {
+                        return [name, decodeTyped(g.columns[name].values), g.columns[name].labels];
+                    });
+                    var nodes = new Array(g.count);
+                    for (var i = 0; i < g.count; i++) {
+                        var node = {id: ids[i]};
+                        if (names) node.name = names[i];
+                        for (var c = 0; c < columns.length; c++) {
+                            var value = columns[c][2] ? columns[c][2][columns[c][1][i]] : columns[c][1][i];
+                            if (columns[c][0] === 'radius') node.marker = {radius: value};
+                            else node[columns[c][0]] = value;
+                        }
+                        nodes[i] = node;
+                    }
+                    return nodes;
+                }
+                function graphLinks(g) {
+                    var ids = g.idList = g.idList || graphIds(g.ids, g.count);
+                    var source = decodeTyped(g.source), target = decodeTyped(g.target);
+                    var weight = g.weight ? decodeTyped(g.weight) : null;
+                    var links = new Array(source.length);
+                    for (var i = 0; i < source.length; i++) {
+                        links[i] = weight ? [ids[source[i]], ids[target[i]], weight[i]] : [ids[source[i]], ids[target[i]]];
+                    }
+                    return links;
+                }
+                function graphPositions(g) {
+                    if (!g.positions) return null;
+                    var ids = g.idList = g.idList || graphIds(g.ids, g.count);
+                    var xy = decodeTyped(g.positions), positions = {};
+                    for (var i = 0; i < g.count; i++) positions[ids[i]] = [xy[2 * i], xy[2 * i + 1]];
+                    return positions;
+                }
+                function gridPoints(h) {
+                    var values = decodeTyped(h.values), points = new Array(values.length);
+                    var xs = h.x ? decodeTyped(h.x) : null, ys = h.y ? decodeTyped(h.y) : null;
+                    for (var i = 0; i < values.length; i++) {
+                        points[i] = xs ? [xs[i], ys[i], values[i]] : [Math.floor(i / h.columns), i % h.columns, values[i]];
+                    }
+                    return points;
+                }'''
+    
+    STYLE_TEMPLATE = ChartTemplate('''
+                #{container} {{
+                    min-width: {min_width}px;
+                    max-width: {max_width}px;
+                    height: {height}px;
+                    margin: 0 auto;
+                }}''')
+    
+    CONTAINER_TEMPLATE = ChartTemplate('''
+            <div id="{container}"></div>''')
+    
+    # Container element and size of each chart type; the ids are distinct so
+    # several charts can share one document
+    CHART_LAYOUT = {
+        'network': {'container': 'container', 'min_width': 320, 'max_width': 1200, 'height': 600},
+        'sankey': {'container': 'sankey-container', 'min_width': 310, 'max_width': 1200, 'height': 600},
+        'heatmap': {'container': 'heatmap-container', 'min_width': 310, 'max_width': 1200, 'height': 500},
+        'bubble': {'container': 'bubble-container', 'min_width': 310, 'max_width': 1200, 'height': 500},
+        'timeline': {'container': 'timeline-container', 'min_width': 310, 'max_width': 1200, 'height': 500},
+        'incident_history': {'container': 'incident-history-container', 'min_width': 310, 'max_width': 1200, 'height': 500},
+        'gauge': {'container': 'gauge-container', 'min_width': 310, 'max_width': 600, 'height': 400}
+    }
+    
+    CHART_TEMPLATES = {
+        'network': NETWORK_TEMPLATE,
+        'sankey': SANKEY_TEMPLATE,
+        'heatmap': HEATMAP_TEMPLATE,
+        'bubble': BUBBLE_TEMPLATE,
+        'timeline': TIMELINE_TEMPLATE,
+        'incident_history': INCIDENT_HISTORY_TEMPLATE,
+        'gauge': GAUGE_TEMPLATE
+    }
+    
+    CDN_BASE = 'https://code.highcharts.com'
+    LOCAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'highcharts')
+    
+    # Highcharts files each chart type needs, relative to the runtime base
+    CHART_MODULES = {
+        'network': ['highcharts.js', 'modules/networkgraph.js'],
+        'sankey': ['highcharts.js', 'modules/sankey.js'],
+        'heatmap': ['highcharts.js', 'modules/heatmap.js'],
+        'bubble': ['highcharts.js'],
+        'timeline': ['highcharts.js'],
+        'incident_history': ['highcharts.js', 'modules/boost.js'],
+        'gauge': ['highcharts.js', 'highcharts-more.js', 'modules/solid-gauge.js']
+    }
+    
+    # Charts whose data can be shipped as binary typed arrays
+    BINARY_CHARTS = ('network', 'heatmap')
+    
+    def __init__(self, cache=None, asset_base=None, binary_payloads=False, recorder=None, inline_assets=False):
+        self.color_palette = [
+            '#2E93fA', '#66DA26', '#546E7A', '#E91E63', '#FF9800',
+            '#8B5CF6', '#00E396', '#FF4560', '#775DD0', '#3F51B5'
+        ]
+        self.cache = cache if cache is not None else LRUCache()
+        self.asset_base = asset_base or self.CDN_BASE
+        self.binary_payloads = binary_payloads
+        self.recorder = recorder
+        self.inline_assets = inline_assets
+        self._inlined = {}
     
     @staticmethod
-    def generate_network_data():
-        """Generate social network data"""
-        nodes = []
-        for i in range(15):
-            nodes.append({
-                'id': f'user_{i}',
-                'name': f'User_{1000 + i}',
-                'value': random.uniform(0.5, 5.0),
-                'community': random.choice(['A', 'B', 'C']),
-                'color': random.choice(['#2E93fA', '#66DA26', '#E91E63'])
-            })
+    def pack_array(values):
+        """Base64 little-endian typed array, using the narrowest fitting type
+
+        Integer-valued data becomes Uint8/Uint16/Int32, everything else
+        Float32. Returns ``{'type': <JS typed array name>, 'data': <base64>}``.
+        """
+        values = np.asarray(values).ravel()
+        integral = values.dtype.kind in 'biu' or (
+            values.dtype.kind == 'f' and bool(np.all(np.isfinite(values))) and bool(np.all(values == np.floor(values)))
+        )
+        low = values.min() if len(values) else 0
+        high = values.max() if len(values) else 0
+        if integral and low >= 0 and high < 2 ** 8:
+            dtype, js_type = '<u1', 'Uint8Array'
+        elif integral and low >= 0 and high < 2 ** 16:
+            dtype, js_type = '<u2', 'Uint16Array'
+        elif integral and low >= -2 ** 31 and high < 2 ** 31:
+            dtype, js_type = '<i4', 'Int32Array'
+        else:
+            dtype, js_type = '<f4', 'Float32Array'
+        return {'type': js_type, 'data': base64.b64encode(values.astype(dtype).tobytes()).decode('ascii')}
+    
+    def _pack_column(self, column):
+        """Packed node column; object columns are dictionary-encoded"""
+        column = np.asarray(column)
+        if column.dtype.kind in 'OUS':
+            labels, codes = np.unique(column.astype(str), return_inverse=True)
+            return {'values': self.pack_array(codes), 'labels': labels.tolist()}
+        return {'values': self.pack_array(column), 'labels': None}
+    
+    @classmethod
+    def local_asset_base(cls):
+        """URL of the vendored Highcharts bundle, or None if it is not installed
+
+        The bundle is fetched by ``vendor_highcharts.py`` into ``static/highcharts``
+        and served as the files of a component declared on that directory,
+        so every chart iframe loads the same browser-cached files instead of
+        hitting the CDN. Component files are sent with their JavaScript MIME
+        type; ``/app/static`` sends ``.js`` as ``text/plain`` with ``nosniff``
+        on older Streamlit releases, and browsers refuse to run it.
+        """
+        if not os.path.exists(os.path.join(cls.LOCAL_DIR, 'highcharts.js')):
+            return None
+        runtime = components.declare_component('highcharts_runtime', path=cls.LOCAL_DIR)
+        if runtime.url:
+            return runtime.url.rstrip('/')
+        base_path = st.get_option('server.baseUrlPath').strip('/')
+        prefix = f'/{base_path}' if base_path else ''
+        return f'{prefix}/component/{runtime.name}'
+    
+    def _script_tags(self, chart_types):
+        """Script tags loading only the Highcharts modules the charts need"""
+        modules = []
+        for chart_type in chart_types:
+            for module in self.CHART_MODULES[chart_type]:
+                if module not in modules:
+                    modules.append(module)
         
-        links = []
-        for i in range(25):
-            source = f'user_{random.randint(0, 14)}'
-            target = f'user_{random.randint(0, 14)}'
-            if source != target:
-                links.append([source, target])
+        if self.inline_assets:
+            return '\n            '.join(f'<script>{self._inline_module(module)}</script>' for module in modules)
         
-        return nodes, links
+        version = ''
+        if self.asset_base != self.CDN_BASE:
+            version_file = os.path.join(self.LOCAL_DIR, 'VERSION')
+            if os.path.exists(version_file):
+                with open(version_file) as fh:
+                    version = f'?v={fh.read().strip()}'
+        return '\n            '.join(
+            f'<script src="{self.asset_base}/{module}{version}"></script>'
+            for module in modules
+        )
     
-    @staticmethod
-    def generate_sankey_data():
-        """Generate data for Sankey diagram"""
-        nodes = [
-            {'id': 'User', 'name': 'User Profile'},
-            {'id': 'Posts', 'name': 'User Posts'},
-            {'id': 'Location', 'name': 'Location Data'},
-            {'id': 'Platform', 'name': 'Social Platform'},
-            {'id': 'Advertisers', 'name': 'Advertisers'},
-            {'id': 'Analytics', 'name': 'Analytics Firms'}
-        ]
+    def _inline_module(self, module):
+        """Source of a vendored Highcharts module, safe to embed in a script tag"""
+        source = self._inlined.get(module)
+        if source is None:
+            path = os.path.join(self.LOCAL_DIR, *module.split('/'))
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"{path} is missing; run vendor_highcharts.py to inline the runtime")
+            with open(path, encoding='utf-8') as fh:
+                source = fh.read().replace('</script', '<\\/script')
+            self._inlined[module] = source
+        return source
+    
+    def document_key(self, specs, header='', data_key=None):
+        """Cache key of the document for ``specs`` under the current settings
+
+        ``data_key`` identifies the chart inputs by where they came from
+        (e.g. a generator's seed, scale and nonce); when given, it stands in
+        for the specs' data, which is then not hashed at all.
+        """
+        if data_key is not None:
+            specs = ([chart_type for chart_type, _ in specs], data_key)
+        if header or self.inline_assets:
+            return fingerprint(self.asset_base, self.binary_payloads, specs, header, self.inline_assets)
+        return fingerprint(self.asset_base, self.binary_payloads, specs)
+    
+    def render_document(self, specs, header='', data_key=None):
+        """Render one HTML document holding every chart in ``specs``
+
+        Each spec is a ``(chart_type, slots)`` pair as returned by the
+        ``*_spec`` methods. All charts share a single Highcharts runtime;
+        identical documents are served from the LRU cache (see
+        ``document_key``). ``header`` is HTML placed above the charts.
+        """
+        start = time.perf_counter()
+        key = self.document_key(specs, header, data_key)
+        html = self.cache.get(key)
+        hit = html is not None
+        if html is None:
+            styles, containers, inits = [], [], []
+            for chart_type, slots in specs:
+                slots = self._expand_slots(chart_type, slots)
+                layout = {name: str(value) for name, value in self.CHART_LAYOUT[chart_type].items()}
+                styles.append(self.STYLE_TEMPLATE.render(**layout))
+                containers.append(self.CONTAINER_TEMPLATE.render(**layout))
+                inits.append(self.CHART_TEMPLATES[chart_type].render(**{
+                    name: value if isinstance(value, JSExpression) else json.dumps(value)
+                    for name, value in slots.items()
+                }))
+            binary = self.binary_payloads and any(chart_type in self.BINARY_CHARTS for chart_type, _ in specs)
+            html = self.DOCUMENT_TEMPLATE.render(
+                scripts=self._script_tags([chart_type for chart_type, _ in specs]),
+                styles=''.join(styles),
+                header=header,
+                containers=''.join(containers),
+                helpers=self.BINARY_HELPERS if binary else '',
+                inits=''.join(inits)
+            )
+            self.cache.put(key, html)
+        if self.recorder is not None:
+            self.recorder.chart(time.perf_counter() - start, len(html.encode('utf-8')), hit)
+        return html
+    
+    def _expand_slots(self, chart_type, slots):
+        """Convert compact chart inputs into their JSON-ready slot values"""
+        if chart_type == 'network':
+            return self._network_slots(slots)
+        if chart_type == 'heatmap':
+            return self._heatmap_slots(slots)
+        return slots
+    
+    def _network_slots(self, slots):
+        """Network slots from a ``CompactGraph`` (as JSON or binary payload)"""
+        if 'graph' not in slots:
+            return {'payload': JSExpression(''), **slots}
+        graph = slots['graph']
+        positions = slots['positions']
         
-        links = [
-            ['User', 'Platform', 25],
-            ['Posts', 'Platform', 40],
-            ['Location', 'Platform', 15],
-            ['Platform', 'Advertisers', 50],
-            ['Platform', 'Analytics', 30]
-        ]
+        if self.binary_payloads:
+            payload = {
+                'count': graph.num_nodes,
+                'ids': graph.ids if isinstance(graph.ids, str) else list(graph.ids),
+                'names': graph.names if graph.names is None or isinstance(graph.names, str) else list(graph.names),
+                'columns': {},
+                'source': self.pack_array(graph.source),
+                'target': self.pack_array(graph.target),
+                'weight': None if graph.weight is None else self.pack_array(graph.weight),
+                'positions': None if positions is None else self.pack_array(np.asarray(positions, dtype=np.float32))
+            }
+            for name, column in graph.columns.items():
+                if name in graph.categories:
+                    payload['columns'][name] = {'values': self.pack_array(column), 'labels': graph.categories[name]}
+                else:
+                    payload['columns'][name] = self._pack_column(column)
+            return {
+                'payload': JSExpression(f'\n                var networkGraph = {json.dumps(payload)};'),
+                'links_data': JSExpression('graphLinks(networkGraph)'),
+                'nodes_data': JSExpression('graphNodes(networkGraph)'),
+                'positions': JSExpression('graphPositions(networkGraph)')
+            }
         
-        return nodes, links
+        nodes_data, links_data = graph.to_highcharts()
+        if positions is not None:
+            positions = dict(zip(graph.node_ids(), np.round(positions.astype(np.float64), 4).tolist()))
+        return {'payload': JSExpression(''), 'links_data': links_data, 'nodes_data': nodes_data, 'positions': positions}
     
-    @staticmethod
-    def generate_heatmap_data():
-        """Generate heatmap data"""
-        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        hours = [f'{h}:00' for h in range(8, 22, 2)]
-        
-        data = []
-        for i, day in enumerate(days):
-            for j, hour in enumerate(hours):
-                base_risk = 30
-                if day in ['Sat', 'Sun']:
-                    base_risk += 20
-                if 18 <= int(hour.split(':')[0]) <= 22:
-                    base_risk += 25
-                
-                risk = base_risk + random.randint(-10, 10)
-                risk = max(0, min(100, risk))
-                
-                data.append([i, j, risk])
-        
-        return days, hours, data
+    def _heatmap_slots(self, slots):
+        """Heatmap slots; ``data`` may be ``[[x, y, value], ...]`` or a 2-D grid"""
+        data = slots['data']
+        grid = isinstance(data, np.ndarray) and data.shape == (len(slots['categories_x']), len(slots['categories_y']))
+        if self.binary_payloads:
+            if grid:
+                payload = {'columns': int(data.shape[1]), 'values': self.pack_array(data)}
+            else:
+                points = np.asarray(data).reshape(-1, 3)
+                payload = {
+                    'x': self.pack_array(points[:, 0]),
+                    'y': self.pack_array(points[:, 1]),
+                    'values': self.pack_array(points[:, 2])
+                }
+            return {
+                'payload': JSExpression(f'\n                var heatmapGrid = {json.dumps(payload)};'),
+                'categories_x': slots['categories_x'],
+                'categories_y': slots['categories_y'],
+                'data': JSExpression('gridPoints(heatmapGrid)')
+            }
+        if grid:
+            ii, jj = np.indices(data.shape)
+            data = np.column_stack((ii.ravel(), jj.ravel(), data.ravel())).tolist()
+        elif isinstance(data, np.ndarray):
+            data = data.tolist()
+        return {'payload': JSExpression(''), 'categories_x': slots['categories_x'],
+                'categories_y': slots['categories_y'], 'data': data}
     
-    @staticmethod
-    def generate_bubble_data():
-        """Generate bubble chart data"""
-        platforms = [
-            {'name': 'Facebook', 'users': 2910, 'privacy': 45, 'data': 85},
-            {'name': 'Instagram', 'users': 2000, 'privacy': 50, 'data': 75},
-            {'name': 'Twitter', 'users': 450, 'privacy': 60, 'data': 50},
-            {'name': 'LinkedIn', 'users': 930, 'privacy': 70, 'data': 40},
-            {'name': 'TikTok', 'users': 1500, 'privacy': 40, 'data': 90}
-        ]
-        
-        data = []
-        for platform in platforms:
-            data.append({
-                'x': platform['users'],
-                'y': platform['privacy'],
-                'z': platform['data'],
-                'name': platform['name']
+    def document_height(self, specs):
+        """Iframe height needed to show every chart in ``specs``"""
+        height = sum(self.CHART_LAYOUT[chart_type]['height'] for chart_type, _ in specs)
+        return height if len(specs) == 1 else height + 16
+    
+    def network_graph_spec(self, nodes_data, links_data, positions=None):
+        """Chart spec for the social network graph
+
+        ``positions`` maps node ids to precomputed ``[x, y]`` unit-square
+        coordinates (see ``GraphLayoutEngine``); when given, the browser-side
+        force simulation is switched off.
+        """
+        return ('network', {'links_data': links_data, 'nodes_data': nodes_data, 'positions': positions})
+    
+    def compact_network_spec(self, graph, positions=None):
+        """Chart spec for a ``CompactGraph``
+
+        The graph is only converted to Highcharts nodes/links when the
+        document is actually rendered, i.e. not on cache hits. ``positions``
+        is an optional (num_nodes, 2) layout aligned with the graph's nodes.
+        """
+        return ('network', {'graph': graph, 'positions': positions})
+    
+    def sankey_diagram_spec(self, nodes, links):
+        """Chart spec for the data flow Sankey diagram"""
+        return ('sankey', {'links': links, 'nodes': nodes})
+    
+    def heatmap_chart_spec(self, categories_x, categories_y, data):
+        """Chart spec for the location privacy heatmap
+
+        ``data`` is a list of ``[x, y, value]`` points or a NumPy grid shaped
+        ``(len(categories_x), len(categories_y))``.
+        """
+        return ('heatmap', {'categories_x': categories_x, 'categories_y': categories_y, 'data': data})
+    
+    def bubble_chart_spec(self, data):
+        """Chart spec for the platform bubble chart"""
+        return ('bubble', {'data': data})
+    
+    def timeline_chart_spec(self, series_data):
+        """Chart spec for the security incident timeline"""
+        return ('timeline', {'series_data': series_data})
+    
+    def incident_history_spec(self, series_data, subtitle='', boost=False, boost_threshold=5000):
+        """Chart spec for the time-axis incident history
+
+        ``series_data`` holds ``{'name', 'color', 'data': [[ms, count], ...]}``
+        series; ``boost`` switches on the WebGL boost module for series longer
+        than ``boost_threshold`` points.
+        """
+        return ('incident_history', {'series_data': series_data, 'subtitle': subtitle,
+                                     'boost': boost, 'boost_threshold': boost_threshold})
+    
+    def gauge_chart_spec(self, value, max_value=100):
+        """Chart spec for the privacy risk gauge"""
+        return ('gauge', {'value': value, 'max_value': max_value})
+    
+    def create_network_graph(self, nodes_data, links_data, positions=None, data_key=None):
+        """Create social network graph"""
+        return self.render_document([self.network_graph_spec(nodes_data, links_data, positions)], data_key=data_key)
+    
+    def create_sankey_diagram(self, nodes, links):
+        """Create Sankey diagram for data flow analysis"""
+        return self.render_document([self.sankey_diagram_spec(nodes, links)])
+    
+    def create_heatmap_chart(self, categories_x, categories_y, data, data_key=None):
+        """Create heatmap for location privacy analysis"""
+        return self.render_document([self.heatmap_chart_spec(categories_x, categories_y, data)], data_key=data_key)
+    
+    def create_bubble_chart(self, data):
+        """Create bubble chart for social media metrics"""
+        return self.render_document([self.bubble_chart_spec(data)])
+    
+    def create_timeline_chart(self, series_data):
+        """Create timeline chart for security incidents"""
+        return self.render_document([self.timeline_chart_spec(series_data)])
+    
+    def create_gauge_chart(self, value, max_value=100):
+        """Create gauge chart for privacy risk score"""
+        return self.render_document([self.gauge_chart_spec(value, max_value)])
+
+class PerformanceRecorder:
+    """Per-section timings, chart payload sizes and cache activity
+
+    ``section`` wraps one section render. Chart documents report their
+    serialization time, HTML size and cache hit through ``chart`` (the
+    ``HighchartsGenerator`` calls it when given this recorder), and the
+    hit/miss counters of the watched caches are diffed around the section.
+    Data time is everything else in the section: data generation, engines
+    and widgets. Finished records are kept per section and, with a
+    ``log_path``, appended to it as JSON lines.
+    """
+    
+    _log_lock = threading.Lock()
+    
+    def __init__(self, caches=None, log_path=None, context=None):
+        self.caches = caches or {}
+        self.log_path = log_path
+        self.context = context or {}
+        self.records = {}
+        self.current = None
+    
+    def _counters(self):
+        return {name: (cache.hits, cache.misses) for name, cache in self.caches.items()}
+    
+    @contextmanager
+    def section(self, name):
+        """Record the code run inside the block as section ``name``"""
+        outer = self.current
+        record = {'section': name, 'serialize_seconds': 0.0, 'html_bytes': 0, 'charts': 0,
+                  'chart_hits': 0, 'chart_misses': 0}
+        self.current = record
+        before = self._counters()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            total = time.perf_counter() - start
+            self.current = outer
+            caches = {}
+            for cache_name, (hits, misses) in self._counters().items():
+                delta = (hits - before[cache_name][0], misses - before[cache_name][1])
+                if any(delta):
+                    caches[cache_name] = {'hits': delta[0], 'misses': delta[1]}
+            record.update({
+                'seconds': total,
+                'data_seconds': max(total - record['serialize_seconds'], 0.0),
+                'cache': caches,
+                'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds')
             })
-        
-        return data
+            self.records[name] = record
+            self.write(record)
     
-    @staticmethod
-    def generate_timeline_data():
-        """Generate timeline data"""
-        series_data = [
-            {
-                'name': 'Phishing Attacks',
-                'data': [45, 52, 38, 60, 55, 48, 65, 70, 58, 62, 75, 80],
-                'color': '#FF4560'
-            },
+    def instrument(self, name, render):
+        """``render`` wrapped in ``section(name)``, keeping its name for fragment ids"""
+        @wraps(render)
+        def instrumented(*args, **kwargs):
+            with self.section(name):
+                return render(*args, **kwargs)
+        return instrumented
+    
+    def chart(self, seconds, html_bytes, hit):
+        """Account one rendered (or cached) chart document to the current section"""
+        record = self.current
+        if record is None:
+            return
+        record['serialize_seconds'] += seconds
+        record['html_bytes'] += html_bytes
+        record['charts'] += 1
+        record['chart_hits' if hit else 'chart_misses'] += 1
+    
+    def write(self, record):
+        """Append ``record`` (with the run context) to the JSON-lines log"""
+        if not self.log_path:
+            return
+        line = json.dumps({**self.context, **record}, default=str)
+        with self._log_lock, open(self.log_path, 'a') as fh:
+            fh.write(line + '\n')
+    
+    def summary(self):
+        """Table of the latest record of each section"""
+        return pd.DataFrame([
             {
-                'name': 'Data Breaches',
-                'data': [12, 15, 10, 18, 20, 15, 22, 25, 18, 20, 28, 30],
-                'color': '#8B5CF6'
+                'Section': record['section'],
+                'Total ms': round(1000 * record['seconds'], 1),
+                'Data ms': round(1000 * record['data_seconds'], 1),
+                'Serialize ms': round(1000 * record['serialize_seconds'], 1),
+                'HTML KB': round(record['html_bytes'] / 1024, 1),
+                'Cache hits': sum(c['hits'] for c in record['cache'].values()),
+                'Cache misses': sum(c['misses'] for c in record['cache'].values())
             }
-        ]
+            for record in self.records.values()
+        ])
+
+class SharedAggregateStore:
+    """Process-wide aggregates and chart documents shared by every session
+
+    Streamlit serves all browser sessions from one process, so one store
+    (created through ``st.cache_resource``) lets every viewer reuse the
+    same rendered chart documents, engine caches and ingested telemetry.
+    Published entries are read without locking: ``entries`` is never
+    mutated, only replaced by an updated copy. Builders run under a
+    per-key lock, so concurrent sessions missing the same entry compute it
+    once. Simulated data in shared mode is re-drawn once per
+    ``refresh_seconds`` cycle for everyone (see ``cycle``); publishing an
+    entry of a new cycle drops the entries of earlier ones. Beyond that,
+    the oldest entries are evicted once there are more than
+    ``max_entries`` or they hold more than ``max_bytes`` (estimated).
+
+    With a ``disk`` cache every in-memory cache and entry is backed by it,
+    so restarted or additional worker processes start warm.
+    """
+    
+    def __init__(self, refresh_seconds=300, max_entries=16, max_bytes=2 ** 30, disk=None):
+        self.refresh_seconds = refresh_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.documents = LRUCache(maxsize=128, backing=disk)
+        self.layouts = LRUCache(maxsize=16, backing=disk)
+        self.metrics = LRUCache(maxsize=16, backing=disk)
+        self.risk = LRUCache(maxsize=64, backing=disk)
+        self.timeseries = LRUCache(maxsize=16, backing=disk)
+        self.builds = 0
+    
+    def cycle(self):
+        """Number of the current refresh cycle (the shared data nonce)"""
+        return int(time.time() // self.refresh_seconds)
+    
+    @staticmethod
+    def key_cycle(key):
+        """Refresh cycle a key's ``('shared', cycle)`` nonce belongs to (None if it has none)"""
+        for part in key:
+            if isinstance(part, tuple) and len(part) == 2 and part[0] == 'shared':
+                return part[1]
+        return None
+    
+    @staticmethod
+    def estimated_nbytes(value):
+        """Rough memory held by ``value``: array buffers plus the objects and containers around them"""
+        total, seen, stack = 0, set(), [value]
+        while stack:
+            item = stack.pop()
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            if isinstance(item, np.ndarray):
+                total += item.nbytes
+                if item.dtype == object:
+                    stack.extend(item.ravel().tolist())
+                continue
+            total += sys.getsizeof(item)
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset, deque)):
+                stack.extend(item)
+            elif hasattr(item, '__dict__') and not isinstance(item, (type, types.ModuleType)):
+                stack.append(vars(item))
+        return total
+    
+    def get(self, key, builder, max_age=None):
+        """Published value for ``key``, built once if missing or older than ``max_age``"""
+        entry = self.entries.get(key)
+        if entry is not None and (max_age is None or time.time() - entry[0] < max_age):
+            return entry[1]
+        # Key locks are counted while in use and dropped by the last user,
+        # so eviction never discards a lock another builder still holds
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                entry = self.entries.get(key)
+                if entry is not None and (max_age is None or time.time() - entry[0] < max_age):
+                    return entry[1]
+                # Entries that never expire can come from (and go to) disk
+                disk_key = fingerprint('entry', key) if self.disk is not None and max_age is None else None
+                value = self.disk.get(disk_key) if disk_key else None
+                if value is None:
+                    value = builder()
+                    if disk_key:
+                        self.disk.put(disk_key, value)
+                self.publish(key, value)
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if not key_lock[1]:
+                    del self._key_locks[key]
+        return value
+    
+    def publish(self, key, value):
+        """Replace ``entries`` by a copy holding ``value``, evicting stale and surplus entries"""
+        size = self.estimated_nbytes(value)
+        cycle = self.key_cycle(key)
+        with self._lock:
+            entries = dict(self.entries)
+            if cycle is not None:
+                entries = {k: v for k, v in entries.items() if (self.key_cycle(k) or cycle) >= cycle}
+            entries[key] = (time.time(), value, size)
+            total = sum(entry[2] for entry in entries.values())
+            while len(entries) > 1 and (len(entries) > self.max_entries or total > self.max_bytes):
+                oldest = min(entries, key=lambda k: entries[k][0])
+                total -= entries.pop(oldest)[2]
+            self.entries = entries
+            self.builds += 1
+
+@st.cache_resource
+def shared_store():
+    """The one ``SharedAggregateStore`` of this server process
+
+    Backed by a ``DiskCache`` in ``DASHBOARD_CACHE_DIR`` (default
+    ``.dashboard_cache`` next to the app; set it empty to disable) limited
+    to ``DASHBOARD_CACHE_MB`` megabytes. If the directory cannot be
+    created or read, the store caches in memory only.
+    """
+    directory = os.environ.get(
+        'DASHBOARD_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.dashboard_cache')
+    )
+    disk = None
+    if directory:
+        try:
+            disk = DiskCache(directory, max_bytes=int(os.environ.get('DASHBOARD_CACHE_MB', 512)) * 2 ** 20)
+        except OSError as error:
+            logger.warning("Disk cache in %s is unavailable, caching in memory only: %s", directory, error)
+    return SharedAggregateStore(disk=disk)
+
+def telemetry_path(name, directory):
+    """Resolved path of telemetry file ``name`` inside ``directory``
+
+    None if it resolves outside the directory (absolute paths, ``..`` and
+    symlinks included), so viewers can only make the server read the
+    telemetry it was given.
+    """
+    root = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        return None
+    return path
+
+@st.cache_resource
+def preparation_pool():
+    """Worker threads of ``prepare_sections``, shared by every session
+
+    Sized to the CPU count. The jobs spend most of their time in NumPy,
+    which releases the GIL, and threads hand back large results without
+    pickling them.
+    """
+    return futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='prepare')
+
+LIVE_CHART_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'components', 'live_chart')
+_live_chart = None
+
+def live_chart(**args):
+    """Live chart component (``components/live_chart``), declared on first use
+
+    A bidirectional component keeps its frame across reruns and receives
+    new args by message, so live ticks update the drawn chart in place.
+    """
+    global _live_chart
+    if _live_chart is None:
+        _live_chart = components.declare_component("live_chart", path=LIVE_CHART_DIR)
+    return _live_chart(**args)
+
+# Section data cached on its inputs across reruns and sessions. Unseeded
+# simulations also key on a per-session ``nonce``, so a session keeps its
+# random data until it asks for new data instead of re-rolling on every click.
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def cached_network_graph(seed, scale, nonce=None):
+    """``DataSimulator.generate_network_graph`` cached on its inputs
+
+    Held as a resource, so reruns reuse the same link arrays instead of
+    unpickling tens of MB of them each time. The graph is shared with
+    every other rerun and session, so callers treat it as read-only
+    (``with_columns`` returns a copy).
+    """
+    return DataSimulator.generate_network_graph(seed, scale)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_heatmap_grid(seed, scale, nonce=None):
+    """Heatmap ``(days, hours, grid)`` cached on its inputs"""
+    if seed is None and scale == 1:
+        days, hours, data = DataSimulator.generate_heatmap_data()
+        return days, hours, np.array([point[2] for point in data]).reshape(len(days), len(hours))
+    return DataSimulator.generate_heatmap_arrays(seed, scale)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_incident_history(seed, days, nonce=None):
+    """``DataSimulator.generate_incident_history`` cached on its inputs"""
+    return DataSimulator.generate_incident_history(seed, days)
+
+# Pure builders that ``prepare_sections`` runs on the preparation pool
+
+def build_flow_engine(seed, scale):
+    """Aggregated ``SankeyFlowEngine`` for the simulated flow records"""
+    return SankeyFlowEngine.aggregate(DataSimulator.iter_flow_records(seed, scale))
+
+def build_location_pyramid(seed, scale, start, hours=24, max_cells=2 ** 21):
+    """``HeatmapPyramid`` of ``hours`` of simulated geo-tagged events
+
+    Binned per minute and per geo cell, or, where that grid would exceed
+    ``max_cells``, per run of a power-of-two number of neighbouring cells.
+    """
+    cells = DataSimulator.location_cells(scale)
+    width = 1
+    while cells > width * (max_cells // (60 * hours)):
+        width *= 2
+    bins = -(-cells // width)
+    pyramid = HeatmapPyramid((start, start + 3600 * hours), (0, bins * width), 60 * hours, bins)
+    for chunk in DataSimulator.iter_location_events(start, hours, seed, scale):
+        pyramid.add(*chunk)
+    return pyramid.build()
+
+def build_population_risk(seed, scale, network_risk=None):
+    """``PrivacyRiskScorer`` summary of the simulated user population
+
+    With a ``network_risk`` (propagated per-user risk of the network
+    section) each user's contact risk is drawn from it instead of simulated.
+    """
+    scorer = PrivacyRiskScorer()
+    rng = np.random.default_rng(None if seed is None else [seed, 1])
+    for chunk in DataSimulator.iter_user_features(seed, scale):
+        if network_risk is not None and len(network_risk):
+            chunk['contact_risk'] = network_risk[rng.integers(0, len(network_risk), len(chunk['contact_risk']))]
+        scorer.update(chunk)
+    return scorer.summary()
+
+def build_document(asset_base, binary_payloads, specs):
+    """Chart document for ``specs``, rendered without a cache"""
+    generator = HighchartsGenerator(cache=LRUCache(maxsize=1), asset_base=asset_base,
+                                    binary_payloads=binary_payloads)
+    return generator.render_document(specs)
+
+
+# Largest network drawn node by node; bigger graphs (and bigger
+# communities) are only shown collapsed into community super-nodes
+FULL_GRAPH_NODES = 2000
+
+
+class ReportBuilder:
+    """Static HTML report of every dashboard section for one dataset
+
+    Builds the same section data as the dashboard (simulated for a
+    ``seed`` / ``scale``, or from a ``TelemetryIngestor``) with the
+    dashboard's default section settings, and renders all charts plus a
+    metrics summary into one self-contained document. Needs no Streamlit
+    session, so reports can be rendered in batch worker processes.
+    Telemetry has no per-user attributes to score, so telemetry reports
+    leave out the simulated Risk Assessment.
+    """
+    
+    HEADER_TEMPLATE = ChartTemplate('''
+            <style>
+                .report {{ font-family: sans-serif; max-width: 1200px; margin: 0 auto 24px; }}
+                .report table {{ border-collapse: collapse; margin-top: 8px; }}
+                .report td, .report th {{ padding: 4px 12px; border-bottom: 1px solid #ddd; text-align: left; }}
+            </style>
+            <div class="report">
+                <h1>{title}</h1>
+                <p>{subtitle}</p>
+                <table>{rows}</table>
+            </div>''')
+    
+    def __init__(self, generator=None, top_k=20, risk_seeds=3, decay=0.5):
+        self.generator = generator if generator is not None else HighchartsGenerator()
+        self.layout_engine = GraphLayoutEngine()
+        self.coarsener = CommunityCoarsener(palette=self.generator.color_palette)
+        self.metrics_engine = GraphMetricsEngine()
+        self.risk_engine = RiskPropagationEngine()
+        self.top_k = top_k
+        self.risk_seeds = risk_seeds
+        self.decay = decay
+    
+    def network_section(self, graph):
+        """Network chart and metrics with risk spread from the top PageRank users"""
+        metrics = self.metrics_engine.compute(graph)
+        rank = metrics['pagerank']
+        seeds = np.argpartition(-rank, min(self.risk_seeds, len(rank)) - 1)[:self.risk_seeds]
+        risk = self.risk_engine.propagate(self.metrics_engine.adjacency_for(graph), seeds, self.decay)
+        exposed = float((risk >= 0.1).mean()) if len(risk) else 0.0
         
-        return series_data
+        chart_graph = graph.with_columns({'risk': risk})
+        if graph.num_nodes > FULL_GRAPH_NODES:
+            chart_graph = self.coarsener.coarsen_graph(chart_graph)
+        chart_graph = self.risk_engine.color_by_risk(chart_graph)
+        positions = self.layout_engine.positions_for(chart_graph) if chart_graph.num_nodes > 300 else None
+        summary = {
+            'Nodes': f"{graph.num_nodes:,}", 'Connections': f"{graph.num_links:,}",
+            'Components': f"{metrics['components']:,}", 'Exposed Users': f"{exposed:.1%}"
+        }
+        return summary, self.generator.compact_network_spec(chart_graph, positions), risk
+    
+    def sankey_section(self, flows):
+        """Sankey chart of the top flow entities"""
+        nodes, links = flows.sankey(self.top_k, unit=2 ** 30)
+        summary = {
+            'Data Flow': f"{round(flows.total_volume / 2 ** 30):,} GB/month",
+            'Entities': len(nodes), 'Pathways': len(links)
+        }
+        return summary, self.generator.sankey_diagram_spec(nodes, links)
+    
+    def heatmap_section(self, days, hours, grid, risk=None):
+        """Location risk heatmap
+
+        ``risk`` is the aggregator's ``summary()`` where the grid comes from
+        events (telemetry): it averages only observed cells, whereas empty
+        cells of the grid are zeros. A simulated grid is summarised directly.
+        """
+        if risk is None:
+            risk = {'average': grid.mean(), 'peak': grid.max(), 'high_risk': int(np.count_nonzero(grid > 70))}
+        summary = {
+            'Avg Risk': f"{risk['average']:.1f}/100", 'Peak Risk': int(risk['peak']),
+            'High Risk': risk['high_risk']
+        }
+        return summary, self.generator.heatmap_chart_spec(days, hours, grid)
+    
+    def bubble_section(self, data):
+        """Platform comparison bubble chart"""
+        best = max(data, key=lambda d: d['y'])
+        largest = max(data, key=lambda d: d['x'])
+        summary = {'Best Privacy': f"{best['name']} ({best['y']}/100)", 'Most Users': f"{largest['name']} ({largest['x']}M)"}
+        return summary, self.generator.bubble_chart_spec(data)
+    
+    def timeline_section(self, series):
+        """Monthly security incident timeline"""
+        summary = {s['name']: f"{sum(s['data']):,}" for s in series}
+        return summary, self.generator.timeline_chart_spec(series)
+    
+    def gauge_section(self, seed, scale, network_risk):
+        """Risk gauge of the mean population risk, with its factor contributions"""
+        population = build_population_risk(seed, scale, network_risk)
+        summary = {
+            'Risk Score': f"{population['mean']:.0f}/100",
+            '90th percentile': f"{population['percentiles'][90]:.0f}/100",
+            'Users Scored': f"{population['users']:,}",
+            **{factor: f"{values['contribution']:.1f} pts" for factor, values in population['factors'].items()}
+        }
+        return summary, self.generator.gauge_chart_spec(round(population['mean']))
+    
+    def sections(self, seed=None, scale=1, telemetry=None):
+        """``(title, summary, spec)`` of every section that has data"""
+        sections = []
+        network_risk = None
+        graph = telemetry.network_graph() if telemetry is not None else DataSimulator.generate_network_graph(seed, scale)
+        if graph is not None:
+            summary, spec, network_risk = self.network_section(graph)
+            sections.append(("Social Network Analysis", summary, spec))
+        flows = telemetry.flows if telemetry is not None else build_flow_engine(seed, scale)
+        if flows.labels:
+            sections.append(("Data Flow Analysis",) + self.sankey_section(flows))
+        if telemetry is not None:
+            sections.append(("Location Privacy Heatmap",) + self.heatmap_section(
+                *telemetry.heatmap_data(), risk=telemetry.heatmap.summary()
+            ))
+        else:
+            sections.append(("Location Privacy Heatmap",) + self.heatmap_section(*DataSimulator.generate_heatmap_arrays(seed, scale)))
+        bubbles = telemetry.bubble_data() if telemetry is not None else DataSimulator.generate_bubble_data()
+        if bubbles:
+            sections.append(("Platform Comparison",) + self.bubble_section(bubbles))
+        series = telemetry.timeline_data() if telemetry is not None else DataSimulator.generate_timeline_data()
+        if series:
+            sections.append(("Security Incidents",) + self.timeline_section(series))
+        if telemetry is None:
+            sections.append(("Risk Assessment",) + self.gauge_section(seed, scale, network_risk))
+        return sections
+    
+    def render(self, title, seed=None, scale=1, telemetry=None):
+        """Self-contained HTML report for one dataset"""
+        sections = self.sections(seed, scale, telemetry)
+        rows = ''.join(
+            f"<tr><th>{html.escape(section)}</th><td>"
+            + ', '.join(f"{html.escape(str(name))}: {html.escape(str(value))}" for name, value in summary.items())
+            + "</td></tr>"
+            for section, summary, _ in sections
+        )
+        header = self.HEADER_TEMPLATE.render(
+            title=html.escape(title),
+            subtitle=f"Generated {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')} UTC",
+            rows=rows
+        )
+        return self.generator.render_document([spec for _, _, spec in sections], header)
 
 class EnhancedPrivacyDashboard:
     """Main dashboard class"""
     
-    def __init__(self):
-        self.hc_generator = HighchartsGenerator()
+    HEATMAP_BACKFILL_HOURS = 7 * 24
+    PYRAMID_HOURS = 24
+    # Most (time, location) bins one zoomed heatmap tile may hold
+    PYRAMID_TILE = (96, 64)
+    LIVE_SECTIONS = ("Heatmap", "Timeline", "Gauge")
+    LIVE_SPEED = 60
+    LIVE_HISTORY_MINUTES = 6 * 60
+    LIVE_GAUGE_MINUTES = 60
+    HISTORY_DAYS = {"30 days": 30, "1 year": 365, "2 years": 730}
+    
+    def __init__(self, seed=None, scale=1):
+        # The script re-executes on every rerun and every session builds its
+        # own dashboard, so rendered charts and engine results live in the
+        # process-wide store, shared by reruns and sessions alike
+        self.store = shared_store()
+        caches = {'documents': self.store.documents, 'layouts': self.store.layouts, 'metrics': self.store.metrics,
+                  'risk': self.store.risk, 'timeseries': self.store.timeseries}
+        if self.store.disk is not None:
+            caches['disk'] = self.store.disk
+        if 'perf_session' not in st.session_state:
+            st.session_state.perf_session = f"{random.getrandbits(32):08x}"
+        self.recorder = PerformanceRecorder(caches, log_path=os.environ.get('DASHBOARD_PERF_LOG'),
+                                            context={'session': st.session_state.perf_session})
+        self.hc_generator = HighchartsGenerator(cache=self.store.documents, recorder=self.recorder)
+        self.layout_engine = GraphLayoutEngine(cache=self.store.layouts)
+        self.coarsener = CommunityCoarsener(palette=self.hc_generator.color_palette)
+        self.metrics_engine = GraphMetricsEngine(cache=self.store.metrics)
+        self.risk_engine = RiskPropagationEngine(cache=self.store.risk)
+        self.downsampler = TimeSeriesDownsampler(cache=self.store.timeseries)
+        if 'data_nonce' not in st.session_state:
+            st.session_state.data_nonce = random.getrandbits(32)
+        self.network_exposure = None
+        self.network_risk = None
+        self.network_risk_key = None
+        self.network_metrics = None
+        self.gauge_rendered = False
         self.data_simulator = DataSimulator()
+        self.seed = seed
+        self.scale = scale
+        self.single_document = False
+        self.shared = True
+        self.parallel_prepare = False
+        self.show_performance = False
+        self.live = False
+        self.live_interval = 2
+        self.telemetry = None
+        self.network_layout = "Auto"
+        self.pending_charts = []
     
     def render_header(self):
         """Render dashboard header"""
@@ -552,25 +1457,269 @@ class EnhancedPrivacyDashboard:
                 default=["Network Graph", "Sankey Diagram", "Heatmap"]
             )
             
+            with st.expander("Load Testing", expanded=False):
+                if st.checkbox("Seeded simulation", value=self.seed is not None):
+                    self.seed = int(st.number_input("Seed", min_value=0, value=self.seed or 0, step=1))
+                else:
+                    self.seed = None
+                self.scale = st.select_slider(
+                    "Scale", options=[1, 10, 100, 1000, 10000, 66667], value=self.scale
+                )
+                self.shared = st.checkbox(
+                    "Shared snapshot", value=self.shared, disabled=self.seed is not None,
+                    help=f"Every viewer reads the same simulated data, redrawn every "
+                         f"{self.store.refresh_seconds // 60} minutes"
+                )
+                if st.button("New random data", disabled=self.seed is not None or self.shared,
+                             help="Unshared data stays fixed for the session until regenerated"):
+                    st.session_state.data_nonce = random.getrandbits(32)
+            
+            with st.expander("Data Source", expanded=False):
+                source = st.radio("Section data", ["Simulated", "Telemetry file"],
+                                  help="CSV or JSONL telemetry, read in chunks (see README for the columns)")
+                if source == "Telemetry file":
+                    self.telemetry = self.load_telemetry()
+            
+            with st.expander("Rendering", expanded=False):
+                local_base = HighchartsGenerator.local_asset_base()
+                runtime = st.radio(
+                    "Highcharts runtime",
+                    ["Local bundle", "CDN"],
+                    index=0 if local_base else 1,
+                    disabled=local_base is None,
+                    help="Run vendor_highcharts.py to install the local bundle"
+                )
+                if runtime == "Local bundle" and local_base:
+                    self.hc_generator.asset_base = local_base
+                self.network_layout = st.radio(
+                    "Network layout",
+                    ["Auto", "Browser", "Server"],
+                    help="Server computes node positions in NumPy; Auto does so for graphs over 300 nodes"
+                )
+                self.single_document = st.checkbox(
+                    "Single-document charts",
+                    value=self.single_document,
+                    help="Draw all selected charts in one document with one Highcharts runtime"
+                )
+                self.parallel_prepare = st.checkbox(
+                    "Parallel preparation",
+                    value=self.parallel_prepare,
+                    help="Build the selected sections' data and charts concurrently before drawing"
+                )
+                self.hc_generator.binary_payloads = st.checkbox(
+                    "Binary payloads",
+                    value=self.hc_generator.binary_payloads,
+                    help="Ship network and heatmap data as base64 typed arrays instead of JSON"
+                )
+                self.live = st.checkbox(
+                    "Live updates",
+                    value=self.live,
+                    help="Stream simulated events into the drawn timeline, heatmap and gauge charts"
+                )
+                self.live_interval = st.select_slider(
+                    "Update every (seconds)", options=[1, 2, 5, 10], value=self.live_interval, disabled=not self.live,
+                    help=f"Each second of wall-clock time is {self.LIVE_SPEED} seconds of simulated events"
+                )
+                self.show_performance = st.checkbox(
+                    "Performance panel",
+                    value=self.show_performance,
+                    help="Per-section timings, chart sizes and cache activity of the last run"
+                )
+            
             st.divider()
+            cache_stats = self.hc_generator.cache.stats()
+            st.caption(
+                f"Shared chart cache: {cache_stats['hits']} hits ({cache_stats['backing_hits']} from disk) / "
+                f"{cache_stats['misses']} misses "
+                f"({cache_stats['size']}/{cache_stats['maxsize']} entries)"
+            )
+            if self.store.disk is not None:
+                disk_stats = self.store.disk.stats()
+                st.caption(
+                    f"Disk cache: {disk_stats['hits']} hits / {disk_stats['misses']} misses "
+                    f"({disk_stats['bytes'] / 2 ** 20:.1f}/{disk_stats['max_bytes'] / 2 ** 20:.0f} MB)"
+                )
             st.caption(f"Last update: {datetime.now().strftime('%H:%M:%S')}")
             
             return selected_charts
     
+    @property
+    def nonce(self):
+        """Cache-key nonce for unseeded simulations (None when seeded)"""
+        if self.seed is not None:
+            return None
+        if self.shared:
+            return ('shared', self.store.cycle())
+        return st.session_state.data_nonce
+    
+    def emit_chart(self, spec):
+        """Show a chart now, or queue it for the combined document"""
+        if self.single_document:
+            self.pending_charts.append(spec)
+            return
+        html = self.hc_generator.render_document([spec])
+        components.html(html, height=self.hc_generator.document_height([spec]))
+    
+    def render_combined_charts(self):
+        """Render every queued chart in one document"""
+        if not self.pending_charts:
+            return
+        st.subheader("📊 Charts")
+        html = self.hc_generator.render_document(self.pending_charts)
+        components.html(html, height=self.hc_generator.document_height(self.pending_charts))
+        self.pending_charts = []
+    
+    def section_graph(self):
+        """Network graph from the telemetry or the simulator (None if the telemetry has none)"""
+        if self.telemetry is not None:
+            return self.telemetry.network_graph()
+        return cached_network_graph(self.seed, self.scale, self.nonce)
+    
+    def server_layout(self, graph):
+        """Whether node positions for ``graph`` are computed server-side"""
+        return self.network_layout == "Server" or (self.network_layout == "Auto" and graph.num_nodes > 300)
+    
+    def incident_history_data(self, history, target):
+        """Incident history for a ``HISTORY_DAYS`` label, downsampled to ``target`` points"""
+        timestamps, series = cached_incident_history(self.seed, self.HISTORY_DAYS[history], self.nonce)
+        series_data, boost = self.downsampler.downsample(timestamps, series, 0 if target == "All" else target)
+        return timestamps, series, series_data, boost
+    
+    def flow_engine(self, builder=None):
+        """Aggregated simulated flows, built once and published in the shared store"""
+        seed, scale = self.seed, self.scale
+        return self.store.get(('flows', seed, scale, self.nonce), builder or (lambda: build_flow_engine(seed, scale)))
+    
+    def prepare_sections(self, selected):
+        """Build the selected sections' data and chart documents concurrently
+
+        CPU-heavy pure work (flow aggregation, location binning, large chart
+        documents) runs on the shared ``preparation_pool`` while the main
+        thread builds the network graph, metrics and layout and the incident
+        history; results are published in the caches the sections read, so
+        the sections then render in order from warm caches. Section widgets
+        are read from their previous values in session state.
+        """
+        pool = preparation_pool()
+        published = []
+        if "Sankey Diagram" in selected and self.telemetry is None and (self.seed is not None or self.scale != 1):
+            flows = pool.submit(build_flow_engine, self.seed, self.scale)
+            published.append(lambda: self.flow_engine(flows.result))
+        if "Heatmap" in selected and self.telemetry is None and not self.live \
+                and st.session_state.get("heatmap_source") == "Geo cells":
+            pyramid_key = self.pyramid_key()
+            if pyramid_key not in self.store.entries:
+                pyramid = pool.submit(build_location_pyramid, self.seed, self.scale, pyramid_key[-1],
+                                      self.PYRAMID_HOURS)
+                published.append(lambda: self.location_pyramid(pyramid.result))
+        if "Heatmap" in selected and not self.single_document and self.telemetry is None \
+                and st.session_state.get("heatmap_source", "Snapshot") == "Snapshot":
+            days, hours, grid = cached_heatmap_grid(self.seed, self.scale, self.nonce)
+            specs = [self.hc_generator.heatmap_chart_spec(days, hours, grid)]
+            key = self.hc_generator.document_key(specs)
+            if self.hc_generator.cache.get(key) is None:
+                document = pool.submit(build_document, self.hc_generator.asset_base,
+                                       self.hc_generator.binary_payloads, specs)
+                published.append(lambda: self.hc_generator.cache.put(key, document.result()))
+        
+        if "Network Graph" in selected:
+            self.prepare_network()
+        if "Timeline" in selected:
+            self.prepare_timeline()
+        for publish in published:
+            publish()
+    
+    def prepare_network(self):
+        """Graph, metrics and (for the full graph) server-side layout"""
+        graph = self.section_graph()
+        if graph is None:
+            return
+        self.metrics_engine.compute(graph)
+        self.metrics_engine.adjacency_for(graph)
+        full = graph.num_nodes <= FULL_GRAPH_NODES and st.session_state.get("network_detail", "Full graph") == "Full graph"
+        if full and self.server_layout(graph):
+            self.layout_engine.positions_for(graph)
+    
+    def prepare_timeline(self):
+        """Downsampled incident history in the per-minute view"""
+        if self.telemetry is None and st.session_state.get("timeline_view") == "Per-minute history":
+            self.incident_history_data(st.session_state.get("incident_history", "30 days"),
+                                       st.session_state.get("incident_points", 1200))
+    
     def render_network_section(self):
         """Render network graph"""
         st.subheader("🔗 Social Network Analysis")
         
+        graph = self.section_graph()
+        if graph is None:
+            st.info("The telemetry file has no connection records")
+            return
+        metrics = self.metrics_engine.compute(graph)
+        
         col1, col2 = st.columns([3, 1])
         
+        with col2:
+            if graph.num_nodes <= FULL_GRAPH_NODES:
+                detail = st.radio(
+                    "Detail level",
+                    ["Full graph", "Communities"],
+                    key="network_detail",
+                    help="Communities collapses each community into one weighted super-node"
+                )
+            else:
+                # A choice left over from a smaller graph does not apply
+                st.session_state.pop("network_detail", None)
+                detail = "Communities"
+                st.caption(f"Graphs over {FULL_GRAPH_NODES:,} nodes are shown by community")
+            expand = None
+            if detail == "Communities":
+                sizes = np.bincount(graph.columns['community'], minlength=len(graph.categories['community']))
+                expandable = [label for label, size in zip(graph.categories['community'], sizes.tolist())
+                              if 0 < size <= FULL_GRAPH_NODES]
+                expand = st.selectbox("Expand community", ["None"] + expandable,
+                                      help=f"Communities of up to {FULL_GRAPH_NODES:,} users can be expanded")
+                expand = None if expand == "None" else expand
+            
+            with st.expander("Risk Propagation", expanded=False):
+                seeding = st.radio("Seed users", ["Top PageRank", "Custom"], horizontal=True)
+                if seeding == "Top PageRank":
+                    count = st.slider("Number of seeds", 1, 50, 3)
+                    rank = metrics['pagerank']
+                    seeds = np.argpartition(-rank, min(count, len(rank)) - 1)[:count]
+                else:
+                    entered = st.text_input("Seed user ids", value=metrics['top_nodes'][0][0] if metrics['top_nodes'] else "")
+                    seeds = graph.index_of([node_id.strip() for node_id in entered.split(',') if node_id.strip()])
+                decay = st.slider("Decay", 0.05, 0.95, 0.5, 0.05, help="Share of neighbour risk passed on per hop")
+        
+        risk = self.risk_engine.propagate(self.metrics_engine.adjacency_for(graph), seeds, decay)
+        exposed = float((risk >= 0.1).mean()) if len(risk) else 0.0
+        # The gauge scores contacts from the propagated risk; when only this
+        # fragment reran, the already drawn gauge is stale and needs a full rerun
+        risk_key = fingerprint(risk)
+        if self.gauge_rendered and risk_key != self.network_risk_key:
+            self.network_risk, self.network_risk_key = risk, risk_key
+            st.rerun()
+        self.network_risk, self.network_risk_key = risk, risk_key
+        self.network_exposure = exposed
+        
+        chart_graph = graph.with_columns({'risk': risk})
+        if detail == "Communities":
+            chart_graph = self.coarsener.coarsen_graph(chart_graph, expand)
+        chart_graph = self.risk_engine.color_by_risk(chart_graph)
+        
         with col1:
-            nodes, links = self.data_simulator.generate_network_data()
-            html = self.hc_generator.create_network_graph(nodes, links)
-            components.html(html, height=600)
+            positions = None
+            if self.server_layout(chart_graph):
+                positions = self.layout_engine.positions_for(chart_graph)
+            self.emit_chart(self.hc_generator.compact_network_spec(chart_graph, positions))
         
         with col2:
-            st.metric("Nodes", len(nodes))
-            st.metric("Connections", len(links))
+            st.metric("Nodes", graph.num_nodes)
+            st.metric("Connections", graph.num_links)
+            st.metric("Components", metrics['components'])
+            st.metric("Exposed Users", f"{exposed:.1%}", help="Users with propagated risk of 10% or more")
+            if detail == "Communities":
+                st.metric("Elements Drawn", chart_graph.num_nodes + chart_graph.num_links)
             
             st.info("""
             **Ethical Note:**
@@ -578,49 +1727,302 @@ class EnhancedPrivacyDashboard:
             - Simulated network
             - No real users
             """)
+        
+        self.network_metrics = metrics
+    
+    def render_network_metrics(self, metrics):
+        """Show graph metrics in the sidebar"""
+        with st.sidebar.expander("Network Metrics", expanded=False):
+            st.write(f"**Mean degree:** {metrics['mean_degree']:.2f} (max {metrics['max_degree']})")
+            st.write(f"**Isolated users:** {metrics['isolated']}")
+            largest_share = metrics['largest_component'] / max(metrics['nodes'], 1)
+            st.write(f"**Largest component:** {metrics['largest_component']} ({largest_share:.0%} of users)")
+            
+            st.write("**Degree distribution:**")
+            for bucket, count in metrics['degree_distribution'].items():
+                st.caption(f"{bucket} connections: {count} users")
+            
+            if metrics['community_density']:
+                densest = sorted(metrics['community_density'].items(), key=lambda item: -item[1])[:5]
+                st.write("**Densest communities:**")
+                for label, density in densest:
+                    st.caption(f"Community {label}: {density:.4f}")
+            
+            st.write("**Most influential (PageRank):**")
+            for node_id, rank in metrics['top_nodes'][:5]:
+                st.caption(f"{node_id}: {rank:.2e}")
     
     def render_sankey_section(self):
         """Render Sankey diagram"""
         st.subheader("🌊 Data Flow Analysis")
         
-        nodes, links = self.data_simulator.generate_sankey_data()
+        if self.telemetry is None and self.seed is None and self.scale == 1:
+            nodes, links = self.data_simulator.generate_sankey_data()
+            total_data = sum([link[2] for link in links])
+        else:
+            top_k = st.slider("Top entities", min_value=5, max_value=40, value=20, key="sankey_top_k",
+                              help="Less active entities are folded into 'Other' buckets")
+            flows = self.telemetry.flows if self.telemetry is not None else self.flow_engine()
+            nodes, links = flows.sankey(top_k, unit=2 ** 30)
+            total_data = round(flows.total_volume / 2 ** 30)
+            st.caption(f"{flows.records:,} flow records aggregated into {len(flows.edge_keys):,} distinct flows "
+                       f"between {len(flows.labels):,} entities")
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            total_data = sum([link[2] for link in links])
-            st.metric("Data Flow", f"{total_data} GB/month")
+            st.metric("Data Flow", f"{total_data:,} GB/month")
         with col2:
             st.metric("Entities", len(nodes))
         with col3:
             st.metric("Pathways", len(links))
         
-        html = self.hc_generator.create_sankey_diagram(nodes, links)
-        components.html(html, height=600)
+        self.emit_chart(self.hc_generator.sankey_diagram_spec(nodes, links))
+    
+    def load_telemetry(self):
+        """Ingest the chosen telemetry file once, with sidebar progress
+
+        A server-side file (only offered when ``DASHBOARD_TELEMETRY_DIR`` is
+        set, and only inside it) is streamed from disk in chunks and its
+        aggregates are published in the shared store, so every session
+        viewing the same file reuses one ingestion. An upload is already
+        held in memory by Streamlit and stays private to its session.
+        """
+        path = None
+        directory = os.environ.get('DASHBOARD_TELEMETRY_DIR', '')
+        if directory:
+            name = st.text_input("Server file", help="Path inside the server's telemetry directory; "
+                                                     "streamed from disk, preferred for large files")
+            if name:
+                path = telemetry_path(name, directory)
+                if path is None or not os.path.isfile(path):
+                    st.error(f"No telemetry file {name} on the server")
+                    return None
+        upload = st.file_uploader("Or upload a file" if directory else "Upload a file", type=["csv", "jsonl"])
+        if path:
+            stat = os.stat(path)
+            key, name, size = ('path', path, stat.st_size, stat.st_mtime), path, stat.st_size
+        elif upload is not None:
+            key, name, size = ('upload', upload.file_id), upload.name, upload.size
+        else:
+            return None
+        fmt = 'jsonl' if name.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+        
+        def ingest():
+            bar = st.progress(0.0, text="Reading telemetry...")
+            
+            def progress(rows, fraction):
+                bar.progress(fraction if fraction is not None else 0.0, text=f"{rows:,} rows ingested")
+            
+            try:
+                if path:
+                    with open(path, 'rb') as handle:
+                        return TelemetryIngestor().ingest(handle, fmt, size, progress)
+                upload.seek(0)
+                return TelemetryIngestor().ingest(upload, fmt, size, progress)
+            finally:
+                bar.empty()
+        
+        try:
+            if path:
+                ingestor = self.store.get(('telemetry',) + key, ingest)
+            else:
+                loaded = st.session_state.get('telemetry')
+                if loaded is None or loaded['key'] != key:
+                    loaded = {'key': key, 'ingestor': ingest()}
+                    st.session_state.telemetry = loaded
+                ingestor = loaded['ingestor']
+        except (ValueError, KeyError, pd.errors.ParserError) as error:
+            st.error(f"Could not read telemetry: {error}")
+            return None
+        
+        st.caption(f"{ingestor.rows:,} rows: " + ", ".join(
+            f"{count:,} {row_type}" for row_type, count in sorted(ingestor.row_types.items())
+        ))
+        return ingestor
     
     def render_heatmap_section(self):
         """Render heatmap"""
         st.subheader("📍 Location Privacy Heatmap")
         
-        days, hours, data = self.data_simulator.generate_heatmap_data()
+        if self.live and self.telemetry is None:
+            self.render_live_heatmap()
+            return
+        source = "Snapshot"
+        if self.telemetry is None:
+            source = st.radio("Source", ["Snapshot", "Event stream", "Geo cells"], horizontal=True, key="heatmap_source")
+        if source == "Event stream":
+            self.render_heatmap_stream()
+            return
+        if source == "Geo cells":
+            self.render_heatmap_pyramid()
+            return
+        if self.telemetry is not None:
+            days, hours, grid = self.telemetry.heatmap_data()
+            summary = self.telemetry.heatmap.summary()
+        else:
+            days, hours, grid = cached_heatmap_grid(self.seed, self.scale, self.nonce)
+            summary = {'average': grid.mean(), 'peak': grid.max(), 'high_risk': int(np.count_nonzero(grid > 70))}
         
-        risks = [point[2] for point in data]
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Avg Risk", f"{np.mean(risks):.1f}/100")
+            st.metric("Avg Risk", f"{summary['average']:.1f}/100")
+        with col2:
+            st.metric("Peak Risk", int(summary['peak']))
+        with col3:
+            st.metric("High Risk", summary['high_risk'])
+        
+        self.emit_chart(self.hc_generator.heatmap_chart_spec(days, hours, grid))
+    
+    def render_heatmap_stream(self):
+        """Render the heatmap from the incrementally aggregated event stream"""
+        window = st.selectbox("Window", ["All history", "Last 7 days", "Last 24 hours"])
+        window = {"All history": None, "Last 7 days": 7 * 86400, "Last 24 hours": 86400}[window]
+        
+        stream = self.heatmap_stream(window)
+        aggregator = stream['aggregator']
+        summary = aggregator.summary()
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Avg Risk", f"{summary['average']:.1f}/100")
+        with col2:
+            st.metric("Peak Risk", int(summary['peak']))
+        with col3:
+            st.metric("High Risk", summary['high_risk'])
+        with col4:
+            st.metric("Events", f"{summary['events']:,}")
+        st.caption(
+            f"Stream clock: {datetime.fromtimestamp(stream['clock'], timezone.utc).strftime('%Y-%m-%d %H:%M')} UTC "
+            f"- one hour of events is ingested per rerun"
+        )
+        
+        days, hours = stream['labels']
+        self.emit_chart(self.hc_generator.heatmap_chart_spec(days, hours, aggregator.grid()))
+    
+    def heatmap_stream(self, window):
+        """Session event stream for the heatmap, advanced by one batch per rerun
+
+        A new stream (for a changed seed, scale or window) is backfilled with
+        ``HEATMAP_BACKFILL_HOURS`` of events in day-sized batches.
+        """
+        key = (self.seed, self.scale, window)
+        stream = st.session_state.get('heatmap_stream')
+        if stream is None or stream['key'] != key:
+            days, hours = DataSimulator.heatmap_labels(self.scale)
+            if self.seed is None:
+                clock = int(datetime.now().timestamp()) // 3600 * 3600
+            else:
+                clock = int(datetime(2024, 12, 1, tzinfo=timezone.utc).timestamp()) // 3600 * 3600
+            stream = {
+                'key': key,
+                'labels': (days, hours),
+                'aggregator': HeatmapAggregator(len(days), len(hours), window=window),
+                'clock': clock - self.HEATMAP_BACKFILL_HOURS * 3600,
+                'batch': 0
+            }
+            for _ in range(self.HEATMAP_BACKFILL_HOURS // 24):
+                self.advance_heatmap_stream(stream, 24)
+            st.session_state.heatmap_stream = stream
+        
+        self.advance_heatmap_stream(stream, 1)
+        return stream
+    
+    def pyramid_key(self):
+        """Shared store key of the location pyramid; its last part is the start of the binned hours
+
+        Unseeded pyramids cover the last ``PYRAMID_HOURS`` full hours, so
+        they are rebuilt once an hour; in shared mode they follow the hour
+        rather than the shorter shared data cycle.
+        """
+        if self.seed is None:
+            start = int(time.time()) // 3600 * 3600 - 3600 * self.PYRAMID_HOURS
+        else:
+            start = int(datetime(2024, 12, 1, tzinfo=timezone.utc).timestamp())
+        return ('pyramid', self.seed, self.scale, None if self.shared else self.nonce, start)
+    
+    def location_pyramid(self, builder=None):
+        """Minute x geo cell risk pyramid of the last ``PYRAMID_HOURS``, published in the shared store"""
+        key = self.pyramid_key()
+        seed, scale, start, hours = self.seed, self.scale, key[-1], self.PYRAMID_HOURS
+        return key, self.store.get(key, builder or (lambda: build_location_pyramid(seed, scale, start, hours)))
+    
+    def render_heatmap_pyramid(self):
+        """Zoomable minute x geo cell heatmap, served tile by tile from the pyramid
+
+        Selecting a region in the chart sends it back as the component value;
+        the next run answers with the tile of that region at the finest level
+        that fits ``PYRAMID_TILE``.
+        """
+        with st.spinner("Binning location events..."):
+            key, pyramid = self.location_pyramid()
+        view = st.session_state.get('heatmap_tiles_view')
+        if view is None or view['key'] != key:
+            view = {'key': key, 'region': None, 'request': None}
+            st.session_state.heatmap_tiles_view = view
+        selection = st.session_state.get('heatmap_tiles_chart') or {}
+        if selection.get('request') is not None and selection['request'] != view['request']:
+            view['request'] = selection['request']
+            view['region'] = selection.get('region')
+        if view['region'] is not None and st.button("Full view", key="heatmap_tiles_reset"):
+            view['region'] = None
+        
+        region = view['region']
+        time_range = None if region is None else (region[0] / 1000, region[1] / 1000)
+        location_range = None if region is None else (region[2], region[3])
+        tile = pyramid.view(time_range, location_range, self.PYRAMID_TILE)
+        means, counts = tile['means'], tile['counts']
+        seconds, cells = tile['bin_size']
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Avg Risk", f"{np.nansum(means * counts) / max(int(counts.sum()), 1):.1f}/100")
         with col2:
-            st.metric("Peak Risk", max(risks))
+            st.metric("Peak Cell", int(np.nanmax(means)) if counts.any() else 0)
         with col3:
-            high_risk = len([r for r in risks if r > 70])
-            st.metric("High Risk", high_risk)
+            st.metric("Events", f"{int(counts.sum()):,}")
+        with col4:
+            st.metric("Resolution", f"{seconds / 60:g} min x {cells:g} cell" + ("s" if cells != 1 else ""))
+        st.caption(
+            f"{pyramid.events:,} events over {self.PYRAMID_HOURS} h and {pyramid.location_range[1]:,} geo cells, "
+            f"pyramid level {tile['level'][0]} of {pyramid.levels[0] - 1} in time and {tile['level'][1]} of "
+            f"{pyramid.levels[1] - 1} across cells. Drag over the chart to zoom in."
+        )
         
-        html = self.hc_generator.create_heatmap_chart(days, hours, data)
-        components.html(html, height=500)
+        base = {
+            'subtitle': "Mean risk per minute and geo cell" if (seconds, cells) == (60, 1) else "Mean risk per bin (zoom in for detail)",
+            'time_start': tile['time_start'] * 1000,
+            'time_step': seconds * 1000,
+            'location_start': tile['location_start'],
+            'location_step': cells,
+            'columns': means.shape[1],
+            'values': [None if np.isnan(value) else int(round(value)) for value in means.ravel().tolist()],
+            'zoomed': region is not None,
+            'height': self.hc_generator.CHART_LAYOUT['heatmap']['height']
+        }
+        # A new tile is a new epoch: the component rebuilds the chart from it
+        epoch = int(fingerprint('tile', key, tile['level'], base['time_start'], base['location_start'], means.shape)[:7], 16)
+        live_chart(
+            kind='heatmap_tiles', epoch=epoch, seq=0, base=base, delta=None,
+            asset_base=self.hc_generator.asset_base, modules=self.hc_generator.CHART_MODULES['heatmap'],
+            height=base['height'], key='heatmap_tiles_chart'
+        )
+    
+    def advance_heatmap_stream(self, stream, hours):
+        """Ingest the next ``hours`` of simulated events into the stream"""
+        seed = None if self.seed is None else [self.seed, stream['batch']]
+        timestamps, risks = self.data_simulator.generate_risk_events(stream['clock'], hours, seed, self.scale)
+        stream['aggregator'].update(timestamps, risks)
+        stream['clock'] += hours * 3600
+        stream['batch'] += 1
     
     def render_bubble_section(self):
         """Render bubble chart"""
         st.subheader("🫧 Platform Comparison")
         
-        data = self.data_simulator.generate_bubble_data()
+        data = self.telemetry.bubble_data() if self.telemetry is not None else self.data_simulator.generate_bubble_data()
+        if not data:
+            st.info("The telemetry file has no platform records")
+            return
         
         # Create summary table
         df = pd.DataFrame([
@@ -637,8 +2039,7 @@ class EnhancedPrivacyDashboard:
         with col2:
             st.metric("Most Users", most_users['Platform'], f"{most_users['Users']}M")
         
-        html = self.hc_generator.create_bubble_chart(data)
-        components.html(html, height=500)
+        self.emit_chart(self.hc_generator.bubble_chart_spec(data))
         
         with st.expander("Data Table"):
             st.dataframe(df)
@@ -647,40 +2048,274 @@ class EnhancedPrivacyDashboard:
         """Render timeline"""
         st.subheader("📅 Security Incidents")
         
-        data = self.data_simulator.generate_timeline_data()
+        if self.live and self.telemetry is None:
+            self.render_live_timeline()
+            return
+        
+        view = "Monthly"
+        if self.telemetry is None:
+            view = st.radio("View", ["Monthly", "Per-minute history"], horizontal=True, key="timeline_view")
+        if view == "Per-minute history":
+            self.render_incident_history()
+            return
+        
+        data = self.telemetry.timeline_data() if self.telemetry is not None else self.data_simulator.generate_timeline_data()
         
         totals = {s['name']: sum(s['data']) for s in data}
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Phishing", totals['Phishing Attacks'])
+            st.metric("Phishing", totals.get('Phishing Attacks', 0))
         with col2:
-            st.metric("Data Breaches", totals['Data Breaches'])
+            st.metric("Data Breaches", totals.get('Data Breaches', 0))
         
-        html = self.hc_generator.create_timeline_chart(data)
-        components.html(html, height=500)
+        self.emit_chart(self.hc_generator.timeline_chart_spec(data))
+    
+    def render_incident_history(self):
+        """Render the per-minute incident history, LTTB-downsampled"""
+        col1, col2 = st.columns(2)
+        with col1:
+            history = st.selectbox("History", list(self.HISTORY_DAYS), key="incident_history")
+        with col2:
+            target = st.select_slider(
+                "Points per series", options=[300, 600, 1200, 2400, "All"], value=1200, key="incident_points",
+                help="Series are downsampled with Largest-Triangle-Three-Buckets; "
+                     "large point counts switch on the boost module"
+            )
+        timestamps, series, series_data, boost = self.incident_history_data(history, target)
+        
+        totals = {s['name']: int(s['counts'].sum()) for s in series}
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Phishing", f"{totals['Phishing Attacks']:,}")
+        with col2:
+            st.metric("Data Breaches", f"{totals['Data Breaches']:,}")
+        with col3:
+            st.metric("Points Drawn", f"{sum(len(s['data']) for s in series_data):,}")
+        
+        subtitle = f"Per-minute incident counts, {history}" + (" (boosted)" if boost else "")
+        self.emit_chart(self.hc_generator.incident_history_spec(
+            series_data, subtitle, boost, self.downsampler.boost_threshold
+        ))
     
     def render_gauge_section(self):
         """Render gauge"""
         st.subheader("⚠️ Risk Assessment")
         
-        risk_score = random.randint(35, 75)
+        if self.live and self.telemetry is None:
+            self.render_live_gauge()
+            return
+        population = self.population_risk()
+        statistic = st.radio("Gauge shows", ["Mean", "Median", "90th percentile"], horizontal=True,
+                             key="gauge_statistic")
+        value = population['mean'] if statistic == "Mean" else population['percentiles'][50 if statistic == "Median" else 90]
+        risk_score = round(value)
         
         col1, col2 = st.columns([2, 1])
         with col1:
-            html = self.hc_generator.create_gauge_chart(risk_score)
-            components.html(html, height=400)
+            self.emit_chart(self.hc_generator.gauge_chart_spec(risk_score))
         with col2:
-            st.metric("Risk Score", f"{risk_score}/100")
+            st.metric("Risk Score", f"{risk_score}/100", help=f"{statistic} of {population['users']:,} scored users")
+            st.metric("High-Risk Users", f"{population['high_risk_share']:.1%}", help="Users scoring 70 or more")
             
-            st.write("**Factors:**")
-            factors = {
-                "Location": random.randint(40, 90),
-                "Data Sharing": random.randint(30, 80),
-                "Network": random.randint(20, 70)
-            }
+            st.write("**Factor contributions:**")
             
-            for factor, score in factors.items():
-                st.progress(score/100, text=f"{factor}: {score}")
+            for factor, values in population['factors'].items():
+                st.progress(
+                    min(values['score'] / 100, 1.0),
+                    text=f"{factor}: {values['score']:.0f}/100 x {values['weight']:.0%} = {values['contribution']:.1f} pts"
+                )
+            if self.network_risk is not None:
+                st.caption("Contact risk is drawn from the network section's risk propagation")
+        self.gauge_rendered = True
+    
+    def population_risk(self):
+        """Population risk summary, published in the shared store"""
+        seed, scale, risk = self.seed, self.scale, self.network_risk
+        return self.store.get(('population', seed, scale, self.nonce, self.network_risk_key),
+                              lambda: build_population_risk(seed, scale, risk))
+    
+    def live_feed(self):
+        """Session's simulated live event source, polled up to now"""
+        key = (self.seed, self.scale)
+        feed = st.session_state.get('live_feed')
+        if feed is None or feed['key'] != key:
+            start = None if self.seed is None else datetime(2024, 12, 1, tzinfo=timezone.utc).timestamp()
+            feed = {'key': key, 'source': LiveEventSource(self.seed, self.scale, speed=self.LIVE_SPEED, start=start)}
+            st.session_state.live_feed = feed
+        feed['source'].poll()
+        return feed['source']
+    
+    def live_state(self, name, create):
+        """Live section state and the feed batches it has not seen yet
+
+        The state holds the feed cursor, the chart ``epoch`` and the delta
+        sequence number plus whatever ``create(feed)`` backfills. It starts
+        over (as a new epoch) for a new feed or when the section fell
+        behind the feed's retention.
+        """
+        feed = self.live_feed()
+        state = st.session_state.get(f'live_{name}')
+        batches = None
+        if state is not None and state['feed'] is feed:
+            batches = feed.since(state['cursor'])
+        if batches is None:
+            state = {'feed': feed, 'cursor': feed.sequence - 1, 'epoch': random.getrandbits(31), 'seq': 0}
+            state.update(create(feed))
+            st.session_state[f'live_{name}'] = state
+            batches = []
+        if batches:
+            state['cursor'] = batches[-1]['sequence']
+        return state, batches
+    
+    def emit_live(self, kind, state, delta, snapshot):
+        """Draw a live chart: the full ``snapshot()`` until the frame holds this epoch, then deltas only"""
+        key = f'live_{kind}_chart'
+        if delta is not None:
+            state['seq'] += 1
+        ack = st.session_state.get(key)
+        base = snapshot() if not ack or ack.get('epoch') != state['epoch'] else None
+        if base is not None:
+            base['height'] = self.hc_generator.CHART_LAYOUT[kind]['height']
+        live_chart(
+            kind=kind, epoch=state['epoch'], seq=state['seq'], base=base, delta=delta,
+            asset_base=self.hc_generator.asset_base, modules=self.hc_generator.CHART_MODULES[kind],
+            height=self.hc_generator.CHART_LAYOUT[kind]['height'], key=key
+        )
+    
+    def live_backfill_seed(self, part):
+        """Seed of a one-off live backfill (None when unseeded)"""
+        return None if self.seed is None else [self.seed, 2 ** 20 + part]
+    
+    def render_live_timeline(self):
+        """Per-minute incidents of the last hours, extended by each live tick"""
+        def create(feed):
+            minutes = self.LIVE_HISTORY_MINUTES
+            start = feed.clock - 60 * minutes
+            counts = DataSimulator.generate_incident_minutes(start, minutes, self.live_backfill_seed(0))
+            points = deque(maxlen=minutes)
+            for i, row in enumerate(counts.tolist()):
+                points.append([(start + 60 * i) * 1000] + row)
+            return {'points': points, 'totals': counts.sum(axis=0).astype(np.int64)}
+        
+        state, batches = self.live_state('timeline', create)
+        points = state['points']
+        new = []
+        for batch in batches:
+            if len(points) == points.maxlen:
+                state['totals'] -= points[0][1:]
+            point = [batch['minute'] * 1000] + batch['incidents'].tolist()
+            points.append(point)
+            state['totals'] += batch['incidents']
+            new.append(point)
+        
+        hours = self.LIVE_HISTORY_MINUTES // 60
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(f"Phishing ({hours}h)", f"{int(state['totals'][0]):,}")
+        with col2:
+            st.metric(f"Data Breaches ({hours}h)", f"{int(state['totals'][1]):,}")
+        with col3:
+            st.metric("Simulated Clock", datetime.fromtimestamp(state['feed'].clock, timezone.utc).strftime('%H:%M'))
+        
+        def snapshot():
+            return {
+                'subtitle': f"Per-minute incident counts, last {hours} hours (live)",
+                'max_points': points.maxlen,
+                'series': [
+                    {'name': name, 'color': color, 'data': [[p[0], p[i + 1]] for p in points]}
+                    for i, (name, color, _) in enumerate(DataSimulator.INCIDENT_TYPES)
+                ]
+            }
+        
+        self.emit_live('timeline', state, {'points': new} if new else None, snapshot)
+    
+    def render_live_heatmap(self):
+        """Location risk over the last week, with each live tick's changed cells pushed to the chart"""
+        def create(feed):
+            days, hours = DataSimulator.heatmap_labels(self.scale)
+            aggregator = HeatmapAggregator(len(days), len(hours), window=7 * 86400)
+            start = feed.clock - self.HEATMAP_BACKFILL_HOURS * 3600
+            for day in range(self.HEATMAP_BACKFILL_HOURS // 24):
+                aggregator.update(*DataSimulator.generate_risk_events(
+                    start + day * 86400, 24, self.live_backfill_seed(1 + day), self.scale
+                ))
+            return {'labels': (days, hours), 'aggregator': aggregator}
+        
+        state, batches = self.live_state('heatmap', create)
+        aggregator = state['aggregator']
+        changed = [aggregator.update(batch['timestamps'], batch['risks']) for batch in batches]
+        changed = np.unique(np.concatenate(changed)) if changed else np.zeros(0, dtype=np.int64)
+        
+        summary = aggregator.summary()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Avg Risk", f"{summary['average']:.1f}/100")
+        with col2:
+            st.metric("Peak Risk", int(summary['peak']))
+        with col3:
+            st.metric("High Risk", summary['high_risk'])
+        with col4:
+            st.metric("Events (7 days)", f"{summary['events']:,}")
+        
+        def snapshot():
+            days, hours = state['labels']
+            return {'categories_x': days, 'categories_y': hours, 'values': aggregator.values().tolist(),
+                    'subtitle': "Mean risk of the last 7 days of events (live)"}
+        
+        delta = None
+        if len(changed):
+            delta = {'cells': np.column_stack([changed, aggregator.values(changed)]).tolist()}
+        self.emit_live('heatmap', state, delta, snapshot)
+    
+    def render_live_gauge(self):
+        """Rolling mean location risk of the last hour of live events"""
+        def create(feed):
+            minutes = self.LIVE_GAUGE_MINUTES
+            start = feed.clock - 60 * minutes
+            timestamps, risks = DataSimulator.generate_risk_events(start, minutes / 60, self.live_backfill_seed(100), self.scale)
+            minute = (timestamps - start) // 60
+            sums = np.bincount(minute, weights=risks, minlength=minutes)
+            counts = np.bincount(minute, minlength=minutes)
+            return {'window': deque(zip(sums.tolist(), counts.tolist()), maxlen=minutes),
+                    'sum': float(sums.sum()), 'count': int(counts.sum()), 'value': None}
+        
+        state, batches = self.live_state('gauge', create)
+        window = state['window']
+        for batch in batches:
+            if len(window) == window.maxlen:
+                state['sum'] -= window[0][0]
+                state['count'] -= window[0][1]
+            entry = (float(batch['risks'].sum()), len(batch['risks']))
+            window.append(entry)
+            state['sum'] += entry[0]
+            state['count'] += entry[1]
+        value = round(state['sum'] / state['count']) if state['count'] else 0
+        
+        col1, col2 = st.columns([2, 1])
+        with col2:
+            st.metric("Live Risk", f"{value}/100", help="Mean location risk of the last hour of simulated events")
+            st.metric("Events (1h)", f"{state['count']:,}")
+            st.caption("Turn live updates off for the population risk score")
+        with col1:
+            delta = {'value': value} if value != state['value'] else None
+            state['value'] = value
+            self.emit_live('gauge', state, delta, lambda: {'value': value, 'title': 'Live Location Risk'})
+        self.gauge_rendered = True
+    
+    def render_performance(self):
+        """Show the per-section measurements of this run in the sidebar"""
+        if not self.recorder.records:
+            return
+        with st.sidebar.expander("Performance", expanded=True):
+            summary = self.recorder.summary()
+            st.dataframe(summary, hide_index=True)
+            st.caption(
+                f"{summary['Total ms'].sum():,.0f} ms in sections, "
+                f"{summary['HTML KB'].sum():,.0f} KB of chart HTML. "
+                "Fragment reruns show up here on the next full run."
+            )
+            if self.recorder.log_path:
+                st.caption(f"Logging to {self.recorder.log_path}")
     
     def render_conclusion(self):
         """Render conclusion"""
@@ -718,28 +2353,56 @@ class EnhancedPrivacyDashboard:
         self.render_header()
         selected = self.render_sidebar()
         
-        # Only show selected charts
-        if "Network Graph" in selected:
-            self.render_network_section()
-        
-        if "Sankey Diagram" in selected:
-            self.render_sankey_section()
-        
-        if "Heatmap" in selected:
-            self.render_heatmap_section()
+        sections = [
+            ("Network Graph", self.render_network_section),
+            ("Sankey Diagram", self.render_sankey_section),
+            ("Heatmap", self.render_heatmap_section),
+            ("Bubble Chart", self.render_bubble_section),
+            ("Timeline", self.render_timeline_section),
+            ("Gauge", self.render_gauge_section)
+        ]
         
-        if "Bubble Chart" in selected:
-            self.render_bubble_section()
+        self.recorder.context.update({
+            'seed': self.seed, 'scale': self.scale, 'shared': self.shared,
+            'single_document': self.single_document, 'parallel_prepare': self.parallel_prepare,
+            'binary_payloads': self.hc_generator.binary_payloads, 'telemetry': self.telemetry is not None
+        })
         
-        if "Timeline" in selected:
-            self.render_timeline_section()
+        if self.parallel_prepare:
+            with self.recorder.section("Preparation"):
+                self.prepare_sections(selected)
         
-        if "Gauge" in selected:
-            self.render_gauge_section()
+        # Only show selected charts. Each section is a fragment, so its own
+        # widgets rerun just that section; the combined document needs every
+        # chart, so single-document mode renders them in the full run.
+        for label, render in sections:
+            if label in selected:
+                render = self.recorder.instrument(label, render)
+                # Live sections are fragments rerun on a timer, drawn in
+                # their own live chart even in single-document mode
+                live = self.live and label in self.LIVE_SECTIONS
+                if self.single_document and not live:
+                    render()
+                else:
+                    st.fragment(render, run_every=self.live_interval if live else None)()
         
+        if self.network_metrics is not None:
+            self.render_network_metrics(self.network_metrics)
+        if self.pending_charts:
+            with self.recorder.section("Combined charts"):
+                self.render_combined_charts()
+        if self.show_performance:
+            self.render_performance()
         self.render_conclusion()
 
-# Run the app
+# Run the app. Page configuration lives here so that batch report workers
+# can import this module without a Streamlit session.
 if __name__ == "__main__":
+    st.set_page_config(
+        page_title="Advanced Highcharts Visualization Dashboard",
+        page_icon="📊",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
     app = EnhancedPrivacyDashboard()
     app.run()
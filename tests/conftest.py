@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The dashboard module sets up Streamlit at import; keep its bare-mode
+# warnings quiet and leave the on-disk cache out of the tests
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+os.environ.setdefault('DASHBOARD_CACHE_DIR', '')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,126 @@
+import base64
+import json
+import re
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import social_media_privacy_dashboard_enhanced as dashboard
+from privacy_engines import DataSimulator, LRUCache, fingerprint
+from social_media_privacy_dashboard_enhanced import HighchartsGenerator
+
+
+def run_script(monkeypatch):
+    """Execute the dashboard script into a fresh module, as every Streamlit rerun does"""
+    module = types.ModuleType('dashboard_run')
+    module.__file__ = dashboard.__file__
+    monkeypatch.setitem(sys.modules, 'dashboard_run', module)
+    with open(dashboard.__file__, encoding='utf-8') as handle:
+        exec(compile(handle.read(), dashboard.__file__, 'exec'), module.__dict__)
+    return module
+
+
+def test_fingerprint_hashes_array_contents():
+    values = np.arange(12, dtype=np.int32)
+    assert fingerprint('grid', values) == fingerprint('grid', values.copy())
+    assert fingerprint('grid', values) != fingerprint('grid', values.astype(np.int64))
+    assert fingerprint('grid', values) != fingerprint('grid', values.reshape(3, 4))
+    assert fingerprint('grid', values[::2]) == fingerprint('grid', values[::2].copy())
+    changed = values.copy()
+    changed[5] += 1
+    assert fingerprint('grid', values) != fingerprint('grid', changed)
+
+
+def test_data_key_stands_in_for_the_chart_data():
+    nodes, links = DataSimulator.generate_network_data(3, 2)
+    generator = HighchartsGenerator(cache=LRUCache())
+    html = generator.create_network_graph(nodes, links, data_key=('network', 3, 2))
+    # Same key, so the data is not looked at again
+    assert generator.create_network_graph([], [], data_key=('network', 3, 2)) == html
+    assert generator.create_network_graph(nodes, links, data_key=('network', 3, 3)) == html
+    assert generator.cache.stats()['hits'] == 1
+
+
+def test_graph_documents_are_keyed_on_the_graph_digest():
+    generator = HighchartsGenerator()
+    graph = DataSimulator.generate_network_graph(1, 4)
+    same = DataSimulator.generate_network_graph(1, 4)
+    assert graph.digest() == same.digest()
+    assert generator.document_key([generator.compact_network_spec(graph)]) == \
+        generator.document_key([generator.compact_network_spec(same)])
+    risky = graph.with_columns({'risk': np.ones(graph.num_nodes)})
+    assert risky.digest() != graph.digest()
+    assert generator.document_key([generator.compact_network_spec(risky)]) != \
+        generator.document_key([generator.compact_network_spec(graph)])
+
+
+def test_network_document_renders_after_a_rerun(monkeypatch):
+    first = run_script(monkeypatch)
+    graph = first.DataSimulator.generate_network_graph(1, 4)
+    generator = first.HighchartsGenerator(cache=first.LRUCache())
+    spec = generator.compact_network_spec(graph)
+    # Another session's rerun replaces the script module and its classes
+    second = run_script(monkeypatch)
+    assert second.HighchartsGenerator is not first.HighchartsGenerator
+    assert second.DataSimulator is first.DataSimulator
+    assert 'networkgraph' in generator.render_document([spec])
+
+
+def test_local_bundle_is_served_as_component_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(HighchartsGenerator, 'LOCAL_DIR', str(tmp_path))
+    assert HighchartsGenerator.local_asset_base() is None
+    (tmp_path / 'highcharts.js').write_text('')
+    base = HighchartsGenerator.local_asset_base()
+    assert base.startswith('/component/') and base.endswith('.highcharts_runtime')
+
+
+def unpack(packed):
+    """Decode a ``pack_array`` payload like the browser's ``decodeTyped``"""
+    dtype = {'Uint8Array': '<u1', 'Uint16Array': '<u2', 'Int32Array': '<i4', 'Float32Array': '<f4'}[packed['type']]
+    return np.frombuffer(base64.b64decode(packed['data']), dtype=dtype)
+
+
+def embedded_payload(html, name):
+    return json.loads(re.search(rf'var {name} = (\{{.*?\}});\n', html).group(1))
+
+
+@pytest.mark.parametrize('values, js_type', [
+    ([0, 3, 255], 'Uint8Array'),
+    ([0.0, 256.0, 65535.0], 'Uint16Array'),
+    ([-1, 70000, 5], 'Int32Array'),
+    ([0.5, 2.25, -7.0], 'Float32Array'),
+    ([1.0, np.nan], 'Float32Array'),
+    ([2 ** 31, 0], 'Float32Array')
+])
+def test_pack_array_uses_the_narrowest_type(values, js_type):
+    packed = HighchartsGenerator.pack_array(np.array(values))
+    assert packed['type'] == js_type
+    assert np.array_equal(unpack(packed), np.array(values, dtype=np.float32), equal_nan=True)
+
+
+def test_binary_network_payload_decodes_to_the_graph():
+    graph = DataSimulator.generate_network_graph(5, 3)
+    positions = np.random.default_rng(0).random((graph.num_nodes, 2))
+    generator = HighchartsGenerator(binary_payloads=True)
+    html = generator.render_document([generator.compact_network_spec(graph, positions)])
+    payload = embedded_payload(html, 'networkGraph')
+    assert payload['count'] == graph.num_nodes and payload['ids'] == graph.ids
+    assert np.array_equal(unpack(payload['source']), graph.source)
+    assert np.array_equal(unpack(payload['target']), graph.target)
+    assert np.allclose(unpack(payload['positions']).reshape(-1, 2), positions)
+    community = payload['columns']['community']
+    assert community['labels'] == graph.categories['community']
+    assert np.array_equal(unpack(community['values']), graph.columns['community'])
+    assert 'function decodeTyped' in html and 'graphLinks(networkGraph)' in html
+    # The JSON document carries the same graph as plain lists
+    assert 'var networkGraph' not in HighchartsGenerator().render_document([generator.compact_network_spec(graph)])
+
+
+def test_binary_heatmap_payload_decodes_to_the_grid():
+    days, hours, grid = DataSimulator.generate_heatmap_arrays(5, 2)
+    html = HighchartsGenerator(binary_payloads=True).create_heatmap_chart(days, hours, grid)
+    payload = embedded_payload(html, 'heatmapGrid')
+    assert payload['columns'] == len(hours)
+    assert np.array_equal(unpack(payload['values']).reshape(grid.shape), grid)
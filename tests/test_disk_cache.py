@@ -0,0 +1,74 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+
+import numpy as np
+
+from privacy_engines import SankeyFlowEngine, fingerprint
+from social_media_privacy_dashboard_enhanced import DiskCache, SharedAggregateStore, logger, shared_store
+
+KEY = fingerprint('entry')
+
+
+def test_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get(KEY) is None
+    cache.put(KEY, {'value': 1})
+    assert DiskCache(str(tmp_path)).get(KEY) == {'value': 1}
+
+
+def test_failed_write_is_skipped_and_logged_once(tmp_path, caplog):
+    cache = DiskCache(str(tmp_path))
+    # A file where the entry's shard directory should be
+    (tmp_path / KEY[:2]).write_text('')
+    with caplog.at_level(logging.WARNING):
+        cache.put(KEY, 1)
+        cache.put(KEY, 2)
+    assert cache.get(KEY) is None
+    assert len([record for record in caplog.records if record.name == logger.name]) == 1
+
+
+def test_unusable_directory_falls_back_to_memory(tmp_path, monkeypatch, caplog):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setenv('DASHBOARD_CACHE_DIR', str(blocker / 'cache'))
+    shared_store.clear()
+    try:
+        with caplog.at_level(logging.WARNING):
+            store = shared_store()
+        assert store.disk is None
+        assert store.get(('key',), lambda: 'value') == 'value'
+        assert len([record for record in caplog.records if record.name == logger.name]) == 1
+    finally:
+        shared_store.clear()
+
+
+def test_unpicklable_value_is_skipped_and_logged_once(tmp_path, caplog):
+    cache = DiskCache(str(tmp_path))
+    with caplog.at_level(logging.WARNING):
+        cache.put(KEY, lambda: 1)
+        cache.put(KEY, threading.Lock())
+    assert cache.get(KEY) is None
+    assert len([record for record in caplog.records if record.name == logger.name]) == 1
+    store = SharedAggregateStore(disk=cache)
+    assert store.get(('lock',), threading.Lock) is not None
+
+
+def test_engine_entries_load_in_another_process(tmp_path):
+    source = np.array(['Platform', 'Platform', 'User'])
+    destination = np.array(['Advertisers', 'Analytics', 'Platform'])
+    engine = SankeyFlowEngine().add(source, destination, np.array([5.0, 3.0, 2.0]))
+    store = SharedAggregateStore(disk=DiskCache(str(tmp_path)))
+    store.get(('flows', 1), lambda: engine)
+    script = (
+        'import sys; sys.path.insert(0, sys.argv[2]);'
+        'from social_media_privacy_dashboard_enhanced import DiskCache, fingerprint;'
+        'engine = DiskCache(sys.argv[1]).get(fingerprint("entry", ("flows", 1)));'
+        'print(type(engine).__module__, engine.records)'
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', script, str(tmp_path), root],
+                            capture_output=True, text=True, check=True).stdout
+    assert output.split() == ['privacy_engines', '3']
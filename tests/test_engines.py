@@ -0,0 +1,229 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from privacy_engines import (
+    CompactGraph, CSRAdjacency, GraphMetricsEngine, HeatmapAggregator, PrivacyRiskScorer,
+    RiskPropagationEngine, SankeyFlowEngine, TimeSeriesDownsampler
+)
+
+
+def random_graph(seed, nodes=60, links=150, weighted=True):
+    """Random graph with duplicate links, self-loops and isolated nodes"""
+    rng = np.random.default_rng(seed)
+    source = rng.integers(0, nodes - 5, links)
+    target = rng.integers(0, nodes - 5, links)
+    weight = rng.uniform(0.5, 3.0, links) if weighted else None
+    return CompactGraph(nodes, source, target, weight)
+
+
+def dense_adjacency(graph):
+    """Undirected weighted adjacency matrix, duplicate links summed"""
+    matrix = np.zeros((graph.num_nodes, graph.num_nodes))
+    weight = np.ones(graph.num_links) if graph.weight is None else graph.weight.astype(np.float64)
+    np.add.at(matrix, (graph.source, graph.target), weight)
+    np.add.at(matrix, (graph.target, graph.source), weight)
+    return matrix
+
+
+@pytest.mark.parametrize('weighted', [True, False])
+def test_csr_adjacency_matches_dense(weighted):
+    graph = random_graph(1, weighted=weighted)
+    adjacency = CSRAdjacency(graph)
+    dense = dense_adjacency(graph)
+    x = np.random.default_rng(2).random(graph.num_nodes)
+    assert np.allclose(adjacency.matvec(x), dense @ x, rtol=1e-5)
+    assert np.allclose(adjacency.strength(), dense.sum(axis=1), rtol=1e-5)
+    stored = np.bincount(graph.source, minlength=graph.num_nodes) + np.bincount(graph.target, minlength=graph.num_nodes)
+    assert np.array_equal(adjacency.degree(), stored)
+    # Columns are sorted into rows
+    for row in range(graph.num_nodes):
+        columns = adjacency.indices[adjacency.indptr[row]:adjacency.indptr[row + 1]]
+        assert sorted(columns.tolist()) == sorted(
+            np.concatenate((graph.target[graph.source == row], graph.source[graph.target == row])).tolist()
+        )
+
+
+def test_connected_components_match_bfs():
+    graph = random_graph(3, nodes=200, links=120)
+    neighbours = defaultdict(set)
+    for s, t in zip(graph.source.tolist(), graph.target.tolist()):
+        neighbours[s].add(t)
+        neighbours[t].add(s)
+    expected = np.full(graph.num_nodes, -1)
+    for start in range(graph.num_nodes):
+        if expected[start] >= 0:
+            continue
+        component, frontier = {start}, [start]
+        while frontier:
+            frontier = [n for node in frontier for n in neighbours[node] if n not in component]
+            component.update(frontier)
+        expected[list(component)] = min(component)
+    assert np.array_equal(GraphMetricsEngine.connected_components(graph), expected)
+
+
+def dense_pagerank(dense, damping=0.85):
+    n = len(dense)
+    strength = dense.sum(axis=1)
+    inv_strength = np.divide(1.0, strength, out=np.zeros(n), where=strength > 0)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(10_000):
+        updated = (1 - damping) / n + damping * (dense @ (rank * inv_strength) + rank[strength == 0].sum() / n)
+        if np.abs(updated - rank).sum() < 1e-13:
+            break
+        rank = updated
+    return updated
+
+
+def test_pagerank_matches_dense_power_iteration():
+    graph = random_graph(4)
+    adjacency = CSRAdjacency(graph)
+    expected = dense_pagerank(dense_adjacency(graph))
+    exact = GraphMetricsEngine(tolerance=1e-9, max_iterations=1000).pagerank(adjacency)
+    assert np.abs(exact - expected).sum() < 1e-5
+    # The default engine stops early, within about 1% L1 error
+    assert np.abs(GraphMetricsEngine().pagerank(adjacency) - expected).sum() < 0.02
+    assert np.isclose(exact.sum(), 1.0)
+
+
+def test_risk_propagation_matches_dense_fixed_point():
+    graph = random_graph(5)
+    dense = dense_adjacency(graph)
+    seeds, decay = [0, 7], 0.6
+    strength = dense.sum(axis=1)
+    inv_strength = np.divide(1.0, strength, out=np.zeros(len(dense)), where=strength > 0)
+    seed_vector = np.zeros(len(dense))
+    seed_vector[seeds] = 1.0
+    expected = seed_vector
+    for _ in range(1000):
+        expected = np.minimum(1.0, seed_vector + decay * inv_strength * (dense @ expected))
+    risk = RiskPropagationEngine(tolerance=1e-9, max_iterations=1000).propagate(CSRAdjacency(graph), seeds, decay)
+    assert np.allclose(risk, expected, atol=1e-5)
+    assert np.all(risk[seeds] == 1)
+
+
+def reference_lttb(x, y, target):
+    """Straightforward per-bucket LTTB"""
+    n = len(x)
+    every = (n - 2) / (target - 2)
+    kept, a = [0], 0
+    for i in range(target - 2):
+        next_start = int((i + 1) * every) + 1
+        next_stop = min(int((i + 2) * every) + 1, n)
+        mean_x, mean_y = np.mean(x[next_start:next_stop]), np.mean(y[next_start:next_stop])
+        start, stop = int(i * every) + 1, int((i + 1) * every) + 1
+        areas = [abs((x[a] - mean_x) * (y[j] - y[a]) - (x[a] - x[j]) * (mean_y - y[a])) for j in range(start, stop)]
+        a = start + int(np.argmax(areas))
+        kept.append(a)
+    return kept + [n - 1]
+
+
+@pytest.mark.parametrize('n, target', [(1000, 50), (997, 13), (100, 99), (10, 3)])
+def test_lttb_matches_reference(n, target):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 1000, n))
+    y = rng.normal(0, 1, n).cumsum()
+    assert TimeSeriesDownsampler.lttb(x, y, target).tolist() == reference_lttb(x, y, target)
+
+
+def test_lttb_keeps_short_series():
+    assert TimeSeriesDownsampler.lttb(np.arange(5), np.arange(5), 10).tolist() == list(range(5))
+
+
+def test_heatmap_window_expiry_matches_live_events():
+    rng = np.random.default_rng(6)
+    window, pane = 6 * 3600, 3600
+    windowed = HeatmapAggregator(7, 14, window=window, pane=pane)
+    start, batches = 1733011200, []
+    for batch in range(20):
+        timestamps = start + batch * 1800 + rng.integers(0, 1800, 200)
+        risks = rng.integers(0, 101, 200)
+        batches.append((timestamps, risks))
+        before = windowed.counts.copy()
+        changed = windowed.update(timestamps, risks)
+        assert set(np.flatnonzero(windowed.counts != before)) <= set(changed.tolist())
+
+    timestamps = np.concatenate([t for t, _ in batches])
+    risks = np.concatenate([r for _, r in batches])
+    live = timestamps // pane >= (windowed.latest - window) // pane
+    expected = HeatmapAggregator(7, 14)
+    expected.update(timestamps[live], risks[live])
+    assert np.allclose(windowed.sums, expected.sums)
+    assert np.array_equal(windowed.counts, expected.counts)
+    assert np.array_equal(windowed.maxima, expected.maxima)
+    assert windowed.events == expected.events < len(timestamps)
+
+
+def flow_records(seed, records=2000, entities=40):
+    rng = np.random.default_rng(seed)
+    labels = np.array([f'entity-{i}' for i in range(entities)])
+    # Skewed so that senders and receivers differ
+    source = labels[np.minimum(rng.zipf(1.5, records), entities) - 1]
+    destination = labels[entities - np.minimum(rng.zipf(1.3, records), entities)]
+    return source, destination, rng.uniform(1, 100, records)
+
+
+def test_sankey_edges_match_brute_force():
+    source, destination, volume = flow_records(7)
+    engine = SankeyFlowEngine()
+    for chunk in np.array_split(np.arange(len(volume)), 5):
+        engine.add(source[chunk], destination[chunk], volume[chunk])
+    expected = defaultdict(float)
+    for s, d, v in zip(source, destination, volume):
+        if s != d:
+            expected[s, d] += v
+    nodes, links = engine.sankey()
+    assert {(s, d): v for s, d, v in links} == pytest.approx({key: round(v, 2) for key, v in expected.items()})
+    assert engine.records == len(volume)
+
+
+@pytest.mark.parametrize('top_k', [4, 5, 10])
+def test_sankey_top_k(top_k):
+    source, destination, volume = flow_records(8)
+    engine = SankeyFlowEngine().add(source, destination, volume)
+    outbound, inbound = defaultdict(float), defaultdict(float)
+    for s, d, v in zip(source, destination, volume):
+        outbound[s] += v
+        inbound[d] += v
+    nodes, links = engine.sankey(top_k)
+    named = {node['id'] for node in nodes} - {'Other sources', 'Other destinations'}
+    assert len(named) == top_k
+    assert set(sorted(outbound, key=outbound.get, reverse=True)[:(top_k + 1) // 2]) <= named
+    assert set(sorted(inbound, key=inbound.get, reverse=True)[:top_k // 2]) <= named
+    # Folding entities into "Other" keeps every byte except self-loops
+    loops = sum(v for s, d, v in zip(source, destination, volume) if s == d and s in named)
+    assert sum(v for _, _, v in links) == pytest.approx(volume.sum() - loops, rel=1e-4)
+
+
+def test_privacy_risk_scorer_matches_brute_force():
+    rng = np.random.default_rng(9)
+    users = 5000
+    columns = {
+        feature: rng.uniform(low - 0.2 * (high - low), high * 1.2, users)
+        for feature, (low, high) in PrivacyRiskScorer.FEATURE_RANGES.items()
+    }
+    scorer = PrivacyRiskScorer()
+    for chunk in np.array_split(np.arange(users), 3):
+        scorer.update({feature: values[chunk] for feature, values in columns.items()})
+
+    normalised = {
+        feature: np.clip((values - low) / (high - low), 0, 1)
+        for feature, values in columns.items()
+        for low, high in [PrivacyRiskScorer.FEATURE_RANGES[feature]]
+    }
+    total = sum(PrivacyRiskScorer.FACTOR_WEIGHTS.values())
+    expected = np.zeros(users)
+    for factor, features in PrivacyRiskScorer.FACTORS.items():
+        factor_score = sum(weight * normalised[feature] for feature, weight in features.items()) / sum(features.values())
+        expected += 100 * PrivacyRiskScorer.FACTOR_WEIGHTS[factor] / total * factor_score
+
+    score, contributions = PrivacyRiskScorer().score(columns)
+    assert np.allclose(score, expected, atol=1e-3)
+    assert np.allclose(sum(contributions.values()), score, atol=1e-3)
+    summary = scorer.summary()
+    assert summary['users'] == users
+    assert summary['mean'] == pytest.approx(expected.mean(), abs=1e-3)
+    for q in (50, 90, 99):
+        assert summary['percentiles'][q] == pytest.approx(np.percentile(expected, q), abs=0.15)
+    assert summary['high_risk_share'] == pytest.approx((expected >= 70).mean(), abs=2 / users)
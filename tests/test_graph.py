@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from privacy_engines import CommunityCoarsener, CompactGraph, DataSimulator
+
+
+def test_records_round_trip_through_highcharts():
+    nodes, links = DataSimulator.generate_network_data(1, 3)
+    graph = CompactGraph.from_records(nodes, links)
+    assert graph.num_nodes == len(nodes) and graph.num_links == len(links)
+    assert graph.categories['community'] == sorted({node['community'] for node in nodes})
+    converted, converted_links = graph.to_highcharts()
+    assert converted_links == links
+    for node, original in zip(converted, nodes):
+        assert node['value'] == pytest.approx(original['value'], abs=1e-4)
+        assert {**node, 'value': None} == {**original, 'value': None}
+
+
+def test_templated_ids_are_formatted_on_demand():
+    graph = CompactGraph(5, [0, 3], [1, 4], ids='user_{}')
+    assert graph.node_ids([4, 0]) == ['user_4', 'user_0']
+    assert graph.index_of(['user_3', 'user_9', 'robot_1', 'user_x']).tolist() == [3]
+    assert graph.to_highcharts()[1] == [['user_0', 'user_1'], ['user_3', 'user_4']]
+
+
+def test_simplify_merges_multi_edges_and_drops_self_loops():
+    graph = CompactGraph(4, [0, 1, 0, 2, 3, 2], [1, 0, 1, 2, 2, 3], [1, 2, 3, 4, 5, 6])
+    simple = graph.simplify()
+    edges = dict(zip(zip(simple.source.tolist(), simple.target.tolist()), simple.weight.tolist()))
+    assert edges == {(0, 1): 6, (2, 3): 11}
+    directed = graph.simplify(directed=True)
+    edges = dict(zip(zip(directed.source.tolist(), directed.target.tolist()), directed.weight.tolist()))
+    assert edges == {(0, 1): 4, (1, 0): 2, (3, 2): 5, (2, 3): 6}
+    # Unweighted links count their duplicates
+    assert CompactGraph(3, [0, 1, 1], [1, 0, 1]).simplify().weight.tolist() == [2]
+
+
+def test_with_columns_shares_the_links():
+    graph = DataSimulator.generate_network_graph(2, 2)
+    risky = graph.with_columns({'risk': np.zeros(graph.num_nodes), 'community': np.zeros(graph.num_nodes)})
+    assert risky.source is graph.source and risky.target is graph.target
+    assert 'community' not in risky.categories and 'color' in risky.categories
+    assert 'risk' not in graph.columns
+
+
+def community_pairs(graph, expand=None):
+    """Brute-force coarse link counts, members of ``expand`` kept as themselves"""
+    labels = graph.categories['community']
+    counts = {}
+    for s, t in zip(graph.source.tolist(), graph.target.tolist()):
+        ends = []
+        for node in (s, t):
+            label = labels[graph.columns['community'][node]]
+            ends.append(graph.node_ids([node])[0] if label == expand else f'community_{label}')
+        if ends[0] != ends[1]:
+            key = tuple(sorted(ends))
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def coarse_pairs(coarse):
+    ids = coarse.node_ids()
+    return {tuple(sorted((ids[s], ids[t]))): w
+            for s, t, w in zip(coarse.source.tolist(), coarse.target.tolist(), coarse.weight.tolist())}
+
+
+@pytest.mark.parametrize('expand', [None, 'B'])
+def test_coarsening_matches_brute_force(expand):
+    graph = DataSimulator.generate_network_graph(4, 20)
+    coarse = CommunityCoarsener(max_links=10_000).coarsen_graph(graph, expand)
+    assert coarse_pairs(coarse) == community_pairs(graph, expand)
+    labels = graph.categories['community']
+    sizes = np.bincount(graph.columns['community'], minlength=len(labels))
+    supers = [f'community_{label}' for label, size in zip(labels, sizes) if size and label != expand]
+    members = graph.node_ids(np.flatnonzero(graph.columns['community'] == labels.index(expand))) if expand else []
+    assert coarse.node_ids() == supers + members
+    assert coarse.columns['value'][:len(supers)].sum() == graph.num_nodes - len(members)
+
+
+def test_pruning_keeps_every_member_link():
+    graph = DataSimulator.generate_network_graph(4, 20)
+    expected = community_pairs(graph, 'A')
+    coarse = CommunityCoarsener(max_links=2).coarsen_graph(graph, 'A')
+    pairs = coarse_pairs(coarse)
+    member_links = {key for key in expected if not any(end.startswith('community_') for end in key)}
+    assert member_links and member_links <= set(pairs)
+    super_links = [key for key in pairs if all(end.startswith('community_') for end in key)]
+    assert len(super_links) <= 2
+    assert all(pairs[key] == expected[key] for key in pairs)
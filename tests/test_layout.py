@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pytest
+
+import privacy_engines
+import social_media_privacy_dashboard_enhanced as dashboard
+from privacy_engines import DataSimulator, GraphLayoutEngine
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'social_media_privacy_dashboard_enhanced.py')
+
+
+@pytest.mark.parametrize('scale', [2, 60])
+def test_positions_fill_the_unit_square(scale):
+    # Scale 60 (900 nodes) takes the grid-approximated repulsion
+    graph = DataSimulator.generate_network_graph(3, scale)
+    positions = GraphLayoutEngine().positions_for(graph)
+    assert positions.shape == (graph.num_nodes, 2) and positions.dtype == np.float32
+    assert np.all(np.isfinite(positions))
+    assert np.allclose(positions.min(axis=0), 0.02) and np.allclose(positions.max(axis=0), 0.98)
+
+
+def test_linked_nodes_end_up_closer():
+    graph = DataSimulator.generate_network_graph(3, 20)
+    positions = GraphLayoutEngine().positions_for(graph)
+    linked = np.linalg.norm(positions[graph.source] - positions[graph.target], axis=1).mean()
+    pairs = np.random.default_rng(0).integers(0, graph.num_nodes, (2, 2000))
+    assert linked < 0.7 * np.linalg.norm(positions[pairs[0]] - positions[pairs[1]], axis=1).mean()
+
+
+def test_layouts_are_cached_per_graph():
+    engine = GraphLayoutEngine()
+    graph = DataSimulator.generate_network_graph(3, 4)
+    positions = engine.positions_for(graph)
+    assert engine.positions_for(DataSimulator.generate_network_graph(3, 4)) is positions
+    assert engine.positions_for(DataSimulator.generate_network_graph(4, 4)) is not positions
+
+
+def test_large_graphs_are_refused():
+    graph = DataSimulator.generate_network_graph(3, 10)
+    with pytest.raises(ValueError):
+        GraphLayoutEngine(max_nodes=graph.num_nodes - 1).positions_for(graph)
+
+
+def test_dashboard_never_lays_out_a_large_graph(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    laid_out = []
+    compute = GraphLayoutEngine.compute
+
+    def recording_compute(self, num_nodes, source, target):
+        laid_out.append(num_nodes)
+        return compute(self, num_nodes, source, target)
+    monkeypatch.setattr(privacy_engines.GraphLayoutEngine, 'compute', recording_compute)
+
+    at = AppTest.from_file(APP_FILE, default_timeout=120)
+    at.run()
+    at.sidebar.multiselect[0].set_value(['Network Graph']).run()
+    next(r for r in at.sidebar.radio if r.label == 'Network layout').set_value('Server').run()
+    next(s for s in at.sidebar.select_slider if s.label == 'Scale').set_value(10).run()
+    next(r for r in at.radio if r.label == 'Detail level').set_value('Full graph').run()
+    assert not at.exception and max(laid_out) == 150
+
+    # Full graph was the last choice, but 15,000 nodes are only shown by community
+    laid_out.clear()
+    next(s for s in at.sidebar.select_slider if s.label == 'Scale').set_value(1000).run()
+    assert not at.exception
+    assert 'Detail level' not in [r.label for r in at.radio]
+    assert laid_out and max(laid_out) < 50
+    # Expanding a community lays out its members next to the other super-nodes
+    laid_out.clear()
+    next(s for s in at.selectbox if s.label == 'Expand community').set_value('A').run()
+    assert not at.exception and 50 < max(laid_out) <= dashboard.FULL_GRAPH_NODES
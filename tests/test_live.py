@@ -0,0 +1,98 @@
+import os
+import types
+
+import numpy as np
+import pytest
+import streamlit as st
+import streamlit.components.v1 as components
+
+import privacy_engines
+from privacy_engines import LiveEventSource
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'social_media_privacy_dashboard_enhanced.py')
+START = 1733011200
+
+
+def test_feed_emits_one_batch_per_simulated_minute():
+    source = LiveEventSource(seed=1, speed=60, start=START)
+    source.poll(source.started + 3.5)
+    assert [batch['sequence'] for batch in source.since(-1)] == [0, 1, 2]
+    assert [batch['minute'] for batch in source.since(0)] == [START + 60, START + 120]
+    assert source.since(2) == []
+    again = LiveEventSource(seed=1, speed=60, start=START)
+    again.poll(again.started + 3.5)
+    assert np.array_equal(again.batches[-1]['risks'], source.batches[-1]['risks'])
+
+
+def test_feed_forgets_batches_past_its_retention():
+    source = LiveEventSource(seed=1, speed=60, start=START, retention=5)
+    source.poll(source.started + 20.5)
+    assert source.since(10) is None
+    assert [batch['sequence'] for batch in source.since(14)] == [15, 16, 17, 18, 19]
+
+
+@pytest.fixture
+def live_app(monkeypatch):
+    """The dashboard with the live timeline on, a fake clock and a fake chart frame
+
+    The frame acknowledges every snapshot it is sent, like the real
+    component does; ``app.sent`` holds the args of every live chart call.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    clock = types.SimpleNamespace(now=1.0e9)
+    monkeypatch.setattr(privacy_engines, 'time', types.SimpleNamespace(time=lambda: clock.now))
+    sent = []
+
+    def declare_component(name, path=None, url=None):
+        def frame(key=None, **args):
+            if name == 'live_chart':
+                sent.append(args)
+                if args['base'] is not None:
+                    st.session_state[key] = {'epoch': args['epoch']}
+        return frame
+    monkeypatch.setattr(components, 'declare_component', declare_component)
+
+    at = AppTest.from_file(APP_FILE, default_timeout=120)
+    at.run()
+    at.sidebar.multiselect[0].set_value(['Timeline']).run()
+    next(c for c in at.sidebar.checkbox if c.label == 'Live updates').check().run()
+    at.clock, at.sent = clock, sent
+    return at
+
+
+def tick(at, seconds=1.0):
+    at.sent.clear()
+    at.clock.now += seconds
+    at.run()
+    assert not at.exception
+    return at.sent[-1]
+
+
+def test_deltas_follow_the_snapshot_in_sequence(live_app):
+    first = live_app.sent[-1]
+    assert first['base'] is not None and first['seq'] == 0
+    for seq in (1, 2, 3):
+        update = tick(live_app)
+        assert (update['epoch'], update['seq'], update['base']) == (first['epoch'], seq, None)
+        assert len(update['delta']['points']) == 1
+    # No new minute, no delta and no step in the sequence
+    idle = tick(live_app, 0.2)
+    assert (idle['seq'], idle['delta'], idle['base']) == (3, None, None)
+
+
+def test_sequence_restarts_with_a_new_epoch(live_app):
+    first = live_app.sent[-1]
+    tick(live_app)
+    # A new feed (here: a seeded one) starts a new epoch from a snapshot
+    next(c for c in live_app.sidebar.checkbox if c.label == 'Seeded simulation').check().run()
+    reseeded = live_app.sent[-1]
+    assert reseeded['epoch'] != first['epoch']
+    assert reseeded['seq'] == 0 and reseeded['base'] is not None
+    update = tick(live_app)
+    assert (update['epoch'], update['seq'], update['base']) == (reseeded['epoch'], 1, None)
+    # Falling behind the feed's retention starts over as well
+    behind = tick(live_app, 10 * 60)
+    assert behind['epoch'] != reseeded['epoch']
+    assert behind['seq'] == 0 and behind['base'] is not None
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from privacy_engines import DataSimulator, HeatmapPyramid
+from social_media_privacy_dashboard_enhanced import build_location_pyramid
+
+START = 1733011200
+
+
+@pytest.fixture(scope='module')
+def events():
+    rng = np.random.default_rng(0)
+    count = 20_000
+    return (START + rng.integers(0, 6 * 3600, count), rng.integers(0, 300, count), rng.integers(0, 101, count))
+
+
+@pytest.fixture(scope='module')
+def pyramid(events):
+    pyramid = HeatmapPyramid((START, START + 6 * 3600), (0, 300), 360, 300)
+    half = len(events[0]) // 2
+    pyramid.add(*(column[:half] for column in events))
+    pyramid.add(*(column[half:] for column in events))
+    return pyramid.build()
+
+
+def test_finest_level_matches_histogram(events, pyramid):
+    timestamps, locations, risks = events
+    bins = (np.linspace(START, START + 6 * 3600, 361), np.linspace(0, 300, 301))
+    counts, _, _ = np.histogram2d(timestamps, locations, bins)
+    sums, _, _ = np.histogram2d(timestamps, locations, bins, weights=risks)
+    assert np.array_equal(pyramid.counts[0, 0], counts)
+    assert np.allclose(pyramid.sums[0, 0], sums)
+
+
+def test_every_level_conserves_mass(events, pyramid):
+    assert pyramid.levels == (10, 10)
+    for level, counts in pyramid.counts.items():
+        assert counts.sum() == len(events[0])
+        assert np.isclose(pyramid.sums[level].sum(dtype=np.float64), events[2].sum())
+        assert counts.shape == tuple(-(-n // 2 ** f) for n, f in zip((360, 300), level))
+
+
+def test_axes_coarsen_independently(pyramid):
+    # The whole day in time but a few cells across only coarsens time
+    tile = pyramid.view(None, (10, 20), max_bins=(96, 64))
+    assert tile['level'] == (2, 0)
+    assert tile['means'].shape == (90, 10)
+    assert tile['bin_size'] == (240, 1)
+    # A few minutes across every cell only coarsens locations
+    tile = pyramid.view((START, START + 600), None, max_bins=(96, 64))
+    assert tile['level'] == (0, 3)
+    assert tile['means'].shape == (10, 38)
+
+
+def test_view_means(events, pyramid):
+    timestamps, locations, risks = events
+    tile = pyramid.view((START, START + 3600), (0, 50), max_bins=(96, 64))
+    assert tile['counts'].sum() == np.count_nonzero((timestamps < START + 3600) & (locations < 50))
+    filled = tile['counts'] > 0
+    assert np.all(np.isnan(tile['means'][~filled]))
+    assert np.all((tile['means'][filled] >= 0) & (tile['means'][filled] <= 100))
+
+
+def test_built_grid_is_capped():
+    pyramid = build_location_pyramid(1, 16, START, hours=2, max_cells=2 ** 17)
+    rows, columns = pyramid.sums[0, 0].shape
+    assert rows == 120 and rows * columns <= 2 ** 17
+    assert pyramid.location_range[1] >= DataSimulator.location_cells(16)
+    assert pyramid.counts[0, 0].sum() == pyramid.events
@@ -0,0 +1,41 @@
+import io
+
+from render_reports import report_filename, telemetry_names
+from privacy_engines import TelemetryIngestor
+from social_media_privacy_dashboard_enhanced import ReportBuilder
+
+
+def test_telemetry_names_keep_distinct_file_names():
+    assert telemetry_names(['data/acme.csv', 'other/globex.jsonl']) == ['acme.csv', 'globex.jsonl']
+
+
+def test_telemetry_names_disambiguate_clashing_file_names(tmp_path):
+    paths = [str(tmp_path / 'eu' / 'acme.csv'), str(tmp_path / 'us' / 'acme.csv')]
+    names = telemetry_names(paths)
+    assert names == ['eu/acme.csv', 'us/acme.csv']
+    assert len({report_filename(name) for name in names}) == 2
+
+
+def test_telemetry_report_has_no_simulated_risk_assessment():
+    telemetry = TelemetryIngestor().ingest(
+        io.BytesIO(b'type,timestamp,incident\nincident,1733131800,Phishing\n'), 'csv'
+    )
+    titles = [title for title, _, _ in ReportBuilder().sections(telemetry=telemetry)]
+    assert 'Risk Assessment' not in titles
+    assert 'Security Incidents' in titles
+
+
+def test_simulated_report_has_risk_assessment():
+    titles = [title for title, _, _ in ReportBuilder().sections(seed=1)]
+    assert 'Risk Assessment' in titles
+
+
+def test_telemetry_heatmap_summary_averages_observed_cells_only():
+    telemetry = TelemetryIngestor().ingest(
+        io.BytesIO(b'type,timestamp,risk\nlocation,1733131800,80\nlocation,1733135400,60\n'), 'csv'
+    )
+    summaries = {title: summary for title, summary, _ in ReportBuilder().sections(telemetry=telemetry)}
+    heatmap = summaries['Location Privacy Heatmap']
+    assert heatmap['Avg Risk'] == '70.0/100'
+    assert heatmap['Peak Risk'] == 80
+    assert heatmap['High Risk'] == 1
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from privacy_engines import DataSimulator
+
+
+def assert_same_arrays(first, second):
+    assert first.keys() == second.keys()
+    for name in first:
+        assert np.array_equal(first[name], second[name]), name
+
+
+@pytest.mark.parametrize('scale', [1, 40])
+def test_same_seed_reproduces_network(scale):
+    assert_same_arrays(
+        DataSimulator.generate_network_arrays(7, scale), DataSimulator.generate_network_arrays(7, scale)
+    )
+    assert DataSimulator.generate_network_data(7, scale) == DataSimulator.generate_network_data(7, scale)
+
+
+def test_different_seeds_change_network():
+    first, second = DataSimulator.generate_network_arrays(7, 40), DataSimulator.generate_network_arrays(8, 40)
+    assert not np.array_equal(first['value'], second['value'])
+    assert not np.array_equal(first['source'], second['source'])
+
+
+def test_same_seed_reproduces_heatmap():
+    days, hours, grid = DataSimulator.generate_heatmap_arrays(7, 4)
+    assert np.array_equal(grid, DataSimulator.generate_heatmap_arrays(7, 4)[2])
+    assert not np.array_equal(grid, DataSimulator.generate_heatmap_arrays(8, 4)[2])
+    assert grid.shape == (len(days), len(hours))
+
+
+def test_scale_sizes_the_network():
+    arrays = DataSimulator.generate_network_arrays(1, 100)
+    assert len(arrays['value']) == DataSimulator.BASE_NODES * 100
+    assert len(arrays['source']) <= DataSimulator.BASE_LINKS * 100
+    assert np.all(arrays['source'] != arrays['target'])
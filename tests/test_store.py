@@ -0,0 +1,74 @@
+import threading
+
+import numpy as np
+
+from social_media_privacy_dashboard_enhanced import SharedAggregateStore
+
+
+def test_builds_once():
+    store = SharedAggregateStore()
+    calls = []
+    for _ in range(3):
+        assert store.get(('flows', 1), lambda: calls.append(1) or 'value') == 'value'
+    assert calls == [1]
+    assert store.builds == 1
+
+
+def test_new_cycle_drops_earlier_cycles():
+    store = SharedAggregateStore()
+    store.get(('flows', None, 1, ('shared', 10)), lambda: 'old flows')
+    store.get(('population', None, 1, ('shared', 10), 'risk'), lambda: 'old population')
+    store.get(('telemetry', 'file'), lambda: 'telemetry')
+    store.get(('flows', None, 1, ('shared', 11)), lambda: 'new flows')
+    assert set(store.entries) == {('telemetry', 'file'), ('flows', None, 1, ('shared', 11))}
+
+
+def test_evicts_oldest_beyond_max_bytes():
+    store = SharedAggregateStore(max_bytes=5 * 2 ** 19)
+    for i in range(4):
+        store.get(('grid', i), lambda: np.zeros(2 ** 20, dtype=np.uint8))
+    assert set(store.entries) == {('grid', 2), ('grid', 3)}
+    # A single entry larger than the bound is still published
+    store.get(('grid', 4), lambda: np.zeros(2 ** 22, dtype=np.uint8))
+    assert set(store.entries) == {('grid', 4)}
+
+
+def test_evicts_oldest_beyond_max_entries():
+    store = SharedAggregateStore(max_entries=2)
+    for i in range(3):
+        store.get(('entry', i), lambda: i)
+    assert set(store.entries) == {('entry', 1), ('entry', 2)}
+
+
+def test_estimated_nbytes_counts_nested_arrays():
+    class Engine:
+        def __init__(self):
+            self.grid = np.zeros((100, 100))
+            self.parts = {'a': np.zeros(1000, dtype=np.int32), 'b': [np.zeros(10)]}
+    assert SharedAggregateStore.estimated_nbytes(Engine()) >= 80_000 + 4_000 + 80
+
+
+def test_key_lock_survives_eviction():
+    store = SharedAggregateStore(max_entries=1)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_builder():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'slow'
+
+    first = threading.Thread(target=store.get, args=(('slow',), slow_builder))
+    first.start()
+    started.wait(5)
+    # Publishing other entries evicts while the slow build holds its lock
+    store.get(('other', 1), lambda: 1)
+    store.get(('other', 2), lambda: 2)
+    second = threading.Thread(target=store.get, args=(('slow',), slow_builder))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert calls == [1]
+    assert store._key_locks == {}
@@ -0,0 +1,64 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from privacy_engines import TelemetryIngestor
+from social_media_privacy_dashboard_enhanced import telemetry_path
+
+# Monday 2024-12-02 09:30 UTC, inside the heatmap's 8:00-22:00 window
+EPOCH = 1733131800
+ISO = '2024-12-02T09:30:00Z'
+
+TIMESTAMPS = {
+    'iso': [ISO, '2024-12-02T10:30:00+01:00'],
+    'epoch': [EPOCH, EPOCH],
+    'mixed': [EPOCH, ISO]
+}
+
+
+def telemetry_file(fmt, timestamps):
+    """Two location and two incident rows with the given timestamps"""
+    rows = [{'type': 'location', 'timestamp': t, 'risk': 60} for t in timestamps]
+    rows += [{'type': 'incident', 'timestamp': t, 'incident': 'Phishing'} for t in timestamps]
+    if fmt == 'jsonl':
+        return io.BytesIO('\n'.join(json.dumps(row) for row in rows).encode())
+    return io.BytesIO(pd.DataFrame(rows).to_csv(index=False).encode())
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl'])
+@pytest.mark.parametrize('kind', sorted(TIMESTAMPS))
+def test_ingest_timestamps(fmt, kind):
+    ingestor = TelemetryIngestor().ingest(telemetry_file(fmt, TIMESTAMPS[kind]), fmt)
+    assert ingestor.heatmap.events == 2
+    assert ingestor.heatmap.latest == EPOCH
+    # Both incidents fall in December
+    assert ingestor.incidents['Phishing'].tolist() == [0] * 11 + [2]
+
+
+@pytest.mark.parametrize('values', [
+    pd.Series([ISO]),
+    pd.Series([EPOCH]),
+    pd.Series([float(EPOCH)]),
+    pd.Series([str(EPOCH)]),
+    pd.Series([EPOCH, ISO], dtype=object),
+    pd.Series(pd.to_datetime([ISO])),
+    pd.Series(pd.to_datetime([ISO]).as_unit('s')),
+    pd.Series(pd.to_datetime([ISO]).as_unit('ns'))
+])
+def test_epoch_seconds(values):
+    assert np.all(TelemetryIngestor.epoch_seconds(values) == EPOCH)
+
+
+def test_telemetry_path_stays_inside_the_directory(tmp_path):
+    root = tmp_path / 'telemetry'
+    (root / 'eu').mkdir(parents=True)
+    (root / 'eu' / 'acme.csv').write_text('')
+    (tmp_path / 'secret.csv').write_text('')
+    (root / 'link.csv').symlink_to(tmp_path / 'secret.csv')
+    assert telemetry_path('eu/acme.csv', str(root)) == str((root / 'eu' / 'acme.csv').resolve())
+    assert telemetry_path('eu/../eu/acme.csv', str(root)) == str((root / 'eu' / 'acme.csv').resolve())
+    for name in ['../secret.csv', str(tmp_path / 'secret.csv'), '/etc/passwd', 'link.csv']:
+        assert telemetry_path(name, str(root)) is None
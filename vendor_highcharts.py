@@ -0,0 +1,49 @@
+"""
+Vendor the Highcharts runtime for offline / air-gapped deployments
+Downloads the library and the modules used by the dashboard into
+static/highcharts, which the dashboard serves as component files.
+
+Usage: python vendor_highcharts.py [--version 11.4.8]
+"""
+
+import argparse
+import os
+import urllib.request
+
+DEFAULT_VERSION = '11.4.8'
+
+MODULES = [
+    'highcharts.js',
+    'highcharts-more.js',
+    'modules/networkgraph.js',
+    'modules/sankey.js',
+    'modules/heatmap.js',
+    'modules/solid-gauge.js',
+    'modules/boost.js'
+]
+
+TARGET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'highcharts')
+
+
+def vendor(version, target_dir=TARGET_DIR):
+    """Download every module for the pinned version into target_dir"""
+    for module in MODULES:
+        url = f'https://code.highcharts.com/{version}/{module}'
+        path = os.path.join(target_dir, *module.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with urllib.request.urlopen(url) as response:
+            payload = response.read()
+        with open(path, 'wb') as fh:
+            fh.write(payload)
+        print(f'{module}: {len(payload) / 1024:.0f} KB')
+    
+    # Used as a cache-busting query string by HighchartsGenerator
+    with open(os.path.join(target_dir, 'VERSION'), 'w') as fh:
+        fh.write(version)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--version', default=DEFAULT_VERSION)
+    args = parser.parse_args()
+    vendor(args.version)